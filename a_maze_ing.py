@@ -1,22 +1,236 @@
 """Entry point for the A-Maze-ing maze generator."""
 
+import argparse
 import sys
+import os
+from typing import Any, Iterable, Iterator, Optional
 
-from core.config_parser import parse_config
-from core.output_writer import write_output
-from display.curses_display import run
-from mazegen.generator import MazeGenerator
+from core.config_parser import parse_config, parse_manifest
+from core.output_writer import write_binary_output, write_output
+from mazegen.batch import MazeSpec, generate_many
+from mazegen.binary import BinaryMazeWriter
+from mazegen.cache import MAX_BYTES, MazeCache
+from mazegen.generator import LOOP_DENSITY, MazeGenerator
+from mazegen.profiling import PhaseProfiler, phase
+
+PROFILE_OUTPUT = "profile.json"
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """Parse the command line.
+
+    Args:
+        argv: Command line arguments without the program name.
+
+    Returns:
+        The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="a_maze_ing.py",
+        description="Generate, solve and display a maze.",
+    )
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("config_file", nargs="?", help="maze config file")
+    mode.add_argument(
+        "--batch", metavar="MANIFEST",
+        help="generate every maze listed in MANIFEST (no display)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="worker processes for --batch and TILE_SIZE "
+        "(default: CPU count)",
+    )
+    parser.add_argument(
+        "--no-display", action="store_true",
+        help="write the output files only; curses is never loaded",
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="write per-phase time and memory as a JSON report",
+    )
+    parser.add_argument(
+        "--profile-output", metavar="REPORT", default=None,
+        help="path of the profile report (default: profile.json)",
+    )
+    parser.add_argument(
+        "--cprofile", action="append", default=[], metavar="PHASE",
+        help="also run PHASE under cProfile and dump "
+        "<REPORT>.<PHASE>.prof (repeatable, implies --profile)",
+    )
+    return parser.parse_args(argv)
+
+
+def make_profiler(
+    report: str, phases: Iterable[str],
+) -> PhaseProfiler:
+    """Create the profiler for a --profile report.
+
+    Args:
+        report: Path of the JSON report.
+        phases: Phases to run under cProfile.
+
+    Returns:
+        A profiler whose .prof files are named after the report.
+    """
+    return PhaseProfiler(
+        cprofile=phases, prof_prefix=os.path.splitext(report)[0],
+    )
+
+
+def write_profile(
+    profiler: Optional[PhaseProfiler], report: Optional[str],
+) -> None:
+    """Write the profile report and stop tracing.
+
+    Args:
+        profiler: The profiler, or None if profiling is off.
+        report: Path of the JSON report.
+    """
+    if profiler is None or report is None:
+        return
+    try:
+        profiler.write(report)
+    except IOError as e:
+        print(f"Error writing profile report: {e}")
+    profiler.close()
+
+
+def make_cache(config: dict[str, Any]) -> Optional[MazeCache]:
+    """Open the maze cache configured by CACHE_DIR and CACHE_SIZE.
+
+    Args:
+        config: Parsed configuration values.
+
+    Returns:
+        The cache, or None if none is configured or it cannot be used.
+    """
+    if "CACHE_DIR" not in config:
+        return None
+    max_bytes = config.get("CACHE_SIZE")
+    try:
+        return MazeCache(
+            config["CACHE_DIR"],
+            MAX_BYTES if max_bytes is None else max_bytes * 2**20,
+        )
+    except OSError as e:
+        print(f"Warning: Cache disabled, cannot use CACHE_DIR: {e}")
+        return None
+
+
+def run_batch(manifest: str, workers: Optional[int]) -> None:
+    """Generate every maze of a manifest and write one file per maze.
+
+    Args:
+        manifest: Path to the manifest file.
+        workers: Number of worker processes, or None for CPU count.
+    """
+    configs = parse_manifest(manifest)
+    if configs is None:
+        sys.exit(1)
+
+    specs = (
+        MazeSpec(
+            c["WIDTH"], c["HEIGHT"], c.get("SEED"), c["PERFECT"],
+            c["ENTRY"], c["EXIT"], c.get("ALGORITHM", "backtracker"),
+            c.get("LOOP_DENSITY", LOOP_DENSITY),
+        )
+        for c in configs
+    )
+    for result in generate_many(specs, workers=workers):
+        config = configs[result.spec_index]
+        write_output(
+            config["OUTPUT_FILE"],
+            result.hex_grid,
+            config["ENTRY"],
+            config["EXIT"],
+            result.path,
+            config.get("PATH_FORMAT", "letters"),
+        )
+
+
+def stream_output(
+    gen: MazeGenerator, config: dict[str, Any], binary_file: Optional[str],
+) -> None:
+    """Generate row by row and write each row as soon as it is done.
+
+    The maze is never held in memory, so there is no solution line and
+    no display.
+
+    Args:
+        gen: Generator configured from the config file.
+        config: Parsed configuration values.
+        binary_file: Also write the binary format to this path, if set.
+    """
+    rows: Iterable[str] = gen.generate_rows()
+    writer: Optional[BinaryMazeWriter] = None
+    binary_error: Optional[OSError] = None
+    if binary_file is not None:
+        try:
+            writer = BinaryMazeWriter(
+                binary_file, config["WIDTH"], config["ENTRY"],
+                config["EXIT"], config.get("SEED"), config["PERFECT"],
+            )
+        except IOError as e:
+            binary_error = e
+
+    def tee(rows: Iterable[str]) -> Iterator[str]:
+        """Copy each row into the binary file until that file fails.
+
+        write_output() reports its own errors, so binary errors are kept
+        here instead of being raised into it.
+        """
+        nonlocal binary_error
+        for row in rows:
+            if writer is not None and binary_error is None:
+                try:
+                    writer.write_row(row)
+                except IOError as e:
+                    binary_error = e
+            yield row
+
+    write_output(
+        config["OUTPUT_FILE"],
+        tee(rows),
+        config["ENTRY"],
+        config["EXIT"],
+        "",
+    )
+    if writer is not None:
+        try:
+            writer.close()
+        except IOError as e:
+            binary_error = binary_error or e
+    if binary_error is not None:
+        print(f"Error writing binary output file: {binary_error}")
 
 
 def main() -> None:
     """Run the maze generator from a config file."""
-    if len(sys.argv) != 2:
-        print("Usage: python3 a_maze_ing.py <config_file>")
+    args = parse_args(sys.argv[1:])
+    if args.workers is not None and args.workers < 1:
+        print("Error: --workers must be at least 1.")
         sys.exit(1)
 
-    config = parse_config(sys.argv[1])
+    report: Optional[str] = None
+    profiler = None
+    if args.profile or args.profile_output or args.cprofile:
+        report = args.profile_output or PROFILE_OUTPUT
+        profiler = make_profiler(report, args.cprofile)
+
+    if args.batch is not None:
+        with phase(profiler, "batch"):
+            run_batch(args.batch, args.workers)
+        write_profile(profiler, report)
+        return
+
+    with phase(profiler, "parse_config"):
+        config = parse_config(args.config_file)
     if config is None:
         sys.exit(1)
+    if profiler is None and config.get("PROFILE", False):
+        # Only known now, so parse_config is not part of this report.
+        report = config.get("PROFILE_OUTPUT", PROFILE_OUTPUT)
+        profiler = make_profiler(report, config.get("CPROFILE", ()))
 
     seed = config.get("SEED")
     gen = MazeGenerator(
@@ -24,16 +238,57 @@ def main() -> None:
         height=config["HEIGHT"],
         seed=seed,
         perfect=config["PERFECT"],
+        profiler=profiler,
+        algorithm=config.get("ALGORITHM", "backtracker"),
+        loop_density=config.get("LOOP_DENSITY", LOOP_DENSITY),
     )
-    gen.generate(start_pos=config["ENTRY"])
 
-    write_output(
-        config["OUTPUT_FILE"],
-        gen.get_hex_layout(),
-        config["ENTRY"],
-        config["EXIT"],
-        gen.solve(start=config["ENTRY"], end=config["EXIT"]),
-    )
+    binary_file = config.get("BINARY_FILE")
+
+    if config.get("STREAM", False):
+        with phase(profiler, "stream"):
+            stream_output(gen, config, binary_file)
+        write_profile(profiler, report)
+        return
+
+    cache = make_cache(config)
+    if cache is not None:
+        path = cache.generate(
+            gen, config["ENTRY"], config["EXIT"],
+            config.get("TILE_SIZE"), args.workers,
+        )
+    else:
+        if "TILE_SIZE" in config:
+            gen.generate_tiled(
+                start_pos=config["ENTRY"], tile_size=config["TILE_SIZE"],
+                workers=args.workers,
+            )
+        else:
+            gen.generate(start_pos=config["ENTRY"])
+        path = gen.solve(start=config["ENTRY"], end=config["EXIT"])
+    hex_grid = gen.get_hex_layout()
+
+    with phase(profiler, "write_output"):
+        write_output(
+            config["OUTPUT_FILE"],
+            hex_grid,
+            config["ENTRY"],
+            config["EXIT"],
+            path,
+            config.get("PATH_FORMAT", "letters"),
+        )
+    if binary_file is not None:
+        with phase(profiler, "write_binary"):
+            write_binary_output(
+                binary_file, hex_grid, config["ENTRY"], config["EXIT"],
+                config["WIDTH"], seed, config["PERFECT"],
+            )
+    write_profile(profiler, report)
+    if args.no_display:
+        return
+
+    # Imported here so headless runs never load curses.
+    from display.curses_display import run
 
     run(
         width=config["WIDTH"],
@@ -41,6 +296,13 @@ def main() -> None:
         entry=config["ENTRY"],
         exit_=config["EXIT"],
         seed=seed,
+        algorithm=config.get("ALGORITHM", "backtracker"),
+        animation_rate=config.get("ANIMATION_RATE"),
+        animation_duration=config.get("ANIMATION_DURATION"),
+        perfect=config["PERFECT"],
+        gen=gen,
+        solution=path,
+        loop_density=config.get("LOOP_DENSITY", LOOP_DENSITY),
     )
 
 
@@ -0,0 +1,68 @@
+"""Benchmark the flat-array solvers against the former path-string BFS.
+
+Usage: python3 bench/bench_solve.py [SIZE ...]
+"""
+
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from mazegen.generator import DIR_MAP, MOVE, MazeGenerator  # noqa: E402
+
+
+def legacy_solve(
+    gen: MazeGenerator, start: tuple[int, int], end: tuple[int, int],
+) -> str:
+    """BFS that copies the whole path string into every queue entry."""
+    queue: deque[tuple[tuple[int, int], str]] = deque([(start, "")])
+    visited: set[tuple[int, int]] = {start}
+    while queue:
+        (x, y), path = queue.popleft()
+        if (x, y) == end:
+            return path
+        for direction, (dx, dy) in MOVE.items():
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < gen.width and 0 <= ny < gen.height:
+                if (
+                    not (gen.grid[y][x] & direction)
+                    and (nx, ny) not in visited
+                ):
+                    visited.add((nx, ny))
+                    queue.append(((nx, ny), path + DIR_MAP[direction]))
+    return ""
+
+
+def main() -> None:
+    """Time every solver on square mazes of the given sizes."""
+    sizes = [int(a) for a in sys.argv[1:]] or [100, 300, 600]
+    print(f"{'size':>6} {'perfect':>7} {'method':>13} {'seconds':>9}")
+    for size in sizes:
+        for perfect in (True, False):
+            gen = MazeGenerator(size, size, seed=1, perfect=perfect)
+            gen.generate()
+            end = (size - 1, size - 1)
+            t0 = time.perf_counter()
+            expected = legacy_solve(gen, (0, 0), end)
+            legacy = time.perf_counter() - t0
+            print(f"{size:>6} {perfect!s:>7} {'legacy':>13} {legacy:>9.3f}")
+            # The first junction solve includes building the graph.
+            for label, method in (
+                ("bfs", "bfs"), ("bidirectional", "bidirectional"),
+                ("astar", "astar"), ("junction", "junction"),
+                ("junction warm", "junction"),
+            ):
+                t0 = time.perf_counter()
+                path = gen.solve((0, 0), end, method=method)
+                elapsed = time.perf_counter() - t0
+                assert len(path) == len(expected)
+                print(
+                    f"{size:>6} {perfect!s:>7} {label:>13} "
+                    f"{elapsed:>9.3f}  x{legacy / elapsed:.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""Benchmark the hot paths over a ladder of maze sizes.
+
+Every benchmark runs for each size and both ``perfect`` settings;
+``generate[<algorithm>]`` times each alternative generation algorithm,
+and the ``cells/s`` column makes them comparable across sizes. The
+wall time is the best of several runs (as many as fit in ``--min-time``,
+at most ``--repeat``); the peak memory comes from one extra run under
+``tracemalloc``, so tracing does not distort the timings.
+
+Usage:
+    python3 bench/bench_suite.py [--sizes 10 100 ...] [--output FILE]
+                                 [--compare BASELINE] [--threshold 0.2]
+
+With ``--compare``, every result is checked against the saved baseline;
+the script exits with status 1 if a benchmark got slower (or needs more
+memory) by more than the threshold.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterator, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from core.config_parser import parse_config  # noqa: E402
+from core.output_writer import write_output  # noqa: E402
+from mazegen.algorithms import ALGORITHMS  # noqa: E402
+from mazegen.generator import MazeGenerator  # noqa: E402
+
+SIZES = [10, 100, 500, 1000, 2000, 4000]
+SEED = 42
+
+# A setup function prepares one run and returns the operation to time.
+Setup = Callable[[], Callable[[], object]]
+
+_cache: dict[tuple[int, bool, str], MazeGenerator] = {}
+
+
+def _generated(size: int, perfect: bool, storage: str) -> MazeGenerator:
+    """Return a generated maze, built once per size and setting."""
+    key = (size, perfect, storage)
+    if key not in _cache:
+        _cache.clear()
+        gen = MazeGenerator(
+            size, size, seed=SEED, perfect=perfect, storage=storage,
+        )
+        gen.generate()
+        _cache[key] = gen
+    return _cache[key]
+
+
+def _drain(steps: Iterator[object]) -> None:
+    """Consume an iterator."""
+    for _ in steps:
+        pass
+
+
+def benchmarks(
+    size: int, perfect: bool, storage: str, tmp: str,
+) -> Iterator[tuple[str, Setup]]:
+    """Yield (name, setup) for every benchmark at one size.
+
+    Args:
+        size: Width and height of the maze.
+        perfect: Whether the maze is perfect.
+        storage: Grid storage backend.
+        tmp: Directory for files written by the benchmarks.
+    """
+    end = (size - 1, size - 1)
+
+    def fresh(algorithm: str = "backtracker") -> MazeGenerator:
+        """Return an ungenerated maze."""
+        return MazeGenerator(
+            size, size, seed=SEED, perfect=perfect, storage=storage,
+            algorithm=algorithm,
+        )
+
+    def generate() -> Callable[[], object]:
+        """Time generate() on a new maze."""
+        return fresh().generate
+
+    def generate_animated() -> Callable[[], object]:
+        """Time draining generate_animated() on a new maze."""
+        gen = fresh()
+        return lambda: _drain(gen.generate_animated())
+
+    yield "generate", generate
+    yield "generate_animated", generate_animated
+
+    def generate_with(algorithm: str) -> Setup:
+        """Time generate() with another generation algorithm."""
+        return lambda: fresh(algorithm).generate
+
+    for algorithm in ALGORITHMS:
+        if algorithm != "backtracker":
+            yield f"generate[{algorithm}]", generate_with(algorithm)
+
+    def solve() -> Callable[[], object]:
+        """Time solving from corner to corner."""
+        gen = _generated(size, perfect, storage)
+        return lambda: gen.solve((0, 0), end)
+
+    def validate_no_3x3_area() -> Callable[[], object]:
+        """Time the 3x3 check."""
+        return _generated(size, perfect, storage).validate_no_3x3_area
+
+    def metrics() -> Callable[[], object]:
+        """Time the metrics of a maze with a known solution."""
+        gen = _generated(size, perfect, storage)
+        gen.entry, gen.exit_ = (0, 0), end
+        gen.solution = gen.solve((0, 0), end)
+        return gen.metrics
+
+    def remove_extra_walls() -> Callable[[], object]:
+        """Time loop insertion on a copy of a generated grid."""
+        base = _generated(size, perfect, storage)
+        gen = MazeGenerator.from_hex(base.get_hex_layout(), storage)
+        return gen._remove_extra_walls
+
+    def get_hex_layout() -> Callable[[], object]:
+        """Time hex encoding."""
+        return _generated(size, perfect, storage).get_hex_layout
+
+    def write() -> Callable[[], object]:
+        """Time writing the output file."""
+        gen = _generated(size, perfect, storage)
+        hex_grid = gen.get_hex_layout()
+        path = gen.solve((0, 0), end)
+        out = os.path.join(tmp, "maze.txt")
+        return lambda: write_output(out, hex_grid, (0, 0), end, path)
+
+    def config() -> Callable[[], object]:
+        """Time parsing a config file."""
+        out = os.path.join(tmp, "config.txt")
+        with open(out, "w") as f:
+            f.write(
+                f"WIDTH={size}\nHEIGHT={size}\nENTRY=0,0\n"
+                f"EXIT={end[0]},{end[1]}\nOUTPUT_FILE=maze.txt\n"
+                f"PERFECT={perfect}\nSEED={SEED}\n"
+            )
+        return lambda: parse_config(out)
+
+    yield "solve", solve
+    yield "validate_no_3x3_area", validate_no_3x3_area
+    yield "metrics", metrics
+    yield "_remove_extra_walls", remove_extra_walls
+    yield "get_hex_layout", get_hex_layout
+    yield "write_output", write
+    yield "parse_config", config
+
+
+def measure(
+    setup: Setup, repeat: int, min_time: float, memory: bool,
+) -> dict[str, Any]:
+    """Time an operation and optionally record its peak memory.
+
+    Args:
+        setup: Prepares a run and returns the operation.
+        repeat: Maximum number of timed runs.
+        min_time: Stop repeating once this much time was spent.
+        memory: Also measure the tracemalloc peak in an extra run.
+
+    Returns:
+        Best wall time in seconds, number of runs and peak bytes.
+    """
+    best = float("inf")
+    spent = 0.0
+    runs = 0
+    while runs < repeat and (runs == 0 or spent < min_time):
+        operation = setup()
+        t0 = time.perf_counter()
+        operation()
+        elapsed = time.perf_counter() - t0
+        best = min(best, elapsed)
+        spent += elapsed
+        runs += 1
+
+    peak: Optional[int] = None
+    if memory:
+        operation = setup()
+        tracemalloc.start()
+        operation()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"seconds": best, "runs": runs, "peak_bytes": peak}
+
+
+def run_suite(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every benchmark and return the JSON report."""
+    results: list[dict[str, Any]] = []
+    only = set(args.only or ())
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            for perfect in (True, False):
+                for name, setup in benchmarks(
+                    size, perfect, args.storage, tmp,
+                ):
+                    if only and name not in only:
+                        continue
+                    result = {
+                        "name": name, "size": size, "perfect": perfect,
+                        **measure(
+                            setup, args.repeat, args.min_time,
+                            not args.no_memory,
+                        ),
+                    }
+                    result["cells_per_s"] = (
+                        size * size / max(result["seconds"], 1e-9)
+                    )
+                    results.append(result)
+                    print(_format(result), flush=True)
+    _cache.clear()
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "storage": args.storage,
+        },
+        "results": results,
+    }
+
+
+def _format(result: dict[str, Any]) -> str:
+    """Format one result as a table row."""
+    peak = result["peak_bytes"]
+    memory = f"{peak / 2**20:>10.2f}" if peak is not None else f"{'-':>10}"
+    return (
+        f"{result['name']:<22} {result['size']:>6} "
+        f"{result['perfect']!s:>7} {result['seconds']:>10.6f} {memory} "
+        f"{result['cells_per_s']:>12,.0f}"
+    )
+
+
+def compare(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float,
+    noise: float,
+) -> list[str]:
+    """Compare a report against a baseline.
+
+    Args:
+        report: Results of this run.
+        baseline: Previously saved results.
+        threshold: Allowed relative slowdown or memory growth, e.g. 0.2.
+        noise: Timings below this many seconds are never flagged.
+
+    Returns:
+        One message per regression.
+    """
+    def key(result: dict[str, Any]) -> tuple[str, int, bool]:
+        """Identify a result across runs."""
+        return result["name"], result["size"], result["perfect"]
+
+    old = {key(result): result for result in baseline["results"]}
+    regressions: list[str] = []
+    print(f"\n{'benchmark':<22} {'size':>6} {'perfect':>7} "
+          f"{'time':>8} {'memory':>8}")
+    for result in report["results"]:
+        before = old.get(key(result))
+        if before is None:
+            continue
+        label = (f"{result['name']:<22} {result['size']:>6} "
+                 f"{result['perfect']!s:>7}")
+        ratio = result["seconds"] / max(before["seconds"], 1e-9)
+        mem_ratio: Optional[float] = None
+        if result["peak_bytes"] and before.get("peak_bytes"):
+            mem_ratio = result["peak_bytes"] / before["peak_bytes"]
+        name = (f"{result['name']} {result['size']} "
+                f"perfect={result['perfect']}")
+        flags = []
+        if ratio > 1 + threshold and result["seconds"] >= noise:
+            flags.append("SLOWER")
+            regressions.append(f"{name}: time x{ratio:.2f}")
+        if mem_ratio is not None and mem_ratio > 1 + threshold:
+            flags.append("MORE MEMORY")
+            regressions.append(f"{name}: memory x{mem_ratio:.2f}")
+        memory = f"x{mem_ratio:.2f}" if mem_ratio is not None else "-"
+        line = f"{label} {'x%.2f' % ratio:>8} {memory:>8}  {' '.join(flags)}"
+        print(line.rstrip())
+    return regressions
+
+
+def main() -> None:
+    """Parse arguments, run the suite, save and compare the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--only", nargs="+", metavar="NAME",
+                        help="run only these benchmarks")
+    parser.add_argument("--storage", default="list",
+                        help="grid storage backend (default: list)")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="maximum timed runs per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.5,
+                        help="stop repeating after this many seconds")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc run")
+    parser.add_argument("--output", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="flag regressions against a saved report")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed relative regression (default: 0.2)")
+    parser.add_argument("--noise", type=float, default=0.001,
+                        help="ignore timings below this many seconds")
+    args = parser.parse_args()
+
+    print(f"{'benchmark':<22} {'size':>6} {'perfect':>7} "
+          f"{'seconds':>10} {'peak MiB':>10} {'cells/s':>12}")
+    report = run_suite(args)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        try:
+            with open(args.compare) as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error: Cannot read baseline '{args.compare}': {e}")
+            sys.exit(2)
+        regressions = compare(report, baseline, args.threshold, args.noise)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s):")
+            for message in regressions:
+                print(f"  {message}")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
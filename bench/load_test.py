@@ -0,0 +1,169 @@
+"""Load-test the maze server (mazegen.server).
+
+Usage:
+    python3 bench/load_test.py [--url http://127.0.0.1:8042 | --unix PATH]
+        [--spawn] [--requests 200] [--concurrency 16] [--size 100]
+        [--seeds 4]
+
+Every client keeps one connection open and sends ``GET /generate``
+requests with seeds drawn round-robin from ``--seeds`` distinct values,
+so requests for the same seed that overlap are coalesced by the server
+(``--seeds 0`` sends no seed, nothing is coalesced). Prints latency
+percentiles, throughput and the server's /stats counters.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection to the server."""
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+    ) -> None:
+        """Wrap an open connection."""
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(
+        cls, host: str, port: int, unix: Optional[str],
+    ) -> "Client":
+        """Open a connection over TCP or a Unix socket."""
+        if unix is not None:
+            reader, writer = await asyncio.open_unix_connection(unix)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def get(self, target: str) -> tuple[int, bytes]:
+        """Send a GET request and read the (possibly chunked) response."""
+        self.writer.write(
+            f"GET {target} HTTP/1.1\r\nHost: maze\r\n\r\n".encode()
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        headers: dict[str, str] = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding") == "chunked":
+            body = bytearray()
+            while True:
+                size = int(await self.reader.readline(), 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                body += chunk[:-2]
+            return status, bytes(body)
+        length = int(headers.get("content-length", "0"))
+        return status, await self.reader.readexactly(length)
+
+    def close(self) -> None:
+        """Close the connection."""
+        self.writer.close()
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Return the p-th percentile (nearest rank) of sorted values."""
+    if not values:
+        return 0.0
+    rank = max(0, min(len(values) - 1, round(p / 100 * len(values)) - 1))
+    return values[rank]
+
+
+async def run(args: argparse.Namespace, host: str, port: int) -> None:
+    """Send the requests and print the report."""
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+    counter = iter(range(args.requests))
+
+    async def worker() -> None:
+        client = await Client.connect(host, port, args.unix)
+        try:
+            for n in counter:
+                target = f"/generate?width={args.size}&height={args.size}"
+                if args.seeds:
+                    target += f"&seed={n % args.seeds}"
+                start = time.perf_counter()
+                status, _ = await client.get(target)
+                latencies.append(time.perf_counter() - start)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    client = await Client.connect(host, port, args.unix)
+    _, body = await client.get("/stats")
+    client.close()
+
+    latencies.sort()
+    print(f"requests:    {len(latencies)} in {elapsed:.2f} s "
+          f"({args.concurrency} concurrent, {args.size}x{args.size}, "
+          f"{args.seeds or 'no'} seeds)")
+    print(f"throughput:  {len(latencies) / elapsed:.1f} req/s")
+    print(f"latency p50: {percentile(latencies, 50) * 1000:.1f} ms")
+    print(f"latency p99: {percentile(latencies, 99) * 1000:.1f} ms")
+    print(f"status:      {dict(sorted(statuses.items()))}")
+    print(f"server:      {json.loads(body)}")
+
+
+def main() -> None:
+    """Parse arguments, optionally start a server, run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8042")
+    parser.add_argument("--unix", metavar="PATH",
+                        help="connect to a Unix socket instead of --url")
+    parser.add_argument("--spawn", action="store_true",
+                        help="start a server for the test (on a Unix "
+                             "socket unless --unix is given)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes of the spawned server")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--seeds", type=int, default=4,
+                        help="distinct seeds (0: no seed)")
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    host, port = url.hostname or "127.0.0.1", url.port or 8042
+
+    server = None
+    if args.spawn:
+        if args.unix is None:
+            args.unix = os.path.join(tempfile.mkdtemp(), "maze.sock")
+        command = [sys.executable, "-m", "mazegen.server",
+                   "--unix", args.unix]
+        if args.workers is not None:
+            command += ["--workers", str(args.workers)]
+        root = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+        server = subprocess.Popen(command, cwd=root, stdout=subprocess.PIPE)
+        assert server.stdout is not None
+        server.stdout.readline()  # "Serving mazes on ..." once listening
+    try:
+        asyncio.run(run(args, host, port))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+            os.remove(args.unix)
+
+
+if __name__ == "__main__":
+    main()
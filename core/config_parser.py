@@ -2,80 +2,215 @@
 
 from typing import Any
 
+from mazegen.algorithms import ALGORITHMS
+from mazegen.binary import SEED_MAX, SEED_MIN
+from mazegen.pathcodec import PATH_FORMATS
+
 REQUIRED_KEYS = {"WIDTH", "HEIGHT", "ENTRY", "EXIT", "OUTPUT_FILE", "PERFECT"}
 
 
-def parse_config(filename: str) -> dict[str, Any] | None:
-    """Read and validate the configuration file.
+def _parse_value(key: str, value: str) -> object:
+    """Convert a raw config value to the type expected for its key.
 
     Args:
-        filename: Path to the configuration file.
+        key: Upper-case config key.
+        value: Raw string value.
 
     Returns:
-        Dictionary with configuration values, or None on error.
-    """
-    config: dict[str, object] = {}
+        The converted value.
 
-    try:
-        with open(filename, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
+    Raises:
+        ValueError: If the value cannot be converted.
+    """
+    if key in ("WIDTH", "HEIGHT", "SEED", "TILE_SIZE", "CACHE_SIZE"):
+        return int(value)
+    if key in ("ENTRY", "EXIT"):
+        return tuple(map(int, value.split(",")))
+    if key in ("PERFECT", "STREAM", "PROFILE"):
+        return value.lower() == "true"
+    if key in ("ANIMATION_RATE", "ANIMATION_DURATION", "LOOP_DENSITY"):
+        return float(value)
+    if key in ("ALGORITHM", "PATH_FORMAT"):
+        return value.lower()
+    if key == "CPROFILE":
+        return tuple(name.strip() for name in value.split(",") if name.strip())
+    return value
 
-                key, value = line.split("=", 1)
-                key = key.strip().upper()
-                value = value.strip()
 
-                if key in ("WIDTH", "HEIGHT", "SEED"):
-                    config[key] = int(value)
-                elif key in ("ENTRY", "EXIT"):
-                    config[key] = tuple(map(int, value.split(",")))
-                elif key == "PERFECT":
-                    config[key] = value.lower() == "true"
-                else:
-                    config[key] = value
+def _validate(config: dict[str, Any]) -> bool:
+    """Check required keys, dimensions and ENTRY/EXIT coordinates.
 
-    except FileNotFoundError:
-        print(f"Error: Config file '{filename}' not found.")
-        return None
-    except ValueError as e:
-        print(f"Error: Invalid value in config file: {e}")
-        return None
+    Args:
+        config: Parsed configuration values.
 
+    Returns:
+        True if the configuration is valid, False otherwise.
+    """
     missing = REQUIRED_KEYS - config.keys()
     if missing:
         print(f"Error: Missing required keys: {', '.join(sorted(missing))}")
-        return None
+        return False
 
     width = config.get("WIDTH")
     height = config.get("HEIGHT")
     if not isinstance(width, int) or not isinstance(height, int):
         print("Error: WIDTH and HEIGHT must be integers.")
-        return None
+        return False
     if width < 1 or height < 1:
         print(
             f"Error: Dimensions must be positive "
             f"(got {width}x{height})."
         )
-        return None
+        return False
 
     entry = config.get("ENTRY")
     exit_ = config.get("EXIT")
     if not isinstance(entry, tuple) or not isinstance(exit_, tuple):
         print("Error: ENTRY/EXIT must be coordinate pairs.")
-        return None
+        return False
     ex, ey = entry
     ox, oy = exit_
     bounds = f"{width}x{height}"
     if not (0 <= ex < width and 0 <= ey < height):
         print(f"Error: ENTRY {entry} out of bounds ({bounds}).")
-        return None
+        return False
     if not (0 <= ox < width and 0 <= oy < height):
         print(f"Error: EXIT {exit_} out of bounds ({bounds}).")
-        return None
+        return False
     if entry == exit_:
         print("Error: ENTRY and EXIT must differ.")
+        return False
+
+    algorithm = config.get("ALGORITHM", "backtracker")
+    if algorithm not in ALGORITHMS:
+        print(
+            f"Error: Unknown ALGORITHM '{algorithm}' "
+            f"(choose from {', '.join(ALGORITHMS)})."
+        )
+        return False
+
+    path_format = config.get("PATH_FORMAT", "letters")
+    if path_format not in PATH_FORMATS:
+        print(
+            f"Error: Unknown PATH_FORMAT '{path_format}' "
+            f"(choose from {', '.join(PATH_FORMATS)})."
+        )
+        return False
+
+    loop_density = config.get("LOOP_DENSITY")
+    if loop_density is not None and not 0 <= loop_density <= 1:
+        print(
+            f"Error: LOOP_DENSITY must be between 0 and 1 "
+            f"(got {loop_density})."
+        )
+        return False
+
+    rate = config.get("ANIMATION_RATE")
+    if rate is not None and not rate > 0:
+        print(f"Error: ANIMATION_RATE must be positive (got {rate}).")
+        return False
+
+    duration = config.get("ANIMATION_DURATION")
+    if duration is not None and not duration >= 0:
+        print(
+            f"Error: ANIMATION_DURATION must not be negative "
+            f"(got {duration})."
+        )
+        return False
+
+    seed = config.get("SEED")
+    if seed is not None and not SEED_MIN <= seed <= SEED_MAX:
+        print(f"Error: SEED must fit in 64 bits (got {seed}).")
+        return False
+
+    tile_size = config.get("TILE_SIZE")
+    if tile_size is not None and tile_size < 1:
+        print(f"Error: TILE_SIZE must be at least 1 (got {tile_size}).")
+        return False
+
+    cache_size = config.get("CACHE_SIZE")
+    if cache_size is not None and cache_size < 0:
+        print(f"Error: CACHE_SIZE must not be negative (got {cache_size}).")
+        return False
+
+    return True
+
+
+def parse_config(filename: str) -> dict[str, Any] | None:
+    """Read and validate the configuration file.
+
+    Args:
+        filename: Path to the configuration file.
+
+    Returns:
+        Dictionary with configuration values, or None on error.
+    """
+    config: dict[str, object] = {}
+
+    try:
+        with open(filename, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+
+                key, value = line.split("=", 1)
+                key = key.strip().upper()
+                config[key] = _parse_value(key, value.strip())
+
+    except FileNotFoundError:
+        print(f"Error: Config file '{filename}' not found.")
+        return None
+    except ValueError as e:
+        print(f"Error: Invalid value in config file: {e}")
+        return None
+
+    if not _validate(config):
         return None
 
     return config
+
+
+def parse_manifest(filename: str) -> list[dict[str, Any]] | None:
+    """Read and validate a batch manifest.
+
+    Each non-empty, non-comment line describes one maze as
+    whitespace-separated KEY=VALUE pairs using the same keys as the
+    configuration file, e.g.::
+
+        WIDTH=20 HEIGHT=15 ENTRY=0,0 EXIT=19,14 PERFECT=True OUTPUT_FILE=a.txt
+
+    Args:
+        filename: Path to the manifest file.
+
+    Returns:
+        One configuration dictionary per maze, or None on error.
+    """
+    configs: list[dict[str, Any]] = []
+
+    try:
+        with open(filename, "r") as f:
+            for lineno, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+
+                config: dict[str, object] = {}
+                for token in line.split():
+                    key, value = token.split("=", 1)
+                    key = key.strip().upper()
+                    config[key] = _parse_value(key, value.strip())
+
+                if not _validate(config):
+                    print(f"Error: Invalid maze on manifest line {lineno}.")
+                    return None
+                configs.append(config)
+
+    except FileNotFoundError:
+        print(f"Error: Manifest file '{filename}' not found.")
+        return None
+    except ValueError as e:
+        print(f"Error: Invalid value in manifest file: {e}")
+        return None
+
+    return configs
@@ -1,22 +1,33 @@
 """Output writer for A-Maze-ing."""
 
+from typing import Iterable, Optional
+
+from mazegen.binary import write_binary
+from mazegen.pathcodec import encode_path
+
 
 def write_output(
     file_path: str,
-    hex_grid: list[str],
+    hex_grid: Iterable[str],
     entry: tuple[int, int],
     exit_pos: tuple[int, int],
     path: str,
+    path_format: str = "letters",
 ) -> None:
     """Speichert das generierte Labyrinth im geforderten Format in eine
     Textdatei.
 
     Args:
         file_path: Der Pfad zur Ausgabedatei (z.B. 'maze.txt').
-        hex_grid: Das Labyrinth als Liste von Hex-Strings aus get_hex_layout().
+        hex_grid: Das Labyrinth als Hex-Strings, z.B. aus get_hex_layout()
+            oder als Stream aus generate_rows(); jede Zeile wird sofort
+            geschrieben.
         entry: Die Koordinaten des Eingangs (x, y).
         exit_pos: Die Koordinaten des Ausgangs (x, y).
         path: Der vom Solver berechnete Pfad (z.B. 'SESSW').
+        path_format: Kodierung der Pfadzeile: 'letters' (Standard,
+            ein Buchstabe pro Schritt), 'rle' oder 'packed'; siehe
+            mazegen.pathcodec.
     """
     try:
         with open(file_path, "w") as f:
@@ -28,6 +39,34 @@ def write_output(
             f.write(f"{entry[0]},{entry[1]}\n")
             f.write(f"{exit_pos[0]},{exit_pos[1]}\n")
             # 3. Den Lösungspfad schreiben
-            f.write(path + "\n")
+            f.write(encode_path(path, path_format) + "\n")
     except IOError as e:
         print(f"Error writing output file: {e}")
+
+
+def write_binary_output(
+    file_path: str,
+    hex_grid: Iterable[str],
+    entry: tuple[int, int],
+    exit_pos: tuple[int, int],
+    width: int,
+    seed: Optional[int] = None,
+    perfect: bool = True,
+) -> None:
+    """Save the maze in the compact binary format (see mazegen.binary).
+
+    Args:
+        file_path: Path of the binary output file (e.g. 'maze.bin').
+        hex_grid: The maze as hex strings, e.g. from get_hex_layout().
+        entry: Entry coordinates (x, y).
+        exit_pos: Exit coordinates (x, y).
+        width: Maze width in cells.
+        seed: Seed used to generate the maze, if any.
+        perfect: Whether the maze is perfect.
+    """
+    try:
+        write_binary(
+            file_path, hex_grid, entry, exit_pos, width, seed, perfect,
+        )
+    except IOError as e:
+        print(f"Error writing binary output file: {e}")
@@ -0,0 +1,134 @@
+"""Frame-budgeted playback of animation steps.
+
+Drawing and sleeping after every carved cell ties the animation speed to
+the number of cells: a 1000x1000 maze would take hours. FrameScheduler
+instead decides, once per frame, how many steps are due from the elapsed
+time and the target step rate, and hands them to the caller as one
+batch. The screen is therefore refreshed at most ``fps`` times per
+second, late frames are caught up with bigger batches, and the total
+length of an animation can be bounded.
+
+The scheduler knows nothing about curses: drawing and key polling are
+passed in as callables.
+"""
+
+import math
+import time
+from typing import Callable, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Steps are pulled in chunks of this size between two deadline checks.
+CHECK_EVERY = 64
+
+
+class FrameScheduler:
+    """Play an iterable of steps in frames at a target frame rate."""
+
+    def __init__(
+        self,
+        fps: float = 30.0,
+        rate: Optional[float] = None,
+        duration: Optional[float] = None,
+    ) -> None:
+        """Configure the playback speed.
+
+        Args:
+            fps: Target frames per second.
+            rate: Steps per second, or None for no limit.
+            duration: Upper bound for the whole animation in seconds;
+                the rate is raised when needed to finish in time. Zero
+                or less plays everything at once.
+        """
+        self.fps = fps
+        self.rate = rate
+        self.duration = duration
+
+    def step_rate(self, total: Optional[int] = None) -> float:
+        """Return the steps per second for an animation.
+
+        Args:
+            total: Number of steps, if known; needed for ``duration``.
+
+        Returns:
+            Steps per second, ``math.inf`` for no limit.
+        """
+        rate = self.rate if self.rate is not None else math.inf
+        if self.duration is not None and total is not None:
+            if self.duration <= 0:
+                return math.inf
+            needed = total / self.duration
+            rate = needed if self.rate is None else max(rate, needed)
+        return rate
+
+    def play(
+        self,
+        steps: Iterable[T],
+        on_frame: Callable[[list[T]], None],
+        total: Optional[int] = None,
+        poll_key: Optional[Callable[[], int]] = None,
+        on_key: Optional[Callable[[int], bool]] = None,
+    ) -> bool:
+        """Consume every step, drawing one batch per frame.
+
+        Each frame pulls the steps that are due by now, but stops early
+        when the frame budget is spent, so the display keeps refreshing
+        and reading keys even if producing the steps is slow.
+
+        Args:
+            steps: Animation steps, e.g. from generate_animated().
+            on_frame: Called once per frame with the new steps (possibly
+                none); it should draw them and refresh the screen.
+            total: Expected number of steps, used for ``duration``.
+            poll_key: Return a pending key code or -1 without blocking.
+            on_key: Handle a key during playback and return True; keys
+                it does not handle (or any key, if it is None) cancel.
+
+        Returns:
+            True if played to the end, False if cancelled. The remaining
+            steps are consumed without drawing in that case, so a
+            generator still finishes its work.
+        """
+        rate = self.step_rate(total)
+        frame = 1.0 / self.fps
+        iterator = iter(steps)
+        start = time.monotonic()
+        done = 0
+
+        while True:
+            now = time.monotonic()
+            deadline = now + frame
+            if math.isinf(rate):
+                due = math.inf
+            else:
+                due = (now - start + frame) * rate
+            batch: list[T] = []
+            exhausted = False
+            while done < due:
+                for step in iterator:
+                    batch.append(step)
+                    done += 1
+                    if done >= due or len(batch) % CHECK_EVERY == 0:
+                        break
+                else:
+                    exhausted = True
+                    break
+                if time.monotonic() >= deadline:
+                    break
+
+            on_frame(batch)
+            if exhausted:
+                return True
+
+            if poll_key is not None:
+                key = poll_key()
+                while key != -1:
+                    if on_key is None or not on_key(key):
+                        for _ in iterator:
+                            pass
+                        return False
+                    key = poll_key()
+
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
@@ -1,10 +1,13 @@
 """Curses-based graphical terminal display for A-Maze-ing."""
 
 import curses
-import time
-from typing import Optional
+from array import array
+from itertools import chain
+from typing import Callable, Collection, Iterable, Optional
 
-from mazegen.generator import MazeGenerator
+from display.animation import FrameScheduler
+from mazegen.generator import LOOP_DENSITY, Grid, MazeGenerator
+from mazegen.pathcodec import path_coords
 
 N, E, S, W = 1, 2, 4, 8
 CELL_W = 2
@@ -17,6 +20,15 @@ ENTRY_COLOR = 4
 EXIT_COLOR = 5
 PATTERN_COLOR = 6
 
+# Terminal rows kept free below the maze for the status line and menu.
+MENU_H = 6
+
+# Default animation speeds (cells per second) and length bounds (seconds).
+GENERATION_RATE = 200.0
+GENERATION_DURATION = 3.0
+PATH_RATE = 50.0
+PATH_DURATION = 2.0
+
 
 def rgb_to_curses(r: int, g: int, b: int) -> tuple[int, int, int]:
     """Convert standard RGB (0-255) to curses RGB scale (0-1000)."""
@@ -123,7 +135,7 @@ def draw_cell(
     height: int,
     offset_x: int = 0,
     offset_y: int = 0,
-    path: Optional[list[tuple[int, int]]] = None,
+    path: Optional[Collection[tuple[int, int]]] = None,
 ) -> None:
     """Draw a single maze cell and intelligently erase broken walls.
 
@@ -137,10 +149,11 @@ def draw_cell(
         height: Total maze height in cells.
         offset_x: Horizontal terminal offset for centering.
         offset_y: Vertical terminal offset for centering.
-        path: Solution path list, used for smart wall erasing.
+        path: Solution path cells (ideally a set), used for smart wall
+            erasing.
     """
     if path is None:
-        path = []
+        path = ()
 
     row = offset_y + y * (CELL_H + 1) + 1
     col = offset_x + x * (CELL_W + 1) + 1
@@ -185,62 +198,309 @@ def draw_cell(
         pass
 
 
-def draw_maze(
-    stdscr: curses.window,
-    grid: list[list[int]],
-    width: int,
-    height: int,
-    entry: tuple[int, int],
-    exit_: tuple[int, int],
-    path: Optional[list[tuple[int, int]]] = None,
-    show_path: bool = False,
-    offset_x: int = 0,
-    offset_y: int = 0,
-) -> None:
-    """Render the full generated maze onto the screen.
+class MazeRenderer:
+    """Incremental maze renderer with a scrollable viewport.
 
-    Args:
-        stdscr: The curses screen object.
-        grid: 2D list of wall bitmasks.
-        width: Maze width in cells.
-        height: Maze height in cells.
-        entry: Entry coordinates as (x, y).
-        exit_: Exit coordinates as (x, y).
-        path: List of (x, y) coordinates forming the solution path.
-        show_path: Whether to display the solution path.
-        offset_x: Horizontal terminal offset for centering.
-        offset_y: Vertical terminal offset for centering.
-    """
-    if path is None:
-        path = []
-
-    stdscr.clear()
+    Only the window of cells that fits on the terminal is drawn, so the
+    cost of a repaint depends on the terminal size, not the maze size.
+    Every visible cell's last drawn state (walls, colour and the path
+    state of the neighbours whose shared wall gap it paints) is
+    remembered; a repaint only visits the cells marked dirty since the
+    last one and only calls ``draw_cell`` for those whose state actually
+    changed, so toggling the path costs O(path) instead of
+    O(cells x path). Scrolling redraws the visible window.
 
-    for y in range(height):
-        for x in range(width):
-            cell = grid[y][x]
+    ``pattern`` restricts the '42' colour to the given cells; by default
+    every fully walled cell gets it, which is wrong while the maze is
+    still being carved.
+    """
 
-            if show_path and (x, y) in path:
-                color = PATH
-            elif cell == 15:
-                color = PATTERN_COLOR
-            else:
-                color = CORRIDOR
+    def __init__(
+        self,
+        stdscr: curses.window,
+        grid: Grid,
+        width: int,
+        height: int,
+        entry: tuple[int, int],
+        exit_: tuple[int, int],
+        offset_x: int = 0,
+        offset_y: int = 0,
+    ) -> None:
+        """Create the renderer; nothing is drawn until render().
+
+        The viewport starts as the whole maze; call fit() to clip it to
+        the terminal.
+
+        Args:
+            stdscr: The curses screen object.
+            grid: Wall bitmasks, indexed as grid[y][x].
+            width: Maze width in cells.
+            height: Maze height in cells.
+            entry: Entry coordinates as (x, y).
+            exit_: Exit coordinates as (x, y).
+            offset_x: Horizontal terminal offset for centering.
+            offset_y: Vertical terminal offset for centering.
+        """
+        self.stdscr = stdscr
+        self.grid = grid
+        self.width = width
+        self.height = height
+        self.entry = entry
+        self.exit_ = exit_
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.view_x = 0
+        self.view_y = 0
+        self.view_w = width
+        self.view_h = height
+        self.path: set[tuple[int, int]] = set()
+        self.show_path = False
+        self.pattern: Optional[Collection[tuple[int, int]]] = None
+        self._drawn = array("i")
+        self._dirty: set[tuple[int, int]] = set()
+        self._full = True
+
+    @property
+    def clipped(self) -> bool:
+        """Return True if the maze is larger than the viewport."""
+        return self.view_w < self.width or self.view_h < self.height
+
+    def invalidate(self) -> None:
+        """Forget the screen model; the next render() redraws all."""
+        self._full = True
+        self._dirty.clear()
+
+    def set_grid(self, grid: Grid) -> None:
+        """Show a different maze of the same size."""
+        self.grid = grid
+        self.invalidate()
+
+    def set_offset(self, offset_x: int, offset_y: int) -> None:
+        """Move the maze on screen; forces a full redraw if it moved."""
+        if (offset_x, offset_y) != (self.offset_x, self.offset_y):
+            self.offset_x = offset_x
+            self.offset_y = offset_y
+            self.invalidate()
+
+    def fit(self, menu_h: int = MENU_H) -> None:
+        """Size the viewport to the terminal and center the maze.
+
+        Args:
+            menu_h: Terminal rows to keep free below the maze.
+        """
+        screen_h, screen_w = self.stdscr.getmaxyx()
+        view_w = max(1, min(self.width, (screen_w - 2) // (CELL_W + 1)))
+        view_h = max(1, min(
+            self.height, (screen_h - menu_h - 2) // (CELL_H + 1),
+        ))
+        if (view_w, view_h) != (self.view_w, self.view_h):
+            self.view_w = view_w
+            self.view_h = view_h
+            self.invalidate()
+        maze_w = view_w * (CELL_W + 1) + 2
+        maze_h = view_h * (CELL_H + 1) + 2
+        self.set_offset(
+            max(0, (screen_w - maze_w) // 2),
+            max(0, (screen_h - (maze_h + menu_h)) // 2),
+        )
+        self.scroll_to(self.view_x, self.view_y)
+
+    def scroll_to(self, view_x: int, view_y: int) -> None:
+        """Move the viewport so that cell (view_x, view_y) is top-left.
+
+        The position is clamped to the maze.
+        """
+        view_x = max(0, min(view_x, self.width - self.view_w))
+        view_y = max(0, min(view_y, self.height - self.view_h))
+        if (view_x, view_y) != (self.view_x, self.view_y):
+            self.view_x = view_x
+            self.view_y = view_y
+            self.invalidate()
+
+    def scroll(self, dx: int, dy: int) -> None:
+        """Move the viewport by (dx, dy) cells."""
+        self.scroll_to(self.view_x + dx, self.view_y + dy)
+
+    def center_on(self, x: int, y: int) -> None:
+        """Move the viewport so that cell (x, y) is in its middle."""
+        self.scroll_to(x - self.view_w // 2, y - self.view_h // 2)
+
+    def handle_key(self, key: int) -> bool:
+        """Scroll or refit for a navigation key.
+
+        Left/Right scroll by one column, 'k'/'j' (or Shift+Up/Shift+Down
+        where the terminal sends them) by one row, Shift+Left/Shift+Right
+        and PgUp/PgDn by a page, 'e' and 'x' jump to the entry and the
+        exit. Plain Up/Down stay with the menu. A terminal resize refits
+        the viewport.
+
+        Args:
+            key: Key code from getch().
+
+        Returns:
+            True if the key was handled and the screen was repainted.
+        """
+        if key == curses.KEY_RESIZE:
+            self.fit()
+        elif key == curses.KEY_LEFT:
+            self.scroll(-1, 0)
+        elif key == curses.KEY_RIGHT:
+            self.scroll(1, 0)
+        elif key in (curses.KEY_SR, ord("k")):
+            self.scroll(0, -1)
+        elif key in (curses.KEY_SF, ord("j")):
+            self.scroll(0, 1)
+        elif key == curses.KEY_SLEFT:
+            self.scroll(-self.view_w, 0)
+        elif key == curses.KEY_SRIGHT:
+            self.scroll(self.view_w, 0)
+        elif key == curses.KEY_PPAGE:
+            self.scroll(0, -self.view_h)
+        elif key == curses.KEY_NPAGE:
+            self.scroll(0, self.view_h)
+        elif key == ord("e"):
+            self.center_on(*self.entry)
+        elif key == ord("x"):
+            self.center_on(*self.exit_)
+        else:
+            return False
+        self.render()
+        return True
+
+    def visible(self, x: int, y: int) -> bool:
+        """Return True if cell (x, y) is inside the viewport."""
+        return (
+            self.view_x <= x < self.view_x + self.view_w
+            and self.view_y <= y < self.view_y + self.view_h
+        )
 
-            draw_cell(
-                stdscr, x, y, cell, color, width, height,
-                offset_x, offset_y, path
+    def mark_dirty(self, cells: Iterable[tuple[int, int]]) -> None:
+        """Schedule cells, and the neighbours sharing their gaps, for redraw.
+
+        Args:
+            cells: Cells whose walls or colour may have changed.
+        """
+        if self._full:
+            return
+        x0, y0 = self.view_x - 1, self.view_y - 1
+        x1, y1 = self.view_x + self.view_w, self.view_y + self.view_h
+        for x, y in cells:
+            if x0 <= x < x1 and y0 <= y < y1:
+                self._dirty.add((x, y))
+                self._dirty.add((x + 1, y))
+                self._dirty.add((x, y + 1))
+
+    def set_path(
+        self, path: Iterable[tuple[int, int]], show: bool,
+    ) -> None:
+        """Change the solution path and whether it is visible.
+
+        Args:
+            path: Cells of the solution path.
+            show: Whether the path should be drawn.
+        """
+        old = self.path if self.show_path else set()
+        self.path = set(path)
+        self.show_path = show
+        new = self.path if show else set()
+        self.mark_dirty(old ^ new)
+
+    def add_path_cells(self, cells: Iterable[tuple[int, int]]) -> None:
+        """Reveal more path cells, e.g. while animating the path."""
+        cells = [cell for cell in cells if cell not in self.path]
+        self.path.update(cells)
+        self.show_path = True
+        self.mark_dirty(cells)
+
+    def _state(self, x: int, y: int) -> tuple[int, int]:
+        """Return (state key, colour pair) of a cell as it should look."""
+        cell = self.grid[y][x]
+        path = self.path if self.show_path else ()
+        if (x, y) in path:
+            color = PATH
+        elif cell == 15 and (self.pattern is None or (x, y) in self.pattern):
+            color = PATTERN_COLOR
+        else:
+            color = CORRIDOR
+        state = cell | color << 4
+        if color == PATH:
+            state |= ((x, y - 1) in path) << 8 | ((x - 1, y) in path) << 9
+        return state, color
+
+    def _draw(self, x: int, y: int) -> bool:
+        """Draw one cell if its state changed; return True if drawn."""
+        if not self.visible(x, y):
+            return False
+        state, color = self._state(x, y)
+        index = (y - self.view_y) * self.view_w + x - self.view_x
+        if self._drawn[index] == state:
+            return False
+        draw_cell(
+            self.stdscr, x, y, self.grid[y][x], color,
+            self.width, self.height,
+            self.offset_x - self.view_x * (CELL_W + 1),
+            self.offset_y - self.view_y * (CELL_H + 1),
+            self.path,
+        )
+        self._drawn[index] = state
+        return True
+
+    def _draw_marker(self, cell: tuple[int, int], color_pair: int) -> None:
+        """Draw the entry or exit overlay if it is visible."""
+        if self.visible(*cell):
+            draw_overlay(
+                self.stdscr, cell[0], cell[1], color_pair,
+                self.offset_x - self.view_x * (CELL_W + 1),
+                self.offset_y - self.view_y * (CELL_H + 1),
             )
 
-    draw_overlay(stdscr, entry[0], entry[1], ENTRY_COLOR, offset_x, offset_y)
-    draw_overlay(stdscr, exit_[0], exit_[1], EXIT_COLOR, offset_x, offset_y)
-    stdscr.refresh()
+    def _draw_status(self) -> None:
+        """Show which part of a clipped maze is visible."""
+        if not self.clipped:
+            return
+        text = (
+            f" x {self.view_x}-{self.view_x + self.view_w - 1}"
+            f" y {self.view_y}-{self.view_y + self.view_h - 1}"
+            f" of {self.width}x{self.height}  "
+            "<-/->, j/k, PgUp/PgDn: scroll  e/x: entry/exit "
+        )
+        row = self.offset_y + self.view_h * (CELL_H + 1) + 1
+        _, screen_w = self.stdscr.getmaxyx()
+        try:
+            self.stdscr.addstr(row, 0, text[:screen_w - 1].ljust(
+                screen_w - 1))
+        except curses.error:
+            pass
+
+    def render(self) -> None:
+        """Repaint the changed visible cells, then the overlays."""
+        if self._full:
+            self.stdscr.erase()
+            self._drawn = array("i", [-1]) * (self.view_w * self.view_h)
+            cells: Iterable[tuple[int, int]] = (
+                (x, y)
+                for y in range(self.view_y, self.view_y + self.view_h)
+                for x in range(self.view_x, self.view_x + self.view_w)
+            )
+            self._full = False
+            self._draw_status()
+        else:
+            cells = self._dirty
+        drawn = False
+        for x, y in cells:
+            drawn = self._draw(x, y) or drawn
+        self._dirty = set()
+        if drawn:
+            self._draw_marker(self.entry, ENTRY_COLOR)
+            self._draw_marker(self.exit_, EXIT_COLOR)
+        self.stdscr.refresh()
 
 
 def get_path(
     gen: MazeGenerator,
     entry: tuple[int, int],
     exit_: tuple[int, int],
+    solution: Optional[str] = None,
 ) -> list[tuple[int, int]]:
     """Convert solution direction string into list of coordinates.
 
@@ -248,24 +508,16 @@ def get_path(
         gen: A MazeGenerator instance that has already called generate().
         entry: Entry coordinates as (x, y).
         exit_: Exit coordinates as (x, y).
+        solution: The solution in any format of mazegen.pathcodec;
+            solved here if None.
 
     Returns:
         A list of (x, y) tuples representing the solution path.
     """
-    path = [entry]
-    x, y = entry
-    directions: dict[str, tuple[int, int]] = {
-        "N": (0, -1),
-        "E": (1, 0),
-        "S": (0, 1),
-        "W": (-1, 0),
-    }
-    solution = gen.solve(start=entry, end=exit_)
-    for move in solution:
-        dx, dy = directions[move]
-        x, y = x + dx, y + dy
-        path.append((x, y))
-    return path
+    if solution is None:
+        solution = gen.solve(start=entry, end=exit_)
+    xs, ys = path_coords(solution, entry)
+    return list(zip(xs, ys))
 
 
 def show_menu(
@@ -275,6 +527,7 @@ def show_menu(
     height: int,
     offset_x: int = 0,
     offset_y: int = 0,
+    renderer: Optional[MazeRenderer] = None,
 ) -> str:
     """Display an interactive navigable menu.
 
@@ -285,6 +538,9 @@ def show_menu(
         height: Maze height in cells.
         offset_x: Horizontal terminal offset for centering.
         offset_y: Vertical terminal offset for centering.
+        renderer: If given, keys the menu does not use are passed to its
+            handle_key() (scrolling, resize) and the menu is placed
+            below its viewport.
 
     Returns:
         A string indicating the selected action:
@@ -298,13 +554,17 @@ def show_menu(
     ]
     actions = ["regenerate", "path", "color", "quit"]
     selected = 0
-    _, screen_w = stdscr.getmaxyx()
-    maze_bottom = offset_y + height * (CELL_H + 1) + 1
-    menu_start_row = maze_bottom + 2
-    maze_width_cols = width * (CELL_W + 1) + 1
-    center_col = offset_x + (maze_width_cols // 2)
 
     while True:
+        if renderer is not None:
+            width, height = renderer.view_w, renderer.view_h
+            offset_x, offset_y = renderer.offset_x, renderer.offset_y
+        _, screen_w = stdscr.getmaxyx()
+        maze_bottom = offset_y + height * (CELL_H + 1) + 1
+        menu_start_row = maze_bottom + 2
+        maze_width_cols = width * (CELL_W + 1) + 1
+        center_col = offset_x + (maze_width_cols // 2)
+
         for i in range(len(options)):
             try:
                 stdscr.addstr(menu_start_row + i, 0, " " * screen_w)
@@ -339,123 +599,147 @@ def show_menu(
             selected = (selected + 1) % len(options)
         elif key in (curses.KEY_ENTER, ord("\n"), ord("\r")):
             return actions[selected]
+        elif renderer is not None:
+            renderer.handle_key(key)
 
 
-def animate_path(
-    stdscr: curses.window,
-    grid: list[list[int]],
-    width: int,
-    height: int,
-    entry: tuple[int, int],
-    exit_: tuple[int, int],
+def play_cells(
+    renderer: MazeRenderer,
+    scheduler: FrameScheduler,
+    cells: Iterable[tuple[int, int]],
+    apply: Callable[[list[tuple[int, int]]], None],
+    total: Optional[int] = None,
+) -> bool:
+    """Play an animation of cells through a renderer.
+
+    Navigation keys scroll the view while the animation runs; any other
+    key skips to the end.
+
+    Args:
+        renderer: The renderer showing the maze.
+        scheduler: Decides how many cells are shown per frame.
+        cells: Cells in the order they change.
+        apply: Updates the renderer for one frame of cells.
+        total: Number of cells, if known.
+
+    Returns:
+        True if played to the end, False if skipped.
+    """
+    def frame(batch: list[tuple[int, int]]) -> None:
+        """Apply and repaint one frame."""
+        apply(batch)
+        renderer.render()
+
+    stdscr = renderer.stdscr
+    stdscr.nodelay(True)
+    try:
+        return scheduler.play(
+            cells, frame, total, stdscr.getch, renderer.handle_key,
+        )
+    finally:
+        stdscr.nodelay(False)
+
+
+def reveal_path(
+    renderer: MazeRenderer,
     path: list[tuple[int, int]],
-    delay: float = 0.02,
-    offset_x: int = 0,
-    offset_y: int = 0,
-) -> None:
-    """Animate the solution path cell by cell.
+    scheduler: Optional[FrameScheduler] = None,
+) -> bool:
+    """Animate the solution path through a renderer.
+
+    Each frame only repaints the newly revealed cells.
 
     Args:
-        stdscr: The curses screen object.
-        grid: 2D list of wall bitmasks.
-        width: Maze width in cells.
-        height: Maze height in cells.
-        entry: Entry coordinates as (x, y).
-        exit_: Exit coordinates as (x, y).
+        renderer: The renderer showing the maze.
         path: List of (x, y) coordinates forming the solution path.
-        delay: Time in seconds to wait between drawing each cell.
-        offset_x: Horizontal terminal offset for centering.
-        offset_y: Vertical terminal offset for centering.
+        scheduler: Playback speed; defaults to PATH_RATE cells per
+            second, at most PATH_DURATION seconds.
+
+    Returns:
+        True if played to the end, False if skipped.
     """
-    for x, y in path:
-        draw_cell(
-            stdscr, x, y, grid[y][x], PATH, width, height,
-            offset_x, offset_y, path
-        )
-        draw_overlay(
-            stdscr, entry[0], entry[1], ENTRY_COLOR, offset_x, offset_y
-        )
-        draw_overlay(
-            stdscr, exit_[0], exit_[1], EXIT_COLOR, offset_x, offset_y
-        )
-        stdscr.refresh()
-        time.sleep(delay)
+    if scheduler is None:
+        scheduler = FrameScheduler(rate=PATH_RATE, duration=PATH_DURATION)
+    renderer.set_path((), True)
+    return play_cells(
+        renderer, scheduler, path, renderer.add_path_cells, len(path),
+    )
 
 
 def animate_generation(
     stdscr: curses.window,
     gen: MazeGenerator,
-    width: int,
-    height: int,
     entry: tuple[int, int],
     exit_: tuple[int, int],
-    delay: float = 0.005,
-    offset_x: int = 0,
-    offset_y: int = 0,
-) -> None:
-    """Animate the maze being carved step-by-step.
+    scheduler: Optional[FrameScheduler] = None,
+    renderer: Optional[MazeRenderer] = None,
+) -> MazeRenderer:
+    """Generate the maze while showing the cells being carved.
+
+    Driven by ``gen.generate_animated``; when the animation is skipped
+    the generation still runs to the end.
 
     Args:
         stdscr: The curses screen object.
         gen: A MazeGenerator instance to generate and animate.
-        width: Maze width in cells.
-        height: Maze height in cells.
         entry: Entry coordinates as (x, y).
         exit_: Exit coordinates as (x, y).
-        delay: Time in seconds between each carved cell.
-        offset_x: Horizontal terminal offset for centering.
-        offset_y: Vertical terminal offset for centering.
-    """
-    stdscr.clear()
-
-    for y in range(height):
-        for x in range(width):
-            if gen.grid[y][x] == 15 and (x, y) in gen.visited:
-                color = PATTERN_COLOR
-            else:
-                color = CORRIDOR
-            draw_cell(
-                stdscr, x, y, gen.grid[y][x], color, width, height,
-                offset_x, offset_y,
-            )
+        scheduler: Playback speed; defaults to GENERATION_RATE cells per
+            second, at most GENERATION_DURATION seconds.
+        renderer: Renderer to draw with; a new one fitted to the
+            terminal is created if None.
 
-    draw_overlay(stdscr, entry[0], entry[1], ENTRY_COLOR, offset_x, offset_y)
-    draw_overlay(stdscr, exit_[0], exit_[1], EXIT_COLOR, offset_x, offset_y)
-    stdscr.refresh()
-
-    for x, y in gen.generate_animated(start_pos=entry):
-        color = PATTERN_COLOR if gen.grid[y][x] == 15 else CORRIDOR
-        draw_cell(
-            stdscr, x, y, gen.grid[y][x], color, width, height,
-            offset_x, offset_y,
-        )
-        draw_overlay(
-            stdscr, entry[0], entry[1], ENTRY_COLOR, offset_x, offset_y
+    Returns:
+        The renderer, showing the finished maze.
+    """
+    if scheduler is None:
+        scheduler = FrameScheduler(
+            rate=GENERATION_RATE, duration=GENERATION_DURATION,
         )
-        draw_overlay(
-            stdscr, exit_[0], exit_[1], EXIT_COLOR, offset_x, offset_y
+    steps = gen.generate_animated(start_pos=entry)
+    first = next(steps)  # creates the fresh grid
+    if renderer is None:
+        renderer = MazeRenderer(
+            stdscr, gen.grid, gen.width, gen.height, entry, exit_,
         )
-        stdscr.refresh()
-        time.sleep(delay)
+        renderer.fit()
+    else:
+        renderer.set_grid(gen.grid)
+    renderer.set_path((), False)
+    renderer.pattern = gen.visited
+
+    play_cells(
+        renderer, scheduler, chain((first,), steps), renderer.mark_dirty,
+        gen.width * gen.height,
+    )
+
+    renderer.pattern = None
+    renderer.invalidate()
+    renderer.render()
+    return renderer
 
 
 def _main(
     stdscr: curses.window,
-    width: int,
-    height: int,
+    gen: MazeGenerator,
     entry: tuple[int, int],
     exit_: tuple[int, int],
-    seed: Optional[int] = None,
+    solution: Optional[str] = None,
+    animation_rate: Optional[float] = None,
+    animation_duration: Optional[float] = None,
 ) -> None:
     """Main curses loop.
 
     Args:
         stdscr: The curses screen object.
-        width: Maze width in cells.
-        height: Maze height in cells.
+        gen: The maze to show. If it was not generated yet, it is
+            generated here with the generation animation.
         entry: Entry coordinates as (x, y).
         exit_: Exit coordinates as (x, y).
-        seed: Optional seed for reproducible generation.
+        solution: Solution of an already generated maze (N/E/S/W),
+            so it does not have to be solved again.
+        animation_rate: Animation speed in cells per second.
+        animation_duration: Upper bound per animation in seconds.
     """
     init_colors()
     try:
@@ -469,88 +753,67 @@ def _main(
     current_theme_idx = 0
     apply_theme(theme_names[current_theme_idx])
 
-    if seed is None:
-        seed = 42
-    show_path = False
-
-    gen = MazeGenerator(width=width, height=height, seed=seed)
-
-    screen_h, screen_w = stdscr.getmaxyx()
-    maze_w = width * (CELL_W + 1) + 2
-    maze_h = height * (CELL_H + 1) + 2
-    menu_h = 6
-    offset_x = max(0, (screen_w - maze_w) // 2)
-    offset_y = max(0, (screen_h - (maze_h + menu_h)) // 2)
-
-    # animate_generation(
-    #     stdscr, gen, width, height, entry, exit_,
-    #     offset_x=offset_x, offset_y=offset_y
-    # )
+    if animation_rate is None and animation_duration is None:
+        gen_anim = FrameScheduler(
+            rate=GENERATION_RATE, duration=GENERATION_DURATION,
+        )
+        path_anim = FrameScheduler(rate=PATH_RATE, duration=PATH_DURATION)
+    else:
+        gen_anim = FrameScheduler(
+            rate=animation_rate, duration=animation_duration,
+        )
+        path_anim = gen_anim
 
-    gen.generate(start_pos=entry)
-    draw_maze(
-        stdscr, gen.grid, width, height, entry, exit_,
-        offset_x=offset_x, offset_y=offset_y,
-    )
+    seed = 42 if gen.seed is None else gen.seed
+    show_path = False
 
-    path = get_path(gen, entry, exit_)
+    if len(gen.grid) == 0:
+        renderer = animate_generation(stdscr, gen, entry, exit_, gen_anim)
+        path = get_path(gen, entry, exit_)
+    else:
+        renderer = MazeRenderer(
+            stdscr, gen.grid, gen.width, gen.height, entry, exit_,
+        )
+        renderer.fit()
+        path = get_path(gen, entry, exit_, solution)
+    renderer.set_path(path, show_path)
 
     while True:
-        screen_h, screen_w = stdscr.getmaxyx()
-        maze_w = width * (CELL_W + 1) + 2
-        maze_h = height * (CELL_H + 1) + 2
-        menu_h = 6
-        offset_x = max(0, (screen_w - maze_w) // 2)
-        offset_y = max(0, (screen_h - (maze_h + menu_h)) // 2)
-
-        draw_maze(
-            stdscr, gen.grid, width, height, entry, exit_, path, show_path,
-            offset_x, offset_y,
-        )
+        renderer.fit()
+        renderer.render()
 
         action = show_menu(
-            stdscr, show_path, width, height, offset_x, offset_y
+            stdscr, show_path, gen.width, gen.height,
+            renderer.offset_x, renderer.offset_y, renderer,
         )
 
         if action == "quit":
             break
         elif action == "regenerate":
             seed += 1
-            gen = MazeGenerator(width=width, height=height, seed=seed)
-            # animate_generation(
-            #     stdscr, gen, width, height, entry, exit_,
-            #     offset_x=offset_x, offset_y=offset_y,
-            # )
-            gen.generate(start_pos=entry)
-            draw_maze(
-                stdscr, gen.grid, width, height, entry, exit_,
-                offset_x=offset_x, offset_y=offset_y,
+            gen = MazeGenerator(
+                width=gen.width, height=gen.height, seed=seed,
+                perfect=gen.perfect, storage="bytearray",
+                algorithm=gen.algorithm, loop_density=gen.loop_density,
+            )
+            animate_generation(
+                stdscr, gen, entry, exit_, gen_anim, renderer,
             )
             path = get_path(gen, entry, exit_)
+            renderer.set_path(path, False)
+            renderer.render()
             if show_path:
-                animate_path(
-                    stdscr, gen.grid, width, height, entry, exit_, path,
-                    offset_x=offset_x, offset_y=offset_y,
-                )
+                reveal_path(renderer, path, path_anim)
         elif action == "path":
             show_path = not show_path
             if show_path:
-                animate_path(
-                    stdscr, gen.grid, width, height, entry, exit_, path,
-                    offset_x=offset_x, offset_y=offset_y,
-                )
+                reveal_path(renderer, path, path_anim)
+            else:
+                renderer.set_path(path, False)
         elif action == "color":
+            # Redefining the colour pairs recolours the screen in place.
             current_theme_idx = (current_theme_idx + 1) % len(theme_names)
             apply_theme(theme_names[current_theme_idx])
-            if show_path:
-                draw_maze(
-                    stdscr, gen.grid, width, height, entry, exit_, path, False,
-                    offset_x, offset_y,
-                )
-                animate_path(
-                    stdscr, gen.grid, width, height, entry, exit_, path,
-                    offset_x=offset_x, offset_y=offset_y,
-                )
 
 
 def run(
@@ -559,18 +822,51 @@ def run(
     entry: tuple[int, int],
     exit_: tuple[int, int],
     seed: Optional[int] = None,
+    algorithm: str = "backtracker",
+    animation_rate: Optional[float] = None,
+    animation_duration: Optional[float] = None,
+    perfect: bool = True,
+    gen: Optional[MazeGenerator] = None,
+    solution: Optional[str] = None,
+    loop_density: float = LOOP_DENSITY,
 ) -> None:
     """Start the curses maze display.
 
+    Pass the generator (and solution) that the caller already built to
+    show that maze as is; otherwise a new maze is generated from the
+    other parameters. "Regenerate" always builds a new one with the
+    next seed and the same settings.
+
     Args:
         width: Maze width in cells.
         height: Maze height in cells.
         entry: Entry coordinates as (x, y).
         exit_: Exit coordinates as (x, y).
         seed: Optional seed for reproducible generation.
+        algorithm: Generation algorithm (see mazegen.algorithms).
+        animation_rate: Animation speed in cells per second.
+        animation_duration: Upper bound per animation in seconds; 0
+            turns the animations off. If neither is given, built-in
+            defaults are used.
+        perfect: Generate perfect mazes.
+        gen: An already generated maze to show; width, height, seed,
+            algorithm, perfect and loop_density are then taken from it.
+        solution: The solution of ``gen`` from entry to exit, if known.
+        loop_density: Share of closed walls opened when not perfect.
     """
+    if gen is None:
+        gen = MazeGenerator(
+            width=width, height=height, seed=42 if seed is None else seed,
+            perfect=perfect, storage="bytearray", algorithm=algorithm,
+            loop_density=loop_density,
+        )
+        solution = None
+    shown = gen
     curses.wrapper(
-        lambda stdscr: _main(stdscr, width, height, entry, exit_, seed)
+        lambda stdscr: _main(
+            stdscr, shown, entry, exit_, solution,
+            animation_rate, animation_duration,
+        )
     )
 
 
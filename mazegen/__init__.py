@@ -1,3 +1,29 @@
+__version__ = "1.0.0"
+
+from .batch import MazeResult, MazeSpec, generate_many
+from .cache import MazeCache
+from .distance import DistanceField
 from .generator import MazeGenerator
+from .grid import CellBitSet, CompactGrid
+from .junctions import JunctionGraph
+from .metrics import MazeMetrics
+from .path_index import PathIndex
+from .profiling import PhaseProfiler
+from .validator import MazeValidator, ValidationResult
 
-__all__ = ["MazeGenerator"]
+__all__ = [
+    "MazeGenerator",
+    "CompactGrid",
+    "CellBitSet",
+    "MazeSpec",
+    "MazeResult",
+    "generate_many",
+    "MazeCache",
+    "MazeMetrics",
+    "PathIndex",
+    "DistanceField",
+    "JunctionGraph",
+    "PhaseProfiler",
+    "MazeValidator",
+    "ValidationResult",
+]
@@ -0,0 +1,287 @@
+"""Maze generation algorithms, selected with MazeGenerator(algorithm=...).
+
+Every algorithm is a function ``(gen, start) -> Iterator[(x, y)]`` that
+carves ``gen.grid`` in place and yields the cells it connects, so
+generate(), generate_animated() and the display work with all of them.
+They run after the grid has been reset and the '42' cells reserved, and
+draw every random decision from ``gen.rng``, so the seed is honoured.
+
+- backtracker: randomized depth-first search; long, winding corridors
+  (the default).
+- kruskal: joins cells across shuffled walls with a union-find over the
+  flat grid; many short dead ends.
+- prim: randomized Prim, grows the maze from a random frontier cell.
+- wilson: loop-erased random walks; a uniform spanning tree, i.e. every
+  perfect maze is equally likely.
+- growing_tree: extends the newest or a random active cell (half and
+  half), a texture between backtracker and prim.
+- eller: Eller's row-by-row algorithm (see mazegen.eller).
+
+Only Kruskal, Prim, Wilson and growing-tree share the carving core,
+Carver, which works on flat cell indices (``i = y * width + x``) and
+keeps the reserved cells out of every neighbour list. Only the cells
+connected to the start cell are carved; cells walled in by the '42'
+pattern stay closed, as with the backtracker. The other two bypass it:
+the backtracker runs the generator's own engine, whose sequence of rng
+calls fixes the output of existing seeds, and eller writes the rows of
+mazegen.eller, which keeps O(width) state for streaming and never needs
+a neighbour list.
+"""
+
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from .eller import eller_rows
+from .generator import E, N, OPPOSITE, S, W
+
+if TYPE_CHECKING:
+    from .generator import MazeGenerator
+
+# Chance that growing_tree extends its newest cell instead of a random one.
+NEWEST_CHANCE = 0.5
+
+
+class Carver:
+    """Shared carving core on flat cell indices."""
+
+    def __init__(self, gen: "MazeGenerator") -> None:
+        """Bind to a generator whose grid was reset and '42' reserved.
+
+        Args:
+            gen: The generator to carve.
+        """
+        self.width = gen.width
+        self.height = gen.height
+        self.size = gen.width * gen.height
+        self.grid = gen.grid
+        self.blocked = bytearray(self.size)
+        for x, y in gen._pattern_cells(warn=False):
+            self.blocked[y * self.width + x] = 1
+        self.step = {N: -self.width, S: self.width, E: 1, W: -1}
+
+    def index(self, cell: tuple[int, int]) -> int:
+        """Return the flat index of cell (x, y)."""
+        return cell[1] * self.width + cell[0]
+
+    def xy(self, i: int) -> tuple[int, int]:
+        """Return the (x, y) coordinates of flat index i."""
+        y, x = divmod(i, self.width)
+        return x, y
+
+    def neighbours(self, i: int) -> list[tuple[int, int]]:
+        """Return (direction, index) for each open neighbour of cell i."""
+        width = self.width
+        blocked = self.blocked
+        y, x = divmod(i, width)
+        result = []
+        if y > 0 and not blocked[i - width]:
+            result.append((N, i - width))
+        if y < self.height - 1 and not blocked[i + width]:
+            result.append((S, i + width))
+        if x < width - 1 and not blocked[i + 1]:
+            result.append((E, i + 1))
+        if x > 0 and not blocked[i - 1]:
+            result.append((W, i - 1))
+        return result
+
+    def component(self, start: int) -> list[int]:
+        """Return the open cells reachable from start, start first."""
+        seen = bytearray(self.size)
+        seen[start] = 1
+        cells = [start]
+        for i in cells:
+            for _, j in self.neighbours(i):
+                if not seen[j]:
+                    seen[j] = 1
+                    cells.append(j)
+        return cells
+
+    def carve(self, i: int, direction: int, j: int) -> None:
+        """Open the wall between cell i and its neighbour j."""
+        y, x = divmod(i, self.width)
+        ny, nx = divmod(j, self.width)
+        self.grid[y][x] &= ~direction
+        self.grid[ny][nx] &= ~OPPOSITE[direction]
+
+
+def backtracker(
+    gen: "MazeGenerator", start: tuple[int, int],
+) -> Iterator[tuple[int, int]]:
+    """Randomized depth-first search (the generator's own engine)."""
+    return gen._backtrack(start[0], start[1])
+
+
+def kruskal(
+    gen: "MazeGenerator", start: tuple[int, int],
+) -> Iterator[tuple[int, int]]:
+    """Randomized Kruskal: join cells across walls in random order.
+
+    Each wall is one int (``i * 2`` for east, ``i * 2 + 1`` for south);
+    the union-find uses a flat parent list with path halving.
+    """
+    carver = Carver(gen)
+    width = carver.width
+    blocked = carver.blocked
+    edges = []
+    for i in carver.component(carver.index(start)):
+        if i % width < width - 1 and not blocked[i + 1]:
+            edges.append(i * 2)
+        if i + width < carver.size and not blocked[i + width]:
+            edges.append(i * 2 + 1)
+    gen.rng.shuffle(edges)
+
+    parent = list(range(carver.size))
+    yield start
+    for edge in edges:
+        i = edge >> 1
+        if edge & 1:
+            j, direction = i + width, S
+        else:
+            j, direction = i + 1, E
+        a = i
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        b = j
+        while parent[b] != b:
+            parent[b] = parent[parent[b]]
+            b = parent[b]
+        if a == b:
+            continue
+        parent[a] = b
+        carver.carve(i, direction, j)
+        yield carver.xy(i)
+        yield carver.xy(j)
+
+
+def prim(
+    gen: "MazeGenerator", start: tuple[int, int],
+) -> Iterator[tuple[int, int]]:
+    """Randomized Prim: attach a random frontier cell to the maze."""
+    carver = Carver(gen)
+    rng = gen.rng
+    # 0 = untouched, 1 = frontier, 2 = in the maze.
+    state = bytearray(carver.size)
+    first = carver.index(start)
+    state[first] = 2
+    yield start
+    frontier = []
+    for _, j in carver.neighbours(first):
+        state[j] = 1
+        frontier.append(j)
+
+    while frontier:
+        k = rng.randrange(len(frontier))
+        i = frontier[k]
+        frontier[k] = frontier[-1]
+        frontier.pop()
+        links = []
+        for direction, j in carver.neighbours(i):
+            if state[j] == 2:
+                links.append((direction, j))
+            elif state[j] == 0:
+                state[j] = 1
+                frontier.append(j)
+        direction, j = rng.choice(links)
+        carver.carve(i, direction, j)
+        state[i] = 2
+        yield carver.xy(i)
+
+
+def wilson(
+    gen: "MazeGenerator", start: tuple[int, int],
+) -> Iterator[tuple[int, int]]:
+    """Wilson's algorithm: loop-erased random walks into the maze.
+
+    The walk only stores the last direction taken from each cell, so
+    following it back from the walk's start skips every loop.
+    """
+    carver = Carver(gen)
+    rng = gen.rng
+    step = carver.step
+    in_maze = bytearray(carver.size)
+    walk = bytearray(carver.size)
+    cells = carver.component(carver.index(start))
+    in_maze[cells[0]] = 1
+    yield start
+    rng.shuffle(cells)
+
+    for cell in cells:
+        i = cell
+        while not in_maze[i]:
+            direction, j = rng.choice(carver.neighbours(i))
+            walk[i] = direction
+            i = j
+        i = cell
+        while not in_maze[i]:
+            direction = walk[i]
+            j = i + step[direction]
+            carver.carve(i, direction, j)
+            in_maze[i] = 1
+            yield carver.xy(i)
+            i = j
+
+
+def growing_tree(
+    gen: "MazeGenerator", start: tuple[int, int],
+) -> Iterator[tuple[int, int]]:
+    """Growing tree: extend the newest or a random active cell."""
+    carver = Carver(gen)
+    rng = gen.rng
+    visited = bytearray(carver.size)
+    first = carver.index(start)
+    visited[first] = 1
+    yield start
+    active = [first]
+
+    while active:
+        if rng.random() < NEWEST_CHANCE:
+            k = len(active) - 1
+        else:
+            k = rng.randrange(len(active))
+        i = active[k]
+        options = [
+            (direction, j) for direction, j in carver.neighbours(i)
+            if not visited[j]
+        ]
+        if not options:
+            active[k] = active[-1]
+            active.pop()
+            continue
+        direction, j = rng.choice(options)
+        carver.carve(i, direction, j)
+        visited[j] = 1
+        active.append(j)
+        yield carver.xy(j)
+
+
+def eller(
+    gen: "MazeGenerator", start: tuple[int, int],
+) -> Iterator[tuple[int, int]]:
+    """Eller's algorithm, row by row, written into the grid.
+
+    The rows form a perfect maze; as for every algorithm, generate()
+    then opens ``gen.loop_density`` of the closed walls for loops.
+    """
+    grid = gen.grid
+    reserved = set(gen._pattern_cells(warn=False))
+    for y, row in enumerate(
+        eller_rows(gen.width, gen.height, gen.rng, reserved),
+    ):
+        for x, cell in enumerate(row):
+            if cell != 15:
+                grid[y][x] = cell
+                yield (x, y)
+
+
+Algorithm = Callable[
+    ["MazeGenerator", tuple[int, int]], Iterator[tuple[int, int]]
+]
+
+ALGORITHMS: dict[str, Algorithm] = {
+    "backtracker": backtracker,
+    "kruskal": kruskal,
+    "prim": prim,
+    "wilson": wilson,
+    "growing_tree": growing_tree,
+    "eller": eller,
+}
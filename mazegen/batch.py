@@ -0,0 +1,139 @@
+"""Batch generation of many mazes across a process pool.
+
+``generate_many`` takes an iterable of maze specs, fans them out to
+worker processes and streams the results back as they finish. Only a
+bounded number of chunks is in flight at any time, so memory stays flat
+even for very long (or endless) spec iterables.
+"""
+
+import os
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+
+from .generator import LOOP_DENSITY, MazeGenerator
+
+
+class MazeSpec(NamedTuple):
+    """Parameters of a single maze in a batch."""
+
+    width: int
+    height: int
+    seed: Optional[int]
+    perfect: bool
+    entry: tuple[int, int]
+    exit_: tuple[int, int]
+    algorithm: str = "backtracker"
+    loop_density: float = LOOP_DENSITY
+
+
+class MazeResult(NamedTuple):
+    """A generated maze, in the same form that write_output() expects."""
+
+    spec_index: int
+    spec: MazeSpec
+    hex_grid: list[str]
+    path: str
+
+
+def build_maze(index: int, spec: MazeSpec) -> MazeResult:
+    """Generate and solve one maze.
+
+    Args:
+        index: Position of the spec in the input iterable.
+        spec: The maze parameters.
+
+    Returns:
+        The hex layout and solution of the maze.
+    """
+    gen = MazeGenerator(
+        width=spec.width,
+        height=spec.height,
+        seed=spec.seed,
+        perfect=spec.perfect,
+        algorithm=spec.algorithm,
+        loop_density=spec.loop_density,
+    )
+    gen.generate(start_pos=spec.entry)
+    return MazeResult(
+        index, spec, gen.get_hex_layout(), gen.solve(spec.entry, spec.exit_)
+    )
+
+
+def _build_chunk(chunk: list[tuple[int, MazeSpec]]) -> list[MazeResult]:
+    """Worker entry point: build every maze of a chunk."""
+    return [build_maze(index, spec) for index, spec in chunk]
+
+
+def generate_many(
+    specs: Iterable[Union[
+        MazeSpec,
+        tuple[int, int, Optional[int], bool, tuple[int, int],
+              tuple[int, int]],
+    ]],
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    max_pending: Optional[int] = None,
+) -> Iterator[MazeResult]:
+    """Generate many mazes in parallel and yield them as they finish.
+
+    Results arrive in completion order, not input order; use
+    ``MazeResult.spec_index`` to match them to their spec.
+
+    Args:
+        specs: Iterable of (width, height, seed, perfect, entry, exit)
+            tuples, optionally followed by the algorithm and the loop
+            density, or MazeSpec instances.
+        workers: Number of worker processes (default: CPU count).
+            With ``workers=1`` everything runs in the current process.
+        chunksize: Number of specs sent to a worker at once. Larger
+            chunks reduce inter-process overhead for small mazes.
+        max_pending: Maximum number of chunks in flight
+            (default: twice the number of workers).
+
+    Yields:
+        One MazeResult per spec.
+
+    Raises:
+        ValueError: If workers, chunksize or max_pending is below 1.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+    if max_pending is not None and max_pending < 1:
+        raise ValueError("max_pending must be at least 1")
+
+    indexed = ((i, MazeSpec(*spec)) for i, spec in enumerate(specs))
+
+    if workers == 1:
+        for index, spec in indexed:
+            yield build_maze(index, spec)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    limit = max_pending or 2 * workers
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: set[Future[list[MazeResult]]] = set()
+
+        def submit_next() -> bool:
+            chunk = list(islice(indexed, chunksize))
+            if not chunk:
+                return False
+            pending.add(pool.submit(_build_chunk, chunk))
+            return True
+
+        while len(pending) < limit and submit_next():
+            pass
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                yield from future.result()
+                submit_next()
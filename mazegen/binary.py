@@ -0,0 +1,329 @@
+"""Compact binary maze files with a memory-mapped random-access reader.
+
+File layout (little endian)::
+
+    offset  size  field
+    0       4     magic b"MAZE"
+    4       2     format version (1)
+    6       2     flags: bit 0 = perfect, bit 1 = seed present
+    8       4     width
+    12      4     height
+    16      8     entry x, entry y
+    24      8     exit x, exit y
+    32      8     seed (0 if absent)
+    40      ...   cells, row by row, two per byte (high nibble first);
+                  each row is padded to a whole byte
+
+Compared to the hex text output this halves the size, and a cell or row
+can be read by offset without parsing anything. ``MappedMaze`` opens a
+file with ``mmap``, so reopening costs only the header read.
+
+The seed is stored as a signed 64-bit integer; writing a maze whose
+seed does not fit raises ValueError.
+"""
+
+import mmap
+import struct
+from types import TracebackType
+from typing import IO, Iterable, Iterator, Optional
+
+from .hexcodec import HEX_TO_NIBBLE
+
+MAGIC = b"MAZE"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIIIIIIq")
+SEED_MIN, SEED_MAX = -1 << 63, (1 << 63) - 1
+FLAG_PERFECT = 1
+FLAG_SEED = 2
+# Packed bytes unpacked per step, to bound the temporary copies.
+UNPACK_CHUNK = 1 << 20
+
+
+class BinaryMazeWriter:
+    """Write a binary maze file row by row.
+
+    Rows are hex strings as produced by ``get_hex_layout`` or
+    ``generate_rows``; the height in the header is patched on close, so
+    rows can be streamed without knowing it in advance.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        width: int,
+        entry: tuple[int, int],
+        exit_pos: tuple[int, int],
+        seed: Optional[int] = None,
+        perfect: bool = True,
+    ) -> None:
+        """Create the file and write a provisional header.
+
+        Args:
+            file_path: Path of the binary file to create.
+            width: Maze width in cells.
+            entry: Entry coordinates (x, y).
+            exit_pos: Exit coordinates (x, y).
+            seed: Seed used to generate the maze, if any.
+            perfect: Whether the maze is perfect.
+
+        Raises:
+            ValueError: If the seed does not fit in the header.
+        """
+        if seed is not None and not SEED_MIN <= seed <= SEED_MAX:
+            raise ValueError(f"Seed {seed} does not fit in 64 bits")
+        self.width = width
+        self.height = 0
+        self.entry = entry
+        self.exit_pos = exit_pos
+        self.seed = seed
+        self.perfect = perfect
+        self._file: IO[bytes] = open(file_path, "wb")
+        self._write_header()
+
+    def _write_header(self) -> None:
+        """Write the header at the start of the file."""
+        flags = (FLAG_PERFECT if self.perfect else 0) | (
+            FLAG_SEED if self.seed is not None else 0
+        )
+        self._file.write(HEADER.pack(
+            MAGIC, VERSION, flags, self.width, self.height,
+            self.entry[0], self.entry[1], self.exit_pos[0], self.exit_pos[1],
+            self.seed or 0,
+        ))
+
+    def write_row(self, row: str) -> None:
+        """Pack one hex row (two cells per byte) and append it."""
+        if len(row) % 2:
+            row += "0"
+        self._file.write(bytes.fromhex(row))
+        self.height += 1
+
+    def close(self) -> None:
+        """Patch the final height into the header and close the file."""
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._write_header()
+        self._file.close()
+
+    def __enter__(self) -> "BinaryMazeWriter":
+        """Return the writer for use in a with block."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        """Close the file."""
+        self.close()
+
+
+def write_binary(
+    file_path: str,
+    hex_grid: Iterable[str],
+    entry: tuple[int, int],
+    exit_pos: tuple[int, int],
+    width: int,
+    seed: Optional[int] = None,
+    perfect: bool = True,
+) -> None:
+    """Write a whole maze to a binary file.
+
+    Args:
+        file_path: Path of the binary file to create.
+        hex_grid: Hex rows, e.g. from get_hex_layout().
+        entry: Entry coordinates (x, y).
+        exit_pos: Exit coordinates (x, y).
+        width: Maze width in cells.
+        seed: Seed used to generate the maze, if any.
+        perfect: Whether the maze is perfect.
+
+    Raises:
+        ValueError: If the seed does not fit in the header.
+    """
+    with BinaryMazeWriter(
+        file_path, width, entry, exit_pos, seed, perfect,
+    ) as writer:
+        for row in hex_grid:
+            writer.write_row(row)
+
+
+def unpack_cells(packed: bytes, width: int, height: int) -> bytearray:
+    """Unpack the cell area of a binary maze, one byte per cell.
+
+    Works through ``UNPACK_CHUNK`` packed bytes at a time, so apart from
+    the result (one byte per cell) only a few chunk-sized copies exist.
+
+    Args:
+        packed: The cells as stored in the file, rows padded to bytes.
+        width: Maze width in cells.
+        height: Maze height in cells.
+
+    Returns:
+        The whole grid in row-major order.
+    """
+    stride = (width + 1) // 2
+    rows = max(1, UNPACK_CHUNK // max(stride, 1))
+    cells = bytearray(width * height)
+    for y in range(0, height, rows):
+        count = min(rows, height - y)
+        part = bytes(packed[y * stride:(y + count) * stride]).hex().encode()
+        part = part.translate(HEX_TO_NIBBLE)
+        if width % 2:
+            part = b"".join(
+                part[k * (width + 1):k * (width + 1) + width]
+                for k in range(count)
+            )
+        cells[y * width:(y + count) * width] = part
+    return cells
+
+
+class MappedRow:
+    """One row of a MappedMaze, indexable as ``row[x]``."""
+
+    def __init__(self, maze: "MappedMaze", y: int) -> None:
+        """Bind the row to its maze."""
+        self.maze = maze
+        self.y = y
+
+    def __getitem__(self, x: int) -> int:
+        """Return the wall bitmask of cell x."""
+        return self.maze.cell(x, self.y)
+
+    def __setitem__(self, x: int, value: int) -> None:
+        """Set the wall bitmask of cell x (file must be writable)."""
+        self.maze.set_cell(x, self.y, value)
+
+    def __len__(self) -> int:
+        """Return the maze width."""
+        return self.maze.width
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the cells of the row."""
+        return iter(self.maze.row(self.y))
+
+
+class MappedMaze:
+    """Random-access view of a binary maze file through ``mmap``.
+
+    Only the pages that are actually read are loaded, so cell lookups
+    and row slices work on files far larger than RAM. The object also
+    supports ``maze[y][x]``, which lets it stand in for a grid.
+    """
+
+    def __init__(self, file_path: str, writable: bool = False) -> None:
+        """Map the file and parse its header.
+
+        Args:
+            file_path: Path of the binary maze file.
+            writable: Map the file read-write so cells can be changed.
+
+        Raises:
+            ValueError: If the file is not a binary maze file or is
+                shorter than its header says.
+        """
+        self._file = open(file_path, "r+b" if writable else "rb")
+        try:
+            self._mm = mmap.mmap(
+                self._file.fileno(), 0,
+                access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ,
+            )
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"'{file_path}' is empty") from None
+        if len(self._mm) < HEADER.size:
+            self.close()
+            raise ValueError(f"'{file_path}' is not a binary maze file")
+        (
+            magic, version, flags, width, height, ex, ey, ox, oy, seed,
+        ) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"'{file_path}' is not a binary maze file")
+        if len(self._mm) < HEADER.size + (width + 1) // 2 * height:
+            self.close()
+            raise ValueError(f"'{file_path}' is truncated")
+        self.width: int = width
+        self.height: int = height
+        self.entry: tuple[int, int] = (ex, ey)
+        self.exit_: tuple[int, int] = (ox, oy)
+        self.perfect = bool(flags & FLAG_PERFECT)
+        self.seed: Optional[int] = seed if flags & FLAG_SEED else None
+        self.stride: int = (width + 1) // 2
+
+    def _offset(self, x: int, y: int) -> int:
+        """Return the byte offset holding cell (x, y)."""
+        return HEADER.size + y * self.stride + (x >> 1)
+
+    def cell(self, x: int, y: int) -> int:
+        """Return the wall bitmask of cell (x, y)."""
+        byte = self._mm[self._offset(x, y)]
+        return byte & 15 if x & 1 else byte >> 4
+
+    def set_cell(self, x: int, y: int, value: int) -> None:
+        """Set the wall bitmask of cell (x, y) (file must be writable)."""
+        offset = self._offset(x, y)
+        byte = self._mm[offset]
+        if x & 1:
+            byte = (byte & 0xF0) | (value & 15)
+        else:
+            byte = (byte & 0x0F) | ((value & 15) << 4)
+        self._mm[offset] = byte
+
+    def row(self, y: int, start: int = 0, stop: Optional[int] = None) -> bytes:
+        """Return cells ``start:stop`` of row y, one byte per cell."""
+        stop = self.width if stop is None else stop
+        base = HEADER.size + y * self.stride
+        packed = self._mm[base + (start >> 1):base + ((stop + 1) >> 1)]
+        cells = packed.hex().encode().translate(HEX_TO_NIBBLE)
+        skip = start & 1
+        return cells[skip:skip + stop - start]
+
+    def unpack(self) -> bytearray:
+        """Return the whole grid, one byte per cell, in row-major order.
+
+        This is a copy in memory: twice the size of the cell area of the
+        file (see unpack_cells).
+        """
+        packed = self._mm[HEADER.size:HEADER.size + self.stride * self.height]
+        return unpack_cells(packed, self.width, self.height)
+
+    def hex_rows(self) -> Iterator[str]:
+        """Yield each row as an upper-case hex string."""
+        for y in range(self.height):
+            base = HEADER.size + y * self.stride
+            yield self._mm[base:base + self.stride].hex()[:self.width].upper()
+
+    def __getitem__(self, y: int) -> MappedRow:
+        """Return row y as an indexable view."""
+        if not 0 <= y < self.height:
+            raise IndexError("row index out of range")
+        return MappedRow(self, y)
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return self.height
+
+    def __iter__(self) -> Iterator[MappedRow]:
+        """Iterate over the rows."""
+        return (MappedRow(self, y) for y in range(self.height))
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedMaze":
+        """Return the maze for use in a with block."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        tb: Optional[TracebackType],
+    ) -> None:
+        """Close the maze."""
+        self.close()
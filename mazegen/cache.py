@@ -0,0 +1,309 @@
+"""On-disk, content-addressed cache of generated and solved mazes.
+
+A maze is fully determined by its parameters when it has a seed, so
+``MazeCache`` stores the packed grid and the solution of such mazes
+under a hash of those parameters (size, seed, perfect, entry, exit,
+algorithm, loop density, tile size) and the library version. A later
+run with the same parameters loads the file instead of generating and
+solving again. Mazes without a seed, or with one that does not fit the
+64-bit seed field of the file header, are never cached.
+
+Each entry is a binary maze file (see mazegen.binary) with the solution
+appended after the cells. Entries are written to a temporary file and
+renamed into place, so readers in other processes only ever see
+complete files. The directory is kept below ``max_bytes`` by deleting
+the least recently used entries; a hit refreshes the modification time
+of its entry, and eviction runs under an ``flock`` on ``.lock``, so
+several processes can share one directory. Where ``fcntl`` does not
+exist (Windows), eviction runs without the lock; a concurrent eviction
+then at worst deletes an entry twice, which is ignored.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Any, Iterator, Optional
+
+from .binary import (
+    HEADER, MAGIC, SEED_MAX, SEED_MIN, VERSION, unpack_cells, write_binary,
+)
+from .generator import MazeGenerator
+from .grid import CompactGrid
+from .profiling import phase
+
+# Bump when the entry layout changes; old entries are then never hit.
+CACHE_FORMAT = 1
+MAX_BYTES = 256 * 2**20
+SUFFIX = ".maze"
+
+
+class MazeCache:
+    """Directory of cached mazes with an LRU size limit."""
+
+    def __init__(self, directory: str, max_bytes: int = MAX_BYTES) -> None:
+        """Open (and create, if needed) the cache directory.
+
+        Args:
+            directory: Where the entries are stored.
+            max_bytes: Total size of the entries kept after a store.
+
+        Raises:
+            ValueError: If max_bytes is below 0.
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.errors = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def key(
+        self,
+        gen: MazeGenerator,
+        entry: tuple[int, int],
+        exit_: tuple[int, int],
+        tile_size: Optional[int] = None,
+    ) -> Optional[str]:
+        """Return the cache key of a maze, None if it cannot be cached.
+
+        Args:
+            gen: The generator, not necessarily generated yet.
+            entry: Entry coordinates (x, y).
+            exit_: Exit coordinates (x, y).
+            tile_size: Tile size if the maze is generated tiled.
+        """
+        from . import __version__
+
+        if gen.seed is None or not SEED_MIN <= gen.seed <= SEED_MAX:
+            return None
+        params = [
+            __version__, CACHE_FORMAT, gen.width, gen.height, gen.seed,
+            gen.perfect, list(entry), list(exit_), gen.algorithm,
+            gen.loop_density, tile_size,
+        ]
+        return hashlib.sha256(json.dumps(params).encode()).hexdigest()
+
+    def _path(self, key: str) -> str:
+        """Return the file path of an entry."""
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def load(
+        self,
+        gen: MazeGenerator,
+        entry: tuple[int, int],
+        exit_: tuple[int, int],
+        tile_size: Optional[int] = None,
+    ) -> Optional[str]:
+        """Fill ``gen.grid`` from the cache.
+
+        Args:
+            gen: The generator to fill.
+            entry: Entry coordinates (x, y).
+            exit_: Exit coordinates (x, y).
+            tile_size: Tile size if the maze is generated tiled.
+
+        Returns:
+            The solution on a hit, None on a miss.
+        """
+        key = self.key(gen, entry, exit_, tile_size)
+        if key is None:
+            return None
+        path = self._path(key)
+        with phase(gen.profiler, "cache_load"):
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+            except OSError:
+                self.misses += 1
+                return None
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            parsed = self._parse(data, gen)
+            if parsed is None:
+                self.misses += 1
+                self.errors += 1
+                self._remove(path)
+                return None
+            cells, solution = parsed
+
+            gen.grid = gen._new_grid()
+            if isinstance(gen.grid, CompactGrid):
+                gen.grid.cells[:] = cells
+            else:
+                width = gen.width
+                gen.grid = [
+                    list(cells[y * width:(y + 1) * width])
+                    for y in range(gen.height)
+                ]
+            gen.mark_changed()
+            gen.visited = gen._new_visited()
+            gen._apply_42_pattern()
+        gen.entry, gen.exit_, gen.solution = entry, exit_, solution
+        self.hits += 1
+        return solution
+
+    def _parse(
+        self, data: bytes, gen: MazeGenerator,
+    ) -> Optional[tuple[bytearray, str]]:
+        """Split an entry into cells and solution; None if it is bad."""
+        if len(data) < HEADER.size:
+            return None
+        magic, version, _, width, height, *_ = HEADER.unpack_from(data)
+        if (magic, version, width, height) != (
+            MAGIC, VERSION, gen.width, gen.height,
+        ):
+            return None
+        end = HEADER.size + (width + 1) // 2 * height
+        if len(data) < end:
+            return None
+        cells = unpack_cells(data[HEADER.size:end], width, height)
+        try:
+            return cells, data[end:].decode("ascii")
+        except UnicodeDecodeError:
+            return None
+
+    def store(
+        self,
+        gen: MazeGenerator,
+        entry: tuple[int, int],
+        exit_: tuple[int, int],
+        solution: str,
+        tile_size: Optional[int] = None,
+    ) -> None:
+        """Save a generated maze and its solution.
+
+        Write errors are counted in ``errors`` and otherwise ignored;
+        the cache never makes a run fail.
+
+        Args:
+            gen: The generated maze.
+            entry: Entry coordinates (x, y).
+            exit_: Exit coordinates (x, y).
+            solution: The path from entry to exit.
+            tile_size: Tile size if the maze was generated tiled.
+        """
+        key = self.key(gen, entry, exit_, tile_size)
+        if key is None:
+            return
+        with phase(gen.profiler, "cache_store"):
+            tmp: Optional[str] = None
+            try:
+                fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                os.close(fd)
+                write_binary(
+                    tmp, gen.get_hex_layout(), entry, exit_, gen.width,
+                    gen.seed, gen.perfect,
+                )
+                with open(tmp, "ab") as f:
+                    f.write(solution.encode("ascii"))
+                os.replace(tmp, self._path(key))
+            except OSError:
+                self.errors += 1
+                if tmp is not None:
+                    self._remove(tmp)
+                return
+            self.stores += 1
+            self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries until under max_bytes."""
+        try:
+            with self._locked():
+                entries = []
+                total = 0
+                with os.scandir(self.directory) as it:
+                    for item in it:
+                        if not item.name.endswith(SUFFIX):
+                            continue
+                        try:
+                            stat = item.stat()
+                        except OSError:
+                            continue
+                        entries.append((stat.st_mtime, stat.st_size, item))
+                        total += stat.st_size
+                entries.sort(key=lambda e: e[0])
+                for _, size, item in entries:
+                    if total <= self.max_bytes:
+                        break
+                    if self._remove(item.path):
+                        self.evictions += 1
+                    total -= size
+        except OSError:
+            self.errors += 1
+
+    @contextmanager
+    def _locked(self) -> Iterator[Optional[IO[str]]]:
+        """Hold an exclusive ``flock`` on ``.lock`` (no lock without fcntl).
+
+        Raises:
+            OSError: If the lock file cannot be opened.
+        """
+        try:
+            import fcntl
+        except ImportError:
+            yield None
+            return
+        with open(os.path.join(self.directory, ".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield lock
+
+    def _remove(self, path: str) -> bool:
+        """Delete a file; return False if it was already gone."""
+        try:
+            os.remove(path)
+        except OSError:
+            return False
+        return True
+
+    def generate(
+        self,
+        gen: MazeGenerator,
+        entry: tuple[int, int],
+        exit_: tuple[int, int],
+        tile_size: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> str:
+        """Load a maze from the cache, or generate, solve and store it.
+
+        Args:
+            gen: The generator; filled in either way.
+            entry: Entry coordinates, also the generation start.
+            exit_: Exit coordinates.
+            tile_size: Generate with generate_tiled() and this tile size.
+            workers: Worker processes for tiled generation.
+
+        Returns:
+            The solution from entry to exit.
+        """
+        solution = self.load(gen, entry, exit_, tile_size)
+        if solution is not None:
+            return solution
+        if tile_size is not None:
+            gen.generate_tiled(entry, tile_size, workers)
+        else:
+            gen.generate(start_pos=entry)
+        solution = gen.solve(entry, exit_)
+        self.store(gen, entry, exit_, solution, tile_size)
+        return solution
+
+    def stats(self) -> dict[str, Any]:
+        """Return the counters of this cache object.
+
+        The counters cover the calls made through this object, i.e.
+        this process; the directory itself keeps no statistics.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
@@ -0,0 +1,184 @@
+"""Multi-source breadth-first search with a full distance field.
+
+``DistanceField`` runs one BFS from any number of source cells at once
+and keeps, for every cell, the distance to its nearest source (in an
+``array('i')``, -1 where no source is reachable) and the direction it
+was entered from (in a ``bytearray``). Paths to any number of goals are
+then traced back from that one traversal, instead of one solve() per
+goal.
+
+The queue and the neighbour order are the same as in solve()'s BFS, so
+with a single source the path to a goal equals ``solve(source, goal)``.
+
+Given goals, the search stops as soon as all of them (or, with
+``first=True``, the nearest one) are reached; cells not reached by then
+keep distance -1.
+"""
+
+from array import array
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from .generator import DIR_MAP, E, N, S, W
+
+if TYPE_CHECKING:
+    from .generator import MazeGenerator
+
+# Parent marker of the source cells.
+SOURCE = 0xFF
+
+
+class DistanceField:
+    """Distances and shortest paths from a set of source cells."""
+
+    def __init__(
+        self,
+        gen: "MazeGenerator",
+        sources: Iterable[tuple[int, int]],
+        goals: Optional[Iterable[tuple[int, int]]] = None,
+        first: bool = False,
+    ) -> None:
+        """Run the BFS.
+
+        Args:
+            gen: A MazeGenerator that has already called generate().
+            sources: Start cells as (x, y); at least one.
+            goals: Stop once all of these cells are reached (default:
+                search the whole maze).
+            first: With goals, stop at the first (nearest) goal.
+
+        Raises:
+            ValueError: If there is no source or a cell is out of bounds.
+        """
+        self.width = gen.width
+        self.height = gen.height
+        self.revision = gen.revision
+        starts = [self._index(cell, "Source") for cell in sources]
+        if not starts:
+            raise ValueError("At least one source is required")
+        targets = (
+            None if goals is None
+            else {self._index(cell, "Goal") for cell in goals}
+        )
+        self.distances = array("i", [-1]) * (self.width * self.height)
+        self.parent = bytearray(self.width * self.height)
+        self.reached: list[tuple[int, int]] = []
+        self._search(gen, starts, targets, first)
+
+    def _index(self, cell: tuple[int, int], name: str) -> int:
+        """Return the flat index of a cell.
+
+        Raises:
+            ValueError: If the cell is out of bounds.
+        """
+        x, y = cell
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise ValueError(f"{name} {cell} out of bounds")
+        return y * self.width + x
+
+    def _cell(self, i: int) -> tuple[int, int]:
+        """Return the (x, y) coordinates of a flat index."""
+        y, x = divmod(i, self.width)
+        return x, y
+
+    def _search(
+        self,
+        gen: "MazeGenerator",
+        starts: list[int],
+        targets: Optional[set[int]],
+        first: bool,
+    ) -> None:
+        """Fill distances and parents; see the module docstring."""
+        cells = gen._flat_cells()
+        neighbours = gen._neighbours()
+        distances = self.distances
+        parent = self.parent
+        queue: list[int] = []
+        for i in starts:
+            if parent[i]:
+                continue
+            parent[i] = SOURCE
+            distances[i] = 0
+            queue.append(i)
+        remaining = set() if targets is None else set(targets)
+        for i in queue:
+            if i in remaining:
+                self.reached.append(self._cell(i))
+                remaining.discard(i)
+        if targets is not None and (not remaining or first and self.reached):
+            return
+
+        head = 0
+        while head < len(queue):
+            i = queue[head]
+            head += 1
+            walls = gen._closed_walls(cells, i)
+            step = distances[i] + 1
+            for direction, delta, _ in neighbours:
+                if walls & direction:
+                    continue
+                j = i + delta
+                if parent[j]:
+                    continue
+                parent[j] = direction
+                distances[j] = step
+                queue.append(j)
+                if j in remaining:
+                    self.reached.append(self._cell(j))
+                    remaining.discard(j)
+                    if first or not remaining:
+                        return
+
+    def distance(self, cell: tuple[int, int]) -> int:
+        """Return the steps from the nearest source, or -1 if unreached."""
+        return self.distances[self._index(cell, "Cell")]
+
+    def source(self, cell: tuple[int, int]) -> Optional[tuple[int, int]]:
+        """Return the source whose path reaches a cell, None if unreached.
+
+        Raises:
+            ValueError: If the cell is out of bounds.
+        """
+        i = self._index(cell, "Cell")
+        if not self.parent[i]:
+            return None
+        steps = {N: -self.width, S: self.width, E: 1, W: -1}
+        while self.parent[i] != SOURCE:
+            i -= steps[self.parent[i]]
+        return self._cell(i)
+
+    def path(self, cell: tuple[int, int]) -> str:
+        """Return the path from the nearest source to a cell.
+
+        Returns:
+            The path as N/E/S/W letters; empty if the cell is a source
+            or was not reached.
+
+        Raises:
+            ValueError: If the cell is out of bounds.
+        """
+        i = self._index(cell, "Cell")
+        if not self.parent[i]:
+            return ""
+        steps = {N: -self.width, S: self.width, E: 1, W: -1}
+        moves: list[str] = []
+        while self.parent[i] != SOURCE:
+            direction = self.parent[i]
+            moves.append(DIR_MAP[direction])
+            i -= steps[direction]
+        moves.reverse()
+        return "".join(moves)
+
+    def nearest(
+        self, goals: Iterable[tuple[int, int]],
+    ) -> Optional[tuple[int, int]]:
+        """Return the goal closest to any source, None if none is reached.
+
+        Ties go to the goal listed first.
+        """
+        best: Optional[tuple[int, int]] = None
+        best_distance = -1
+        for goal in goals:
+            d = self.distance(goal)
+            if d >= 0 and (best is None or d < best_distance):
+                best, best_distance = goal, d
+        return best
@@ -0,0 +1,176 @@
+"""Row-by-row maze generation with Eller's algorithm.
+
+Eller's algorithm only ever looks at the current row: every open cell
+carries a set id, adjacent cells of different sets are randomly joined,
+and every set carves at least one passage down into the next row. The
+last row joins all remaining sets. Memory is O(width), independent of
+the maze height, which makes it suitable for streaming very tall mazes.
+
+Reserved cells (the '42' pattern) stay fully walled. To keep the maze
+connected around them, a cell is called *live* when its column has no
+reserved cell at or below its row; a straight passage down to the last
+row is then always possible. Each set keeps at least one live cell, and
+runs of open cells without any live cell are merged into the set that
+enters them from above.
+
+For non-perfect mazes, a wall between two cells of the same set is
+opened with probability ``loop_density``. Only such a join closes a
+cycle, and it is the last wall decided in any open 3x3 area it would
+complete, so checking it against the two previous rows is enough to
+keep every 3x3 area walled.
+"""
+
+import random
+from typing import Iterator
+
+from .generator import LOOP_DENSITY, E, N, S, W
+
+
+def eller_rows(
+    width: int,
+    height: int,
+    rng: random.Random,
+    reserved: set[tuple[int, int]],
+    perfect: bool = True,
+    loop_density: float = LOOP_DENSITY,
+) -> Iterator[list[int]]:
+    """Yield the wall bitmasks of each finished row, top to bottom.
+
+    Args:
+        width: Maze width in cells.
+        height: Maze height in cells.
+        rng: Random stream used for every decision.
+        reserved: Cells that must stay fully walled.
+        perfect: If False, some walls between cells of the same set are
+            opened as well, which creates loops.
+        loop_density: Chance that such a wall is opened.
+
+    Yields:
+        One list of ``width`` wall bitmasks per row.
+    """
+    last_reserved = [-1] * width
+    reserved_rows: dict[int, set[int]] = {}
+    for x, y in reserved:
+        last_reserved[x] = max(last_reserved[x], y)
+        reserved_rows.setdefault(y, set()).add(x)
+
+    labels = [0] * width
+    open_up = [False] * width
+    next_label = 1
+    # The two rows before the current one, for the 3x3 check.
+    above: list[list[int]] = [[15] * width, [15] * width]
+
+    for y in range(height):
+        blocked = reserved_rows.get(y, set())
+        below = reserved_rows.get(y + 1, set())
+        row = [15] * width
+        last = y == height - 1
+
+        # 1. Cells entered from above keep their set, others get a new one.
+        members: dict[int, list[int]] = {}
+        for x in range(width):
+            if x in blocked:
+                labels[x] = 0
+                continue
+            if open_up[x]:
+                row[x] &= ~N
+            else:
+                labels[x] = next_label
+                next_label += 1
+            members.setdefault(labels[x], []).append(x)
+        has_live = {labels[x] for x in range(width) if y > last_reserved[x]}
+        has_live.discard(0)
+
+        def join(x: int) -> None:
+            """Open the wall between x and x + 1 and merge their sets."""
+            row[x] &= ~E
+            row[x + 1] &= ~W
+            a, b = labels[x], labels[x + 1]
+            if a == b:
+                return
+            if len(members[a]) < len(members[b]):
+                a, b = b, a
+            for cx in members[b]:
+                labels[cx] = a
+            members[a].extend(members.pop(b))
+            if b in has_live:
+                has_live.add(a)
+
+        def opens_3x3(x: int) -> bool:
+            """Return True if opening x's east wall opens a 3x3 area."""
+            rows = (above[0], above[1], row)
+            for x0 in range(max(0, x - 1), min(x, width - 3) + 1):
+                if all(
+                    not r[c] & E or c == x and r is row
+                    for r in rows for c in (x0, x0 + 1)
+                ) and all(
+                    not r[c] & S for r in rows[:2]
+                    for c in range(x0, x0 + 3)
+                ):
+                    return True
+            return False
+
+        # 2. Horizontal joins inside each run of open cells.
+        segments: list[list[int]] = []
+        for x in range(width):
+            if x in blocked:
+                continue
+            if segments and segments[-1][-1] == x - 1:
+                segments[-1].append(x)
+            else:
+                segments.append([x])
+
+        live_segments: list[list[int]] = []
+        for segment in segments:
+            live = any(y > last_reserved[x] for x in segment)
+            if live:
+                live_segments.append(segment)
+            for x in segment[:-1]:
+                if labels[x] != labels[x + 1]:
+                    if last or not live or rng.random() < 0.5:
+                        join(x)
+                elif (
+                    not perfect and rng.random() < loop_density
+                    and not opens_3x3(x)
+                ):
+                    join(x)
+
+        # Every set needs a live cell to be able to continue downwards.
+        for segment in live_segments:
+            for x in segment[:-1]:
+                a, b = labels[x], labels[x + 1]
+                if a != b and (a not in has_live or b not in has_live):
+                    join(x)
+
+        if last:
+            yield row
+            return
+
+        # 3. Vertical carving: one live passage per set, plus random ones.
+        open_up = [False] * width
+        for xs in members.values():
+            live_cells = [x for x in xs if y > last_reserved[x]]
+            if live_cells:
+                open_up[rng.choice(live_cells)] = True
+            for x in xs:
+                if x not in below and rng.random() < 0.5:
+                    open_up[x] = True
+
+        # Runs of the next row without any live cell must be entered.
+        run: list[int] = []
+        for x in range(width + 1):
+            if x < width and x not in below:
+                run.append(x)
+                continue
+            if run and not any(y + 1 > last_reserved[c] for c in run):
+                if not any(open_up[c] for c in run):
+                    entries = [c for c in run if labels[c]]
+                    if entries:
+                        open_up[rng.choice(entries)] = True
+            run = []
+
+        for x in range(width):
+            if open_up[x]:
+                row[x] &= ~S
+        above = [above[1], row]
+        yield row
@@ -1,14 +1,30 @@
-"""Labyrinth-Generator mit rekursivem Backtracking und BFS-Solver.
+"""Labyrinth-Generator mit iterativem Backtracking und BFS-Solver.
 
 Dieses Modul stellt die MazeGenerator-Klasse bereit, die Labyrinthe
-mit dem randomisierten rekursiven Backtracking-Algorithmus generiert,
+mit dem randomisierten Backtracking-Algorithmus (expliziter Stack) generiert,
 ein '42'-Muster einbettet und Labyrinthe per Breitensuche löst.
 """
 
 import random
-import sys
+from array import array
 from collections import deque
-from typing import Iterator, Optional
+from heapq import heappop, heappush
+from itertools import chain
+from typing import (
+    TYPE_CHECKING, Iterable, Iterator, Optional, Sequence, Union,
+)
+
+from .binary import MappedMaze
+from .grid import STORAGE_BACKENDS, CellBitSet, CompactGrid
+from .hexcodec import OPEN_EAST_SOUTH, decode_grid, encode_grid, encode_row
+from .metrics import MazeMetrics, compute_metrics
+from .pathcodec import decode_path
+from .profiling import PhaseProfiler, phase
+from .validator import MazeValidator, ValidationResult
+
+if TYPE_CHECKING:
+    from .distance import DistanceField
+    from .junctions import JunctionGraph
 
 N, E, S, W = 1, 2, 4, 8
 OPPOSITE = {N: S, S: N, E: W, W: E}
@@ -17,7 +33,18 @@ DIR_MAP = {N: "N", E: "E", S: "S", W: "W"}
 
 MIN_SIZE_FOR_42 = 10
 
-sys.setrecursionlimit(1_000_000)
+# Share of the closed inner walls that a non-perfect maze opens.
+LOOP_DENSITY = 1 / 8
+# Random wall draws allowed per wall to open before giving up.
+MAX_LOOP_TRIES = 32
+# Incremental wall changes kept for JunctionGraph updates; a graph that
+# falls further behind rebuilds.
+MAX_CHANGES = 1024
+
+SOLVE_METHODS = ("bfs", "bidirectional", "astar", "junction")
+
+Grid = Union[list[list[int]], CompactGrid, MappedMaze]
+CellSet = Union[set[tuple[int, int]], CellBitSet]
 
 
 class MazeGenerator:
@@ -29,6 +56,11 @@ class MazeGenerator:
         height: int,
         seed: Optional[int] = None,
         perfect: bool = True,
+        storage: str = "list",
+        rng: Optional[random.Random] = None,
+        profiler: Optional[PhaseProfiler] = None,
+        algorithm: str = "backtracker",
+        loop_density: float = LOOP_DENSITY,
     ) -> None:
         """Initialisiert den Generator.
 
@@ -37,22 +69,194 @@ class MazeGenerator:
             height: Höhe des Labyrinths in Zellen.
             seed: Optionaler Seed für reproduzierbare Ergebnisse.
             perfect: If True, generate a perfect maze (single path).
+            storage: Grid backend: 'list' (default), or one of the
+                compact backends 'bytearray', 'array' or 'numpy'
+                (one byte per cell, visited cells as a bit set).
+            rng: Optional random stream owned by this generator. If
+                omitted, a private random.Random is created, so
+                generators never share state with each other or with
+                the global random module.
+            profiler: Optional PhaseProfiler; generate(), solve(),
+                validate() and get_hex_layout() then record their
+                phases in it.
+            algorithm: Generation algorithm, one of
+                mazegen.algorithms.ALGORITHMS: 'backtracker' (default),
+                'kruskal', 'prim', 'wilson', 'growing_tree' or 'eller'.
+            loop_density: For non-perfect mazes, the share (0 to 1) of
+                the walls left closed by the perfect maze that is opened
+                to create loops.
+
+        Raises:
+            ValueError: If the storage backend is unknown.
+            ValueError: If the algorithm is unknown.
+            ValueError: If loop_density is not between 0 and 1.
         """
+        from .algorithms import ALGORITHMS
+
+        if storage not in STORAGE_BACKENDS:
+            raise ValueError(f"Unknown storage backend: '{storage}'")
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown generation algorithm: '{algorithm}'")
+        if not 0 <= loop_density <= 1:
+            raise ValueError("loop_density must be between 0 and 1")
         self.width = width
         self.height = height
         self.seed = seed
         self.perfect = perfect
-        self.grid: list[list[int]] = []
-        self.visited: set[tuple[int, int]] = set()
+        self.storage = storage
+        self.rng = rng if rng is not None else random.Random()
+        self.profiler = profiler
+        self.algorithm = algorithm
+        self.loop_density = loop_density
+        self.grid: Grid = []
+        self.visited: CellSet = set()
+        self.revision = 0
+        # (revision, changed cells) of the recent mark_changed(cells)
+        # calls since the last change without cells; at least the last
+        # MAX_CHANGES and at most twice as many are kept.
+        self.changes: list[tuple[int, list[tuple[int, int]]]] = []
+        # Filled in when a maze is loaded from a file.
+        self.entry: Optional[tuple[int, int]] = None
+        self.exit_: Optional[tuple[int, int]] = None
+        self.solution: Optional[str] = None
+        # Built by the first solve(method="junction").
+        self._junctions: Optional["JunctionGraph"] = None
+
+    @classmethod
+    def from_binary(
+        cls, file_path: str, writable: bool = False,
+    ) -> "MazeGenerator":
+        """Open a binary maze file as a generator backed by ``mmap``.
+
+        The grid is a MappedMaze, so ``grid[y][x]``, validate() and the
+        display read cells straight from the file; solve() unpacks the
+        whole grid into memory first (one byte per cell). Entry and exit are
+        available as ``gen.grid.entry`` and ``gen.grid.exit_``.
 
-    def _apply_42_pattern(self) -> None:
-        """Reserviert Zellen für das '42'-Muster vor dem Generieren.
+        Args:
+            file_path: Path of a file written by mazegen.binary.
+            writable: Map the file read-write so walls can be edited.
+
+        Returns:
+            A MazeGenerator whose grid is the mapped file.
+        """
+        grid = MappedMaze(file_path, writable)
+        gen = cls(grid.width, grid.height, grid.seed, grid.perfect)
+        gen.grid = grid
+        gen.entry = grid.entry
+        gen.exit_ = grid.exit_
+        return gen
+
+    @classmethod
+    def from_hex(
+        cls, source: Union[str, Iterable[str]], storage: str = "list",
+    ) -> "MazeGenerator":
+        """Load a maze written by write_output() back into a generator.
+
+        Rows are decoded in bulk (one ``bytes.translate`` per row). The
+        trailer after the blank line sets ``entry``, ``exit_`` and
+        ``solution`` (as letters, whichever path format the file uses;
+        see mazegen.pathcodec). ``perfect`` is inferred from the number
+        of open walls (a spanning tree has exactly one fewer than its
+        cells).
+
+        Args:
+            source: Path of the output file, or an iterable of its lines.
+            storage: Grid backend, as in the constructor.
+
+        Returns:
+            A MazeGenerator holding the loaded maze.
+
+        Raises:
+            ValueError: If the rows are not valid hex or differ in width,
+                or the path line is not a valid path.
+        """
+        if isinstance(source, str):
+            with open(source, "r") as f:
+                lines = f.read().splitlines()
+        else:
+            lines = [line.rstrip("\r\n") for line in source]
+
+        blank = lines.index("") if "" in lines else len(lines)
+        rows = decode_grid(lines[:blank])
+        trailer = lines[blank + 1:]
+        width = len(rows[0]) if rows else 0
+        if any(len(row) != width for row in rows):
+            raise ValueError("Hex rows differ in width")
+
+        walled = sum(row.count(15) for row in rows)
+        openings = sum(sum(row.translate(OPEN_EAST_SOUTH)) for row in rows)
+        open_cells = width * len(rows) - walled
+        gen = cls(
+            width, len(rows), perfect=openings == open_cells - 1,
+            storage=storage,
+        )
+        gen.grid = gen._new_grid()
+        if isinstance(gen.grid, CompactGrid):
+            gen.grid.cells[:] = b"".join(rows)
+        else:
+            gen.grid = [list(row) for row in rows]
+        gen.mark_changed()
+
+        if len(trailer) >= 2:
+            ex, ey = map(int, trailer[0].split(","))
+            ox, oy = map(int, trailer[1].split(","))
+            gen.entry = (ex, ey)
+            gen.exit_ = (ox, oy)
+        if len(trailer) >= 3:
+            gen.solution = decode_path(trailer[2])
+        return gen
+
+    def mark_changed(
+        self, cells: Optional[Iterable[tuple[int, int]]] = None,
+    ) -> None:
+        """Record that the walls changed, invalidating derived indexes.
+
+        Called by every method that carves walls; code that edits
+        ``grid`` directly must call it too.
+
+        Args:
+            cells: The (x, y) cells whose walls changed, both sides of
+                every edited wall. A JunctionGraph then only re-walks the
+                corridors through them; without cells, every index is
+                rebuilt. Only the last MAX_CHANGES edits are kept; a
+                graph that has not been queried since rebuilds.
+        """
+        self.revision += 1
+        if cells is None:
+            self.changes = []
+            return
+        self.changes.append((self.revision, list(cells)))
+        if len(self.changes) > 2 * MAX_CHANGES:
+            del self.changes[:-MAX_CHANGES]
+
+    def _new_grid(self) -> Grid:
+        """Allocate a grid with all walls closed in the chosen backend."""
+        if self.storage == "list":
+            return [[15] * self.width for _ in range(self.height)]
+        return CompactGrid(self.width, self.height, self.storage)
+
+    def _new_visited(self) -> CellSet:
+        """Allocate an empty visited set in the chosen backend."""
+        if self.storage == "list":
+            return set()
+        return CellBitSet(self.width, self.height)
+
+    def _pattern_cells(self, warn: bool = True) -> list[tuple[int, int]]:
+        """Gibt die Zellen des '42'-Musters zurück.
 
         Gibt eine Warnung aus wenn das Labyrinth zu klein ist.
+
+        Args:
+            warn: Print the warning if the maze is too small.
+
+        Returns:
+            Liste der reservierten (x, y)-Zellen, leer wenn zu klein.
         """
         if self.width < MIN_SIZE_FOR_42 or self.height < MIN_SIZE_FOR_42:
-            print("Warning: Maze too small to display '42' pattern.")
-            return
+            if warn:
+                print("Warning: Maze too small to display '42' pattern.")
+            return []
 
         offset_x = max(0, self.width // 2 - 3)
         offset_y = max(0, self.height // 2 - 2)
@@ -64,10 +268,17 @@ class MazeGenerator:
             (5, 0), (6, 0), (6, 1), (6, 2), (5, 2),
             (4, 2), (4, 3), (4, 4), (5, 4), (6, 4),
         ]
+        cells = []
         for px, py in pattern:
             nx, ny = offset_x + px, offset_y + py
             if 0 <= nx < self.width and 0 <= ny < self.height:
-                self.visited.add((nx, ny))
+                cells.append((nx, ny))
+        return cells
+
+    def _apply_42_pattern(self) -> None:
+        """Reserviert Zellen für das '42'-Muster vor dem Generieren."""
+        for cell in self._pattern_cells():
+            self.visited.add(cell)
 
     def _find_valid_start(
         self, start_pos: tuple[int, int],
@@ -94,27 +305,62 @@ class MazeGenerator:
         return (0, 0)
 
     def generate(self, start_pos: tuple[int, int] = (0, 0)) -> None:
-        """Generiert das Labyrinth mit dem Backtracking-Algorithmus.
+        """Generiert das Labyrinth mit dem gewählten Algorithmus.
 
         Args:
             start_pos: Startkoordinaten für den Algorithmus.
         """
-        if self.seed is not None:
-            random.seed(self.seed)
+        with phase(self.profiler, "generate"):
+            if self.seed is not None:
+                self.rng.seed(self.seed)
 
-        self.grid = [
-            [15 for _ in range(self.width)]
-            for _ in range(self.height)
-        ]
-        self.visited = set()
+            with phase(self.profiler, "init_grid"):
+                self.grid = self._new_grid()
+                self.mark_changed()
+                self.visited = self._new_visited()
 
-        self._apply_42_pattern()
+            with phase(self.profiler, "reserve_42"):
+                self._apply_42_pattern()
 
-        actual_start = self._find_valid_start(start_pos)
-        self._backtrack(actual_start[0], actual_start[1])
+            with phase(self.profiler, "carve"):
+                actual_start = self._find_valid_start(start_pos)
+                # Drain the cells in C; nobody needs them here.
+                deque(self._carve(actual_start), maxlen=0)
 
-        if not self.perfect:
-            self._remove_extra_walls()
+            if not self.perfect:
+                with phase(self.profiler, "loops"):
+                    self._remove_extra_walls()
+
+    def generate_tiled(
+        self,
+        start_pos: tuple[int, int] = (0, 0),
+        tile_size: Optional[int] = None,
+        workers: Optional[int] = None,
+    ) -> None:
+        """Generate the maze in tiles on several cores (mazegen.tiled).
+
+        Each tile is generated with the chosen algorithm in a worker
+        process and the tiles are stitched into one grid; with
+        ``perfect=True`` the result is still a perfect maze. It differs
+        from the maze generate() builds for the same seed, but does not
+        depend on the number of workers.
+
+        Args:
+            start_pos: Startkoordinaten; nicht verbundene Zellen bleiben zu.
+            tile_size: Maximum tile width and height
+                (default: mazegen.tiled.TILE_SIZE).
+            workers: Number of worker processes (default: CPU count).
+
+        Raises:
+            ValueError: If tile_size or workers is below 1.
+        """
+        from .tiled import TILE_SIZE, generate_tiled
+
+        with phase(self.profiler, "generate"):
+            generate_tiled(
+                self, start_pos,
+                TILE_SIZE if tile_size is None else tile_size, workers,
+            )
 
     def generate_animated(
         self, start_pos: tuple[int, int] = (0, 0),
@@ -128,132 +374,514 @@ class MazeGenerator:
             (x, y) tuple for each newly carved cell.
         """
         if self.seed is not None:
-            random.seed(self.seed)
+            self.rng.seed(self.seed)
 
-        self.grid = [
-            [15 for _ in range(self.width)]
-            for _ in range(self.height)
-        ]
-        self.visited = set()
+        self.grid = self._new_grid()
+        self.mark_changed()
+        self.visited = self._new_visited()
 
         self._apply_42_pattern()
 
         actual_start = self._find_valid_start(start_pos)
-        yield from self._backtrack_animated(actual_start[0], actual_start[1])
+        yield from self._carve(actual_start)
+        self.mark_changed()
 
         if not self.perfect:
             self._remove_extra_walls()
 
-    def _backtrack(self, x: int, y: int) -> None:
-        """Rekursiver Backtracking-Algorithmus zum Generieren der Gänge.
+    def generate_rows(self) -> Iterator[str]:
+        """Generate the maze row by row and yield each finished hex row.
 
-        Args:
-            x: Aktuelle X-Koordinate.
-            y: Aktuelle Y-Koordinate.
+        Uses Eller's algorithm (see mazegen.eller), which keeps only
+        O(width) state, so peak memory does not depend on the height.
+        The grid is not stored; the '42' pattern and the seed are
+        honoured. The result is a different maze than generate()
+        produces for the same seed.
+
+        Yields:
+            One hex string per row, as in get_hex_layout().
         """
-        self.visited.add((x, y))
-        directions = list(MOVE.keys())
-        random.shuffle(directions)
+        from .eller import eller_rows
 
-        for direction in directions:
-            dx, dy = MOVE[direction]
-            nx, ny = x + dx, y + dy
+        if self.seed is not None:
+            self.rng.seed(self.seed)
+        reserved = set(self._pattern_cells())
+        for row in eller_rows(
+            self.width, self.height, self.rng, reserved, self.perfect,
+            self.loop_density,
+        ):
+            yield encode_row(row)
 
-            if (
-                0 <= nx < self.width
-                and 0 <= ny < self.height
-                and (nx, ny) not in self.visited
-            ):
-                self.grid[y][x] &= ~direction
-                self.grid[ny][nx] &= ~OPPOSITE[direction]
-                self._backtrack(nx, ny)
+    def _carve(self, start: tuple[int, int]) -> Iterator[tuple[int, int]]:
+        """Run the selected algorithm (see mazegen.algorithms).
+
+        Args:
+            start: First cell, not reserved.
+
+        Returns:
+            Iterator over the (x, y) cells as they are carved.
+        """
+        from .algorithms import ALGORITHMS
 
-    def _backtrack_animated(
+        return ALGORITHMS[self.algorithm](self, start)
+
+    def _backtrack(
         self, x: int, y: int,
     ) -> Iterator[tuple[int, int]]:
-        """Backtracking that yields each carved cell for animation.
+        """Randomized depth-first search; yields each carved cell.
+
+        This is the only backtracker engine: generate() drains it and
+        generate_animated() passes the cells on to the display.
+
+        Uses an explicit stack instead of recursion, so the Python stack
+        depth stays constant regardless of the maze size. Each stack
+        frame keeps the shuffled directions of its cell and the index of
+        the next one to try, which reproduces the visiting order (and
+        therefore the seeded output) of the former recursive version.
 
         Args:
-            x: Aktuelle X-Koordinate.
-            y: Aktuelle Y-Koordinate.
+            x: Start-X-Koordinate.
+            y: Start-Y-Koordinate.
 
         Yields:
             (x, y) tuple for each newly carved cell.
         """
-        self.visited.add((x, y))
-        yield (x, y)
+        width, height = self.width, self.height
+        grid = self.grid
+        visited = self.visited
         directions = list(MOVE.keys())
-        random.shuffle(directions)
+        shuffle = self.rng.shuffle
 
-        for direction in directions:
+        visited.add((x, y))
+        yield (x, y)
+        order = directions[:]
+        shuffle(order)
+        stack: list[tuple[int, int, list[int], int]] = [(x, y, order, 0)]
+
+        while stack:
+            cx, cy, order, i = stack[-1]
+            if i == len(order):
+                stack.pop()
+                continue
+            stack[-1] = (cx, cy, order, i + 1)
+
+            direction = order[i]
             dx, dy = MOVE[direction]
-            nx, ny = x + dx, y + dy
-
+            nx, ny = cx + dx, cy + dy
             if (
-                0 <= nx < self.width
-                and 0 <= ny < self.height
-                and (nx, ny) not in self.visited
+                0 <= nx < width
+                and 0 <= ny < height
+                and (nx, ny) not in visited
             ):
-                self.grid[y][x] &= ~direction
-                self.grid[ny][nx] &= ~OPPOSITE[direction]
-                yield from self._backtrack_animated(nx, ny)
+                grid[cy][cx] &= ~direction
+                grid[ny][nx] &= ~OPPOSITE[direction]
+                visited.add((nx, ny))
+                yield (nx, ny)
+                order = directions[:]
+                shuffle(order)
+                stack.append((nx, ny, order, 0))
 
     def _remove_extra_walls(self) -> None:
-        """Remove some random walls to create loops (non-perfect maze)."""
-        candidates: list[tuple[int, int, int]] = []
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.grid[y][x] == 15:
-                    continue
-                for direction in (E, S):
-                    if not (self.grid[y][x] & direction):
-                        continue
-                    dx, dy = MOVE[direction]
-                    nx, ny = x + dx, y + dy
-                    if (
-                        0 <= nx < self.width
-                        and 0 <= ny < self.height
-                        and self.grid[ny][nx] != 15
-                    ):
-                        candidates.append((x, y, direction))
-        random.shuffle(candidates)
-        to_remove = max(1, len(candidates) // 8)
-        for x, y, direction in candidates[:to_remove]:
+        """Remove some random walls to create loops (non-perfect maze).
+
+        Walls are drawn at random instead of collecting every candidate
+        first, and a wall is only opened if _opens_3x3_area() allows it,
+        so the maze stays valid and the cost grows with the number of
+        opened walls, not with the grid. Near ``loop_density=1`` the
+        3x3 rule leaves few walls that may be opened; the draws then
+        stop after MAX_LOOP_TRIES per wall and fewer walls are opened.
+        """
+        width, height = self.width, self.height
+        grid = self.grid
+        randrange = self.rng.randrange
+        to_remove = self._loop_count()
+        tries = MAX_LOOP_TRIES * to_remove
+        while to_remove and tries:
+            tries -= 1
+            k = randrange(2 * width * height)
+            y, x = divmod(k >> 1, width)
+            direction = S if k & 1 else E
             dx, dy = MOVE[direction]
             nx, ny = x + dx, y + dy
-            self.grid[y][x] &= ~direction
-            self.grid[ny][nx] &= ~OPPOSITE[direction]
+            if nx == width or ny == height:
+                continue
+            walls = grid[y][x]
+            if (
+                not walls & direction
+                or walls == 15
+                or grid[ny][nx] == 15
+                or self._opens_3x3_area(x, y, direction)
+            ):
+                continue
+            grid[y][x] &= ~direction
+            grid[ny][nx] &= ~OPPOSITE[direction]
+            to_remove -= 1
+        self.mark_changed()
+
+    def _loop_count(self) -> int:
+        """Return how many walls _remove_extra_walls() should open.
+
+        A perfect maze keeps every wall between two open cells closed
+        except the (cells - 1) it carved; ``loop_density`` of those are
+        opened, at least one. Counted from the '42' cells only, O(1) in
+        the grid size.
+        """
+        if not self.loop_density:
+            return 0
+        width, height = self.width, self.height
+        reserved = set(self._pattern_cells(warn=False))
+        pairs = (width - 1) * height + width * (height - 1)
+        for x, y in reserved:
+            for dx, dy in MOVE.values():
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                if (nx, ny) not in reserved or (nx, ny) > (x, y):
+                    pairs -= 1
+        closed = pairs - (width * height - len(reserved) - 1)
+        if closed <= 0:
+            return 0
+        return max(1, int(closed * self.loop_density))
+
+    def _opens_3x3_area(self, x: int, y: int, direction: int) -> bool:
+        """Check whether opening one wall would create an open 3x3 area.
 
-    def solve(self, start: tuple[int, int], end: tuple[int, int]) -> str:
-        """Findet den kürzesten Weg von Start zu Ende mittels BFS.
+        Only the (at most six) 3x3 blocks that contain both cells of the
+        wall can change, so the check takes constant time.
+
+        Args:
+            x: X-Koordinate der Zelle.
+            y: Y-Koordinate der Zelle.
+            direction: E or S, the wall of (x, y) to open.
+
+        Returns:
+            True if one of those blocks would then be fully open.
+        """
+        grid = self.grid
+        dx, dy = MOVE[direction]
+        for by in range(max(0, y + dy - 2), min(y, self.height - 3) + 1):
+            for bx in range(max(0, x + dx - 2), min(x, self.width - 3) + 1):
+                open_area = True
+                for cy in range(by, by + 3):
+                    row = grid[cy]
+                    for cx in range(bx, bx + 3):
+                        walls = row[cx]
+                        if cx == x and cy == y:
+                            walls &= ~direction
+                        if (cx < bx + 2 and walls & E) or (
+                            cy < by + 2 and walls & S
+                        ):
+                            open_area = False
+                            break
+                    if not open_area:
+                        break
+                if open_area:
+                    return True
+        return False
+
+    def _flat_cells(self) -> Sequence[int]:
+        """Return the grid as one flat row-major sequence of bitmasks.
+
+        Compact backends expose their buffer directly; the list backend
+        and mapped files are unpacked into a copy (C-level passes), so
+        solving a mapped file holds the whole grid in memory, one byte
+        per cell, for the duration of the call.
+        """
+        if isinstance(self.grid, CompactGrid):
+            return self.grid.cells
+        if isinstance(self.grid, MappedMaze):
+            return self.grid.unpack()
+        return bytes(chain.from_iterable(self.grid))
+
+    def _neighbours(self) -> list[tuple[int, int, int]]:
+        """Return (direction, index delta, opposite) for each direction.
+
+        The order matches MOVE, which fixes the BFS tie-breaking.
+        """
+        return [
+            (direction, dy * self.width + dx, OPPOSITE[direction])
+            for direction, (dx, dy) in MOVE.items()
+        ]
+
+    def _closed_walls(self, cells: Sequence[int], i: int) -> int:
+        """Return the walls of flat cell i, with the maze border added.
+
+        This lets the solvers test a single bit per direction without a
+        separate bounds check.
+        """
+        width = self.width
+        walls = cells[i]
+        x = i % width
+        if i < width:
+            walls |= N
+        if i >= (self.height - 1) * width:
+            walls |= S
+        if x == 0:
+            walls |= W
+        if x == width - 1:
+            walls |= E
+        return walls
+
+    def _trace_back(
+        self, parent: bytearray, start: int, end: int,
+    ) -> list[str]:
+        """Rebuild the moves from start to end from parent directions.
+
+        Args:
+            parent: Direction used to enter each cell (0 if unseen).
+            start: Flat index of the start cell.
+            end: Flat index of the last cell.
+
+        Returns:
+            List of direction letters from start to end.
+        """
+        steps = {N: -self.width, S: self.width, E: 1, W: -1}
+        moves: list[str] = []
+        i = end
+        while i != start:
+            direction = parent[i]
+            moves.append(DIR_MAP[direction])
+            i -= steps[direction]
+        moves.reverse()
+        return moves
+
+    def solve(
+        self,
+        start: tuple[int, int],
+        end: tuple[int, int],
+        method: str = "bfs",
+    ) -> str:
+        """Findet den kürzesten Weg von Start zu Ende.
+
+        The search keeps one parent direction per cell in a flat
+        bytearray and rebuilds the path only once at the end, so each
+        step costs O(1) instead of copying the path so far.
 
         Args:
             start: Startpunkt als (x, y).
             end: Zielpunkt als (x, y).
+            method: 'bfs' (default), 'bidirectional' (BFS from both
+                ends), 'astar' (A* with a Manhattan heuristic) or
+                'junction' (A* on a JunctionGraph of the maze, built on
+                first use and kept until the walls change; pays off
+                when solving the same maze many times). All return a
+                shortest path; in non-perfect mazes different methods
+                may pick different paths of the same length.
 
         Returns:
             Pfad als String aus N/E/S/W, oder leerer String, wenn kein Pfad.
+
+        Raises:
+            ValueError: If the method is unknown.
         """
-        queue: deque[tuple[tuple[int, int], str]] = deque([(start, "")])
-        visited_solve: set[tuple[int, int]] = {start}
-
-        while queue:
-            (x, y), path = queue.popleft()
-            if (x, y) == end:
-                return path
-            for direction, (dx, dy) in MOVE.items():
-                nx, ny = x + dx, y + dy
-                # Prüfen, ob Weg offen ist (Bit nicht gesetzt)
-                # und innerhalb der Grenzen
-                if 0 <= nx < self.width and 0 <= ny < self.height:
-                    if (
-                        not (self.grid[y][x] & direction)
-                        and (nx, ny) not in visited_solve
-                    ):
-                        visited_solve.add((nx, ny))
-                        queue.append(((nx, ny), path + DIR_MAP[direction]))
+        if method not in SOLVE_METHODS:
+            raise ValueError(f"Unknown solve method: '{method}'")
+        if start == end:
+            return ""
+        src = start[1] * self.width + start[0]
+        dst = end[1] * self.width + end[0]
+        with phase(self.profiler, "solve"):
+            if method == "junction":
+                if self._junctions is None:
+                    from .junctions import JunctionGraph
+
+                    self._junctions = JunctionGraph(self)
+                return self._junctions.path(start, end)
+            cells = self._flat_cells()
+            if method == "bidirectional":
+                return self._solve_bidirectional(cells, src, dst)
+            if method == "astar":
+                return self._solve_astar(cells, src, dst)
+            return self._solve_bfs(cells, src, dst)
+
+    def _solve_bfs(self, cells: Sequence[int], src: int, dst: int) -> str:
+        """Plain BFS on flat indices; see solve()."""
+        neighbours = self._neighbours()
+        parent = bytearray(self.width * self.height)
+        parent[src] = 0xFF
+        queue = [src]
+        head = 0
+        while head < len(queue):
+            i = queue[head]
+            head += 1
+            walls = self._closed_walls(cells, i)
+            for direction, delta, _ in neighbours:
+                if walls & direction:
+                    continue
+                j = i + delta
+                if parent[j]:
+                    continue
+                parent[j] = direction
+                if j == dst:
+                    return "".join(self._trace_back(parent, src, dst))
+                queue.append(j)
         return ""
 
+    def _solve_bidirectional(
+        self, cells: Sequence[int], src: int, dst: int,
+    ) -> str:
+        """BFS from both ends, always growing the smaller frontier."""
+        size = self.width * self.height
+        neighbours = self._neighbours()
+        # parent_f[j]: direction used to enter j coming from src.
+        # parent_b[j]: direction from j towards its parent on the dst side.
+        parent_f = bytearray(size)
+        parent_b = bytearray(size)
+        parent_f[src] = 0xFF
+        parent_b[dst] = 0xFF
+        front_f = [src]
+        front_b = [dst]
+
+        meet = -1
+        while front_f and front_b and meet < 0:
+            forward = len(front_f) <= len(front_b)
+            seen, other = (
+                (parent_f, parent_b) if forward else (parent_b, parent_f)
+            )
+            frontier = front_f if forward else front_b
+            nxt: list[int] = []
+            for i in frontier:
+                walls = self._closed_walls(cells, i)
+                for direction, delta, opposite in neighbours:
+                    if walls & direction:
+                        continue
+                    j = i + delta
+                    if seen[j]:
+                        continue
+                    seen[j] = direction if forward else opposite
+                    if other[j]:
+                        meet = j
+                        break
+                    nxt.append(j)
+                if meet >= 0:
+                    break
+            if forward:
+                front_f = nxt
+            else:
+                front_b = nxt
+
+        if meet < 0:
+            return ""
+        moves = self._trace_back(parent_f, src, meet)
+        steps = {N: -self.width, S: self.width, E: 1, W: -1}
+        i = meet
+        while i != dst:
+            direction = parent_b[i]
+            moves.append(DIR_MAP[direction])
+            i += steps[direction]
+        return "".join(moves)
+
+    def _solve_astar(self, cells: Sequence[int], src: int, dst: int) -> str:
+        """A* with a Manhattan-distance heuristic on flat indices."""
+        width = self.width
+        size = width * self.height
+        neighbours = self._neighbours()
+        tx, ty = dst % width, dst // width
+        parent = bytearray(size)
+        parent[src] = 0xFF
+        cost = array("l", [-1]) * size
+        cost[src] = 0
+        closed = bytearray(size)
+        counter = 0
+        heap = [(0, counter, src)]
+        while heap:
+            _, _, i = heappop(heap)
+            if i == dst:
+                return "".join(self._trace_back(parent, src, dst))
+            if closed[i]:
+                continue
+            closed[i] = 1
+            walls = self._closed_walls(cells, i)
+            g = cost[i] + 1
+            for direction, delta, _ in neighbours:
+                if walls & direction:
+                    continue
+                j = i + delta
+                if closed[j] or 0 <= cost[j] <= g:
+                    continue
+                cost[j] = g
+                parent[j] = direction
+                counter += 1
+                h = abs(j % width - tx) + abs(j // width - ty)
+                heappush(heap, (g + h, counter, j))
+        return ""
+
+    def distance_field(
+        self,
+        sources: Iterable[tuple[int, int]],
+        goals: Optional[Iterable[tuple[int, int]]] = None,
+    ) -> "DistanceField":
+        """Run one BFS from all sources (see mazegen.distance).
+
+        Args:
+            sources: Start cells as (x, y), e.g. ``[gen.entry]`` for a
+                heatmap of the distance from the entry.
+            goals: Stop once all of these cells are reached; without
+                goals, the whole maze is searched.
+
+        Returns:
+            A DistanceField with ``distances`` (an ``array('i')``, one
+            entry per cell in row-major order, -1 if unreached) and the
+            shortest path from the nearest source to every reached cell.
+
+        Raises:
+            ValueError: If there is no source or a cell is out of bounds.
+        """
+        from .distance import DistanceField
+
+        with phase(self.profiler, "distance_field"):
+            return DistanceField(self, sources, goals)
+
+    def solve_many(
+        self, start: tuple[int, int], goals: Iterable[tuple[int, int]],
+    ) -> dict[tuple[int, int], str]:
+        """Find the shortest path from start to every goal in one BFS.
+
+        Args:
+            start: Startpunkt als (x, y).
+            goals: Zielpunkte als (x, y).
+
+        Returns:
+            The path (as from solve()) for each goal; empty if there is
+            none.
+
+        Raises:
+            ValueError: If a cell is out of bounds.
+        """
+        from .distance import DistanceField
+
+        goals = list(goals)
+        with phase(self.profiler, "solve"):
+            field = DistanceField(self, [start], goals)
+            return {goal: field.path(goal) for goal in goals}
+
+    def solve_nearest(
+        self, start: tuple[int, int], goals: Iterable[tuple[int, int]],
+    ) -> tuple[Optional[tuple[int, int]], str]:
+        """Find the goal closest to start and the path to it.
+
+        The BFS stops at the first goal it reaches.
+
+        Args:
+            start: Startpunkt als (x, y).
+            goals: Zielpunkte als (x, y).
+
+        Returns:
+            The nearest goal and the path to it, or (None, "") if no
+            goal is reachable.
+
+        Raises:
+            ValueError: If a cell is out of bounds.
+        """
+        from .distance import DistanceField
+
+        with phase(self.profiler, "solve"):
+            field = DistanceField(self, [start], goals, first=True)
+        if not field.reached:
+            return None, ""
+        goal = field.reached[0]
+        return goal, field.path(goal)
+
     def validate_no_3x3_area(self) -> bool:
         """Check that no 3x3 fully open area exists in the maze.
 
@@ -280,10 +908,70 @@ class MazeGenerator:
                     return False
         return True
 
+    def validate(self) -> ValidationResult:
+        """Run all structural checks in one pass (see mazegen.validator).
+
+        Checks for open 3x3 areas, consistent walls, connectivity of all
+        cells outside the '42' pattern and, for perfect mazes, exactly
+        (cells - 1) openings.
+
+        Returns:
+            A ValidationResult; ``result.valid`` is True if all passed.
+        """
+        validator = MazeValidator(self.width, self._pattern_cells(warn=False))
+        with phase(self.profiler, "validate"):
+            return validator.validate(self._rows(), perfect=self.perfect)
+
+    def metrics(
+        self,
+        entry: Optional[tuple[int, int]] = None,
+        exit_: Optional[tuple[int, int]] = None,
+    ) -> MazeMetrics:
+        """Compute maze statistics in bulk passes (see mazegen.metrics).
+
+        Dead ends, junctions, the degree histogram and the straight
+        run lengths come from the walls alone. The solution fields
+        use ``self.solution`` when it belongs to the given (or loaded)
+        entry and exit, e.g. after from_hex(); otherwise the maze is
+        solved first, which costs a BFS over the maze.
+
+        Args:
+            entry: Entry coordinates; defaults to ``self.entry``.
+            exit_: Exit coordinates; defaults to ``self.exit_``.
+
+        Returns:
+            A MazeMetrics; its solution fields are None if neither
+            entry and exit are given nor loaded.
+        """
+        entry = entry if entry is not None else self.entry
+        exit_ = exit_ if exit_ is not None else self.exit_
+        solution = None
+        if entry is not None and exit_ is not None:
+            if (entry, exit_) == (self.entry, self.exit_):
+                solution = self.solution
+            if solution is None:
+                solution = self.solve(entry, exit_)
+        with phase(self.profiler, "metrics"):
+            return compute_metrics(
+                bytes(self._flat_cells()), self.width, solution,
+            )
+
+    def _rows(self) -> Iterator[bytes]:
+        """Yield each row of the grid as bytes, one bitmask per byte."""
+        if isinstance(self.grid, MappedMaze):
+            for y in range(self.height):
+                yield self.grid.row(y)
+            return
+        for row in self.grid:
+            yield bytes(row)
+
     def get_hex_layout(self) -> list[str]:
         """Gibt das Labyrinth als Liste von Hex-Strings zurück.
 
         Returns:
             Liste von Strings, eine pro Zeile, jede Zelle als Hex-Ziffer.
         """
-        return ["".join(f"{cell:X}" for cell in row) for row in self.grid]
+        with phase(self.profiler, "hex_encode"):
+            if isinstance(self.grid, MappedMaze):
+                return list(self.grid.hex_rows())
+            return encode_grid(self.grid)
@@ -0,0 +1,63 @@
+"""Bulk conversion between wall bitmasks and hex text rows.
+
+Every row is converted with a single ``bytes.translate`` call, so no
+Python code runs per cell. Decoded rows are ``bytes`` with one wall
+bitmask (0-15) per byte.
+"""
+
+from typing import Iterable, Sequence
+
+HEX_DIGITS = b"0123456789ABCDEF"
+
+# Wall bitmask (0-15) -> upper-case hex digit.
+NIBBLE_TO_HEX = bytes.maketrans(bytes(range(16)), HEX_DIGITS)
+
+# Hex digit (either case) -> wall bitmask.
+HEX_TO_NIBBLE = bytes.maketrans(
+    HEX_DIGITS + HEX_DIGITS.lower(), bytes(range(16)) * 2,
+)
+
+# Wall bitmask -> number of open east/south walls (each edge once).
+OPEN_EAST_SOUTH = bytes(
+    (not cell & 2) + (not cell & 4) for cell in range(256)
+)
+
+
+def encode_row(cells: Sequence[int]) -> str:
+    """Encode one row of wall bitmasks as an upper-case hex string.
+
+    Args:
+        cells: Wall bitmasks (a list, bytes or memoryview row).
+
+    Returns:
+        One hex digit per cell.
+    """
+    return bytes(cells).translate(NIBBLE_TO_HEX).decode("ascii")
+
+
+def decode_row(line: str) -> bytes:
+    """Decode one hex row into wall bitmasks.
+
+    Args:
+        line: Hex digits, one per cell, without line ending.
+
+    Returns:
+        One byte per cell.
+
+    Raises:
+        ValueError: If the line contains a non-hex character.
+    """
+    raw = line.encode("ascii", "replace")
+    if raw.translate(None, HEX_DIGITS + HEX_DIGITS.lower()):
+        raise ValueError(f"Invalid hex row: '{line}'")
+    return raw.translate(HEX_TO_NIBBLE)
+
+
+def encode_grid(grid: Iterable[Sequence[int]]) -> list[str]:
+    """Encode every row of a grid; see encode_row()."""
+    return [encode_row(row) for row in grid]
+
+
+def decode_grid(lines: Iterable[str]) -> list[bytes]:
+    """Decode every hex row; see decode_row()."""
+    return [decode_row(line) for line in lines]
@@ -0,0 +1,535 @@
+"""Corridor-contracted junction graph for repeated solving.
+
+Most cells of a maze have exactly two open walls: they only lead on.
+``JunctionGraph`` keeps every other open cell (dead ends, junctions) as
+a node and collapses each corridor between two nodes into one edge,
+weighted by its length and storing its moves as an N/E/S/W string. A
+query runs Dijkstra or A* over the nodes only, then joins the edge
+strings back into the full path.
+
+Query cells need not be nodes: a corridor cell is attached to both ends
+of its edge with the partial lengths, and two cells on the same corridor
+are also connected directly. Dead ends are treated the same way, as the
+last cell of their corridor: no shortest path passes through one, so the
+search never enters them. A ring of corridor cells without any junction
+gets one of its cells as a node.
+
+A* needs a lower bound of the remaining distance. The Manhattan distance
+is a poor one in mazes with many loops, where it lets the search expand
+most of the graph. The graph therefore also stores the distance of every
+node from the four corner cells (the landmarks), found with one bucket
+queue Dijkstra each while building; by the triangle inequality
+``|d(L, v) - d(L, b)|`` never overestimates the distance from v to b, and
+the largest of these bounds usually points the search straight along the
+shortest path.
+
+The graph is built on the first query. When the generator's
+``revision`` changes, it is rebuilt, unless every change since the last
+query was recorded with ``mark_changed(cells)`` and is still in the
+generator's bounded change log: then only the corridors through those
+cells are re-walked. Such an update makes the landmark
+distances stale; the next query uses the Manhattan bound only, and the
+landmarks are recomputed by the query after that if the walls have not
+changed again in between.
+"""
+
+import re
+from array import array
+from heapq import heappop, heappush
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from .generator import DIR_MAP, OPPOSITE, E, N, S, W
+from .metrics import DEGREE
+from .profiling import phase
+
+if TYPE_CHECKING:
+    from .generator import MazeGenerator
+
+JUNCTION_METHODS = ("astar", "dijkstra")
+
+# Moves of a corridor walked backwards (after reversing the string).
+_REVERSE = str.maketrans("NESW", "SWNE")
+# Closed walls of a cell (incl. the one it was entered by) -> the only
+# open direction left, for cells with one open wall.
+_ONLY_OPEN = {15 & ~d: d for d in (N, E, S, W)}
+_NODE_DEGREES = re.compile(b"[\x01\x03\x04]")
+_INF = float("inf")
+
+# One end of a query: (node, cost, moves between the cell and the node).
+Attachment = tuple[int, int, str]
+
+
+def _or_table(bit: int) -> bytes:
+    """Translate table: wall bitmask -> bitmask with bit set."""
+    return bytes(cell | bit for cell in range(256))
+
+
+class JunctionGraph:
+    """Weighted graph of the junctions and dead ends of a maze."""
+
+    def __init__(self, gen: "MazeGenerator") -> None:
+        """Create the graph; it is built on first use.
+
+        Args:
+            gen: A MazeGenerator that has already called generate().
+        """
+        self.gen = gen
+        self.revision = -1
+        # Revision seen by the last query, to decide when to recompute
+        # stale landmarks.
+        self.queried = -1
+        # Walls incl. the outer border, and open walls, of every cell.
+        self.closed = bytearray()
+        self.degrees = bytearray()
+        self.node_id = array("i")
+        # Flat cell of every node; -1 for nodes removed by an update.
+        self.node_cell: list[int] = []
+        self.node_x = array("i")
+        self.node_y = array("i")
+        self.edge_of = array("i")
+        self.offset = array("i")
+        # Ends of every edge; -1 for edges removed by an update.
+        self.edge_a: list[int] = []
+        self.edge_b: list[int] = []
+        self.edge_moves: list[str] = []
+        # Edges the search may take from each node: (node, length, edge).
+        self.adjacent: list[list[tuple[int, int, int]]] = []
+        # Distance of every node from each landmark; empty when stale.
+        self.landmarks: list[array[int]] = []
+
+    def _steps(self) -> dict[int, int]:
+        """Return the flat index offset of each direction."""
+        width = self.gen.width
+        return {N: -width, S: width, E: 1, W: -1}
+
+    def _build(self) -> None:
+        """Find the nodes, walk every corridor once, place landmarks."""
+        gen = self.gen
+        width, size = gen.width, gen.width * gen.height
+        with phase(gen.profiler, "junction_graph"):
+            closed = bytearray(gen._flat_cells())
+            # The outer border counts as closed, as in the solvers.
+            closed[:width] = closed[:width].translate(_or_table(N))
+            closed[size - width:] = closed[size - width:].translate(
+                _or_table(S),
+            )
+            closed[::width] = closed[::width].translate(_or_table(W))
+            closed[width - 1::width] = closed[width - 1::width].translate(
+                _or_table(E),
+            )
+            self.closed = closed
+            self.degrees = degrees = closed.translate(DEGREE)
+
+            self.node_id = array("i", [-1]) * size
+            self.node_cell = [
+                match.start() for match in _NODE_DEGREES.finditer(degrees)
+            ]
+            for u, i in enumerate(self.node_cell):
+                self.node_id[i] = u
+            self.node_x = array("i", (i % width for i in self.node_cell))
+            self.node_y = array("i", (i // width for i in self.node_cell))
+            self.adjacent = [[] for _ in self.node_cell]
+            self.edge_of = array("i", [-1]) * size
+            self.offset = array("i", [0]) * size
+            self.edge_a, self.edge_b, self.edge_moves = [], [], []
+
+            steps = self._steps()
+            covered = 0
+            for u in range(len(self.node_cell)):
+                covered += self._walk_from(u, steps)
+            if covered < degrees.count(2):
+                # Rings without a junction: make one cell a node each.
+                self._cover_rings(range(size), steps)
+        with phase(gen.profiler, "junction_landmarks"):
+            self._place_landmarks()
+        self.revision = gen.revision
+
+    def _add_node(self, i: int) -> int:
+        """Make flat cell i a node and return its id."""
+        u = len(self.node_cell)
+        self.node_id[i] = u
+        self.node_cell.append(i)
+        self.node_x.append(i % self.gen.width)
+        self.node_y.append(i // self.gen.width)
+        self.adjacent.append([])
+        return u
+
+    def _cover_rings(
+        self, cells: Iterable[int], steps: dict[int, int],
+    ) -> None:
+        """Give every corridor cell without an edge a node and walk it."""
+        degrees, edge_of, node_id = self.degrees, self.edge_of, self.node_id
+        for i in cells:
+            if degrees[i] == 2 and edge_of[i] < 0 and node_id[i] < 0:
+                self._walk_from(self._add_node(i), steps, rewalk=True)
+
+    def _walk_from(
+        self, u: int, steps: dict[int, int], rewalk: bool = False,
+    ) -> int:
+        """Follow every corridor leaving node u that has no edge yet.
+
+        Args:
+            u: The node to start from.
+            steps: Flat index offset of each direction.
+            rewalk: Look up the edges of u instead of assuming that
+                neighbouring nodes at a lower cell were walked already,
+                as the full build does.
+
+        Returns:
+            The number of corridor cells assigned to new edges.
+        """
+        closed, degrees = self.closed, self.degrees
+        start = self.node_cell[u]
+        covered = 0
+        for direction in (N, S, E, W):
+            if closed[start] & direction:
+                continue
+            j = start + steps[direction]
+            if self.edge_of[j] >= 0 or 0 <= self.node_id[j] and (
+                self._edge_towards(start, j) >= 0 if rewalk else j < start
+            ):
+                continue  # walked from the other end already
+            e = len(self.edge_moves)
+            moves = [DIR_MAP[direction]]
+            while self.node_id[j] < 0:
+                self.edge_of[j] = e
+                self.offset[j] = len(moves)
+                covered += 1
+                direction = _ONLY_OPEN[closed[j] | OPPOSITE[direction]]
+                j += steps[direction]
+                moves.append(DIR_MAP[direction])
+            v = self.node_id[j]
+            self.edge_a.append(u)
+            self.edge_b.append(v)
+            self.edge_moves.append("".join(moves))
+            # Dead ends sit on their edge like corridor cells.
+            if degrees[j] == 1:
+                self.edge_of[j] = e
+                self.offset[j] = len(moves)
+            else:
+                self.adjacent[u].append((v, len(moves), e))
+            if degrees[start] == 1:
+                self.edge_of[start] = e
+                self.offset[start] = 0
+            elif v != u:
+                self.adjacent[v].append((u, len(moves), e))
+        return covered
+
+    def _edge_towards(self, i: int, j: int) -> int:
+        """Return the edge from node cell i to its open neighbour j.
+
+        Returns:
+            The edge id, or -1 if that corridor has no edge (yet).
+        """
+        if self.edge_of[j] >= 0:
+            return self.edge_of[j]  # a corridor cell or a dead end
+        if self.edge_of[i] >= 0:
+            return self.edge_of[i]  # i is a dead end: its only edge
+        v = self.node_id[j]
+        for node, weight, e in self.adjacent[self.node_id[i]]:
+            if node == v and weight == 1:
+                return e
+        return -1
+
+    def _drop_edge(self, e: int, cleared: list[int]) -> None:
+        """Remove edge e, adding its corridor cells to cleared."""
+        steps = {DIR_MAP[d]: step for d, step in self._steps().items()}
+        i = self.node_cell[self.edge_a[e]]
+        if self.edge_of[i] == e:
+            self.edge_of[i] = -1
+        for letter in self.edge_moves[e]:
+            i += steps[letter]
+            if self.edge_of[i] == e:
+                self.edge_of[i] = -1
+                cleared.append(i)
+        for u in {self.edge_a[e], self.edge_b[e]}:
+            self.adjacent[u] = [t for t in self.adjacent[u] if t[2] != e]
+        self.edge_a[e] = self.edge_b[e] = -1
+        self.edge_moves[e] = ""
+
+    def _update(self, cells: list[tuple[int, int]]) -> None:
+        """Re-walk only the corridors through cells whose walls changed."""
+        gen = self.gen
+        width, height = gen.width, gen.height
+        steps = self._steps()
+        touched = sorted({y * width + x for x, y in cells})
+        with phase(gen.profiler, "junction_update"):
+            # Drop every edge through or ending at a touched cell, found
+            # with the walls from before the change.
+            cleared: list[int] = []
+            ends: set[int] = set()
+            for i in touched:
+                if self.node_id[i] < 0:
+                    dropped = [self.edge_of[i]]
+                else:
+                    dropped = [
+                        self._edge_towards(i, i + step)
+                        for direction, step in steps.items()
+                        if not self.closed[i] & direction
+                    ]
+                for e in dropped:
+                    if e >= 0 and self.edge_a[e] >= 0:
+                        ends.update((self.edge_a[e], self.edge_b[e]))
+                        self._drop_edge(e, cleared)
+
+            for i in touched:
+                y, x = divmod(i, width)
+                walls = gen.grid[y][x] | (
+                    (N if y == 0 else 0) | (S if y == height - 1 else 0)
+                    | (W if x == 0 else 0) | (E if x == width - 1 else 0)
+                )
+                self.closed[i] = walls
+                self.degrees[i] = DEGREE[walls]
+            for i in touched:
+                u = self.node_id[i]
+                node = self.degrees[i] in (1, 3, 4)
+                if u >= 0 and not node:
+                    self.node_id[i] = -1
+                    self.node_cell[u] = -1
+                    ends.discard(u)
+                elif u < 0 and node:
+                    ends.add(self._add_node(i))
+                elif u >= 0:
+                    ends.add(u)
+
+            for u in sorted(ends):
+                self._walk_from(u, steps, rewalk=True)
+            self._cover_rings(cleared + touched, steps)
+        self.landmarks = []
+
+    def _ensure_fresh(self) -> None:
+        """Bring the graph up to date with the walls of the maze.
+
+        Applies the recorded cell changes since the last query if there
+        are any for every revision in between, otherwise rebuilds.
+        """
+        gen = self.gen
+        if self.revision != gen.revision:
+            changes = [
+                cells for revision, cells in gen.changes
+                if revision > self.revision
+            ]
+            if self.revision >= 0 and (
+                len(changes) == gen.revision - self.revision
+            ):
+                self._update([cell for cells in changes for cell in cells])
+            else:
+                self._build()
+            self.revision = gen.revision
+        elif not self.landmarks and self.queried == gen.revision:
+            with phase(gen.profiler, "junction_landmarks"):
+                self._place_landmarks()
+        self.queried = gen.revision
+
+    def _place_landmarks(self) -> None:
+        """Compute the distance of every node from each corner cell."""
+        width, height = self.gen.width, self.gen.height
+        corners = (
+            0, width - 1, (height - 1) * width, height * width - 1,
+        )
+        self.landmarks = [self._distances_from(i) for i in corners]
+
+    def _distances_from(self, i: int) -> "array[int]":
+        """Return the distance of every node from flat cell i.
+
+        Dijkstra with a ring of buckets, one per distance modulo the
+        longest edge: edge lengths are small integers, so no heap is
+        needed. Unreachable nodes get width * height.
+        """
+        unseen = self.gen.width * self.gen.height
+        dist = array("i", [unseen]) * len(self.node_cell)
+        ring = max(map(len, self.edge_moves), default=0) + 1
+        buckets: list[list[int]] = [[] for _ in range(ring)]
+        pending = 0
+        for node, cost, _ in self._attachments(i):
+            if cost < dist[node]:
+                dist[node] = cost
+                buckets[cost % ring].append(node)
+                pending += 1
+        adjacent = self.adjacent
+        d = 0
+        while pending:
+            bucket = buckets[d % ring]
+            buckets[d % ring] = []
+            pending -= len(bucket)
+            for u in bucket:
+                if dist[u] != d:
+                    continue
+                for v, weight, _ in adjacent[u]:
+                    nd = d + weight
+                    if nd < dist[v]:
+                        dist[v] = nd
+                        buckets[nd % ring].append(v)
+                        pending += 1
+            d += 1
+        return dist
+
+    def _attachments(self, i: int) -> list[Attachment]:
+        """Return the nodes a cell connects to, with cost and moves.
+
+        The moves lead from the cell to the node.
+        """
+        e = self.edge_of[i]
+        if e < 0:
+            if self.node_id[i] >= 0:
+                return [(self.node_id[i], 0, "")]
+            return []
+        k = self.offset[i]
+        moves = self.edge_moves[e]
+        return [
+            (self.edge_a[e], k, moves[:k][::-1].translate(_REVERSE)),
+            (self.edge_b[e], len(moves) - k, moves[k:]),
+        ]
+
+    def _edge_moves(self, e: int, u: int) -> str:
+        """Return the moves of edge e when leaving from node u."""
+        moves = self.edge_moves[e]
+        if self.edge_a[e] == u:
+            return moves
+        return moves[::-1].translate(_REVERSE)
+
+    def _bound(
+        self, b: tuple[int, int], ends: list[Attachment], method: str,
+    ) -> Callable[[int], int]:
+        """Return the A* lower bound of the distance from a node to b.
+
+        Uses the Manhattan distance and the landmark distances, or 0
+        for Dijkstra.
+        """
+        if method == "dijkstra":
+            return lambda v: 0
+        bx, by = b
+        node_x, node_y = self.node_x, self.node_y
+        unseen = self.gen.width * self.gen.height
+        marks = [
+            (m, min(min((m[n] + c for n, c, _ in ends), default=unseen),
+                    unseen))
+            for m in self.landmarks
+        ]
+
+        def bound(v: int) -> int:
+            h = abs(node_x[v] - bx) + abs(node_y[v] - by)
+            for m, goal in marks:
+                d = abs(m[v] - goal)
+                if d > h:
+                    h = d
+            return h
+
+        return bound
+
+    def _search(
+        self, a: tuple[int, int], b: tuple[int, int], method: str,
+    ) -> Optional[str]:
+        """Return a shortest path from a to b, None if there is none.
+
+        Raises:
+            ValueError: If the method is unknown or a cell is out of
+                bounds.
+        """
+        if method not in JUNCTION_METHODS:
+            raise ValueError(f"Unknown junction search method: '{method}'")
+        width, height = self.gen.width, self.gen.height
+        for name, (x, y) in (("Start", a), ("End", b)):
+            if not (0 <= x < width and 0 <= y < height):
+                raise ValueError(f"{name} {(x, y)} out of bounds")
+        if a == b:
+            return ""
+        self._ensure_fresh()
+        src = a[1] * width + a[0]
+        dst = b[1] * width + b[0]
+
+        best = _INF
+        best_path: Optional[str] = None
+        e = self.edge_of[src]
+        if e >= 0 and e == self.edge_of[dst]:
+            ka, kb = self.offset[src], self.offset[dst]
+            moves = self.edge_moves[e]
+            best = abs(ka - kb)
+            best_path = (
+                moves[ka:kb] if ka < kb
+                else moves[kb:ka][::-1].translate(_REVERSE)
+            )
+
+        ends = self._attachments(dst)
+        targets: dict[int, tuple[int, str]] = {}
+        for node, cost, moves in ends:
+            if node not in targets or cost < targets[node][0]:
+                targets[node] = (cost, moves[::-1].translate(_REVERSE))
+        if not targets:
+            return best_path
+
+        bound = self._bound(b, ends, method)
+        unseen = width * height
+        dist = array("i", [unseen]) * len(self.node_cell)
+        # prev[node]: (previous node, edge) or (-1, -1) for a start node.
+        prev: dict[int, tuple[int, int]] = {}
+        head: dict[int, str] = {}
+        heap: list[tuple[int, int, int]] = []
+        for node, cost, moves in self._attachments(src):
+            if cost < dist[node]:
+                dist[node] = cost
+                prev[node] = (-1, -1)
+                head[node] = moves
+                heappush(heap, (cost + bound(node), cost, node))
+
+        end = -1
+        adjacent = self.adjacent
+        while heap:
+            f, d, u = heappop(heap)
+            if f >= best:
+                break
+            if d > dist[u]:
+                continue
+            if u in targets and d + targets[u][0] < best:
+                best = d + targets[u][0]
+                end = u
+            for v, weight, edge in adjacent[u]:
+                nd = d + weight
+                if nd < dist[v] and nd < best:
+                    dist[v] = nd
+                    prev[v] = (u, edge)
+                    heappush(heap, (nd + bound(v), nd, v))
+
+        if end < 0:
+            return best_path
+        parts = [targets[end][1]]
+        u = end
+        while prev[u][0] >= 0:
+            p, edge = prev[u]
+            parts.append(self._edge_moves(edge, p))
+            u = p
+        parts.append(head[u])
+        parts.reverse()
+        return "".join(parts)
+
+    def path(
+        self, a: tuple[int, int], b: tuple[int, int], method: str = "astar",
+    ) -> str:
+        """Return a shortest path between two cells.
+
+        Args:
+            a: Start cell as (x, y).
+            b: End cell as (x, y).
+            method: 'astar' (default) or 'dijkstra'.
+
+        Returns:
+            The path as N/E/S/W letters, or an empty string if there is
+            none.
+
+        Raises:
+            ValueError: If the method is unknown or a cell is out of
+                bounds.
+        """
+        return self._search(a, b, method) or ""
+
+    def distance(
+        self, a: tuple[int, int], b: tuple[int, int], method: str = "astar",
+    ) -> int:
+        """Return the number of steps between two cells, -1 if unreachable.
+
+        Raises:
+            ValueError: If the method is unknown or a cell is out of
+                bounds.
+        """
+        path = self._search(a, b, method)
+        return -1 if path is None else len(path)
@@ -0,0 +1,126 @@
+"""Maze statistics computed with bulk bytes operations.
+
+All counts come from the flat row-major cell buffer (one wall bitmask
+per byte) through ``bytes.translate``, ``bytes.count`` and
+``bytes.split``, which run in C, so a 10000 x 10000 maze takes seconds:
+
+- The number of open walls of a cell is its degree: 1 is a dead end,
+  2 a corridor cell, 3 and 4 junctions; fully walled cells (the '42'
+  pattern and unreachable cells) have degree 0.
+- Straight runs are maximal runs of open east walls in a row and of
+  open south walls in a column. The closed outer wall ends every run at
+  the border, so rows (and columns, after slicing them out with a
+  stride) can be joined and split in one go. A run of k open walls is a
+  straight run of k + 1 cells. These are not corridors in the graph
+  sense: a winding corridor between two junctions counts as one run per
+  straight piece, and a run may pass through junctions. Walking the
+  degree-2 chains (as JunctionGraph does) would need a Python loop per
+  cell, so it is left out of the bulk metrics.
+- Turns of the solution are the number of direction changes, i.e. the
+  number of runs of equal letters minus one.
+
+Large buffers are processed in slices of about ``SLICE_CELLS`` cells to
+bound the memory of the split lists.
+"""
+
+import re
+from collections import Counter
+from typing import Any, Optional
+
+SLICE_CELLS = 1 << 20
+
+# Wall bitmask -> number of open walls, as a byte.
+DEGREE = bytes(4 - bin(cell & 15).count("1") for cell in range(256))
+# Wall bitmask -> b'1' if the east / south wall is open, else b' ', so
+# that bytes.split() returns only the runs, without empty strings.
+_OPEN_E = bytes(ord(" ") if cell & 2 else ord("1") for cell in range(256))
+_OPEN_S = bytes(ord(" ") if cell & 4 else ord("1") for cell in range(256))
+_RUN = re.compile(r"N+|E+|S+|W+")
+
+
+class MazeMetrics:
+    """Outcome of compute_metrics()."""
+
+    def __init__(self) -> None:
+        """Start with an empty maze."""
+        self.cells = 0
+        self.open_cells = 0
+        self.dead_ends = 0
+        self.junctions = 0
+        # Degree (open walls) -> number of cells, for degrees 0 to 4.
+        self.branching: dict[int, int] = {}
+        # Straight run length in cells -> number of runs.
+        self.straight_runs: dict[int, int] = {}
+        self.solution_length: Optional[int] = None
+        self.solution_turns: Optional[int] = None
+        self.solution_share: Optional[float] = None
+
+    @property
+    def mean_straight_run(self) -> float:
+        """Return the mean straight run length in cells."""
+        count = sum(self.straight_runs.values())
+        if not count:
+            return 0.0
+        return sum(k * n for k, n in self.straight_runs.items()) / count
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics as a JSON-serialisable dict."""
+        return {
+            "cells": self.cells,
+            "open_cells": self.open_cells,
+            "dead_ends": self.dead_ends,
+            "junctions": self.junctions,
+            "branching": self.branching,
+            "straight_runs": self.straight_runs,
+            "mean_straight_run": self.mean_straight_run,
+            "solution_length": self.solution_length,
+            "solution_turns": self.solution_turns,
+            "solution_share": self.solution_share,
+        }
+
+
+def compute_metrics(
+    cells: bytes, width: int, solution: Optional[str] = None,
+) -> MazeMetrics:
+    """Compute the statistics of a maze.
+
+    Args:
+        cells: Row-major wall bitmasks, one byte per cell.
+        width: Maze width in cells.
+        solution: Path from entry to exit as N/E/S/W letters, if known;
+            without it the solution fields stay None.
+
+    Returns:
+        The collected metrics.
+    """
+    result = MazeMetrics()
+    result.cells = len(cells)
+    height = len(cells) // width if width else 0
+
+    degrees = cells.translate(DEGREE)
+    result.branching = {d: degrees.count(d) for d in range(5)}
+    result.open_cells = result.cells - result.branching[0]
+    result.dead_ends = result.branching[1]
+    result.junctions = result.branching[3] + result.branching[4]
+
+    runs: Counter[int] = Counter()
+    rows = max(1, SLICE_CELLS // max(width, 1))
+    for y in range(0, height, rows):
+        chunk = cells[y * width:(y + rows) * width]
+        runs.update(map(len, chunk.translate(_OPEN_E).split()))
+    columns = max(1, SLICE_CELLS // max(height, 1))
+    for x0 in range(0, width, columns):
+        chunk = b"".join(
+            cells[x::width] for x in range(x0, min(x0 + columns, width))
+        )
+        runs.update(map(len, chunk.translate(_OPEN_S).split()))
+    result.straight_runs = {k + 1: n for k, n in sorted(runs.items())}
+
+    if solution is not None:
+        result.solution_length = len(solution)
+        result.solution_turns = max(0, len(_RUN.findall(solution)) - 1)
+        if result.open_cells:
+            result.solution_share = (
+                (len(solution) + 1) / result.open_cells
+            )
+    return result
@@ -0,0 +1,167 @@
+"""Precomputed path queries for perfect mazes.
+
+A perfect maze is a spanning tree of its open cells. ``PathIndex`` roots
+that tree once, stores depth and parent of every cell and builds a
+binary-lifting table for lowest common ancestors. After that,
+``distance(a, b)`` costs O(log n) and ``path(a, b)`` costs O(log n +
+path length), instead of a full BFS per query.
+
+For non-perfect mazes the index falls back to ``MazeGenerator.solve``.
+"""
+
+from array import array
+from typing import TYPE_CHECKING
+
+from .generator import DIR_MAP, OPPOSITE, E, N, S, W
+
+if TYPE_CHECKING:
+    from .generator import MazeGenerator
+
+
+class PathIndex:
+    """Distance tree with LCA lookups, built from a MazeGenerator grid.
+
+    The index remembers the generator's ``revision`` and rebuilds itself
+    on the next query once the grid has changed.
+    """
+
+    def __init__(self, gen: "MazeGenerator") -> None:
+        """Create the index; the tree itself is built on first use.
+
+        Args:
+            gen: A MazeGenerator that has already called generate().
+        """
+        self.gen = gen
+        self.revision = -1
+        self.parent_dir = bytearray()
+        self.depth = array("i")
+        self.component = array("i")
+        self.up: list[array[int]] = []
+
+    def _build(self) -> None:
+        """Root every tree of the maze and fill the lifting table."""
+        gen = self.gen
+        size = gen.width * gen.height
+        cells = gen._flat_cells()
+        neighbours = gen._neighbours()
+
+        parent = array("i", [-1]) * size
+        self.parent_dir = bytearray(size)
+        self.depth = array("i", [0]) * size
+        self.component = array("i", [-1]) * size
+
+        for root in range(size):
+            if self.component[root] >= 0:
+                continue
+            self.component[root] = root
+            parent[root] = root
+            queue = [root]
+            head = 0
+            while head < len(queue):
+                i = queue[head]
+                head += 1
+                walls = gen._closed_walls(cells, i)
+                for direction, delta, _ in neighbours:
+                    if walls & direction:
+                        continue
+                    j = i + delta
+                    if self.component[j] >= 0:
+                        continue
+                    self.component[j] = root
+                    parent[j] = i
+                    self.parent_dir[j] = direction
+                    self.depth[j] = self.depth[i] + 1
+                    queue.append(j)
+
+        self.up = [parent]
+        max_depth = max(self.depth, default=0)
+        while (1 << len(self.up)) <= max_depth:
+            prev = self.up[-1]
+            self.up.append(array("i", (prev[prev[i]] for i in range(size))))
+        self.revision = gen.revision
+
+    def _ensure_fresh(self) -> None:
+        """Rebuild the index if the maze changed since the last build."""
+        if self.revision != self.gen.revision:
+            self._build()
+
+    def _lca(self, a: int, b: int) -> int:
+        """Return the lowest common ancestor of two flat indices."""
+        depth = self.depth
+        if depth[a] < depth[b]:
+            a, b = b, a
+        diff = depth[a] - depth[b]
+        k = 0
+        while diff:
+            if diff & 1:
+                a = self.up[k][a]
+            diff >>= 1
+            k += 1
+        if a == b:
+            return a
+        for level in reversed(self.up):
+            if level[a] != level[b]:
+                a, b = level[a], level[b]
+        return self.up[0][a]
+
+    def distance(self, a: tuple[int, int], b: tuple[int, int]) -> int:
+        """Return the number of steps between two cells.
+
+        Args:
+            a: First cell as (x, y).
+            b: Second cell as (x, y).
+
+        Returns:
+            Length of the shortest path, or -1 if there is none.
+        """
+        if not self.gen.perfect:
+            if a == b:
+                return 0
+            path = self.gen.solve(a, b)
+            return len(path) if path else -1
+        self._ensure_fresh()
+        width = self.gen.width
+        i = a[1] * width + a[0]
+        j = b[1] * width + b[0]
+        if self.component[i] != self.component[j]:
+            return -1
+        lca = self._lca(i, j)
+        return self.depth[i] + self.depth[j] - 2 * self.depth[lca]
+
+    def path(self, a: tuple[int, int], b: tuple[int, int]) -> str:
+        """Return the path between two cells as an N/E/S/W string.
+
+        Args:
+            a: Start cell as (x, y).
+            b: End cell as (x, y).
+
+        Returns:
+            The path, or an empty string if there is none.
+        """
+        if not self.gen.perfect:
+            return self.gen.solve(a, b)
+        self._ensure_fresh()
+        width = self.gen.width
+        i = a[1] * width + a[0]
+        j = b[1] * width + b[0]
+        if self.component[i] != self.component[j]:
+            return ""
+        lca = self._lca(i, j)
+        steps = {N: -width, S: width, E: 1, W: -1}
+
+        # From a up to the LCA: walk against each parent direction.
+        up_moves: list[str] = []
+        while i != lca:
+            direction = self.parent_dir[i]
+            up_moves.append(DIR_MAP[OPPOSITE[direction]])
+            i -= steps[direction]
+
+        # From the LCA down to b: collected bottom-up, then reversed.
+        down_moves: list[str] = []
+        while j != lca:
+            direction = self.parent_dir[j]
+            down_moves.append(DIR_MAP[direction])
+            j -= steps[direction]
+        down_moves.reverse()
+
+        return "".join(up_moves) + "".join(down_moves)
@@ -0,0 +1,142 @@
+"""Compact encodings of the solution path line.
+
+Three formats, told apart by their first characters so that
+decode_path() needs no extra header:
+
+- ``letters`` (the default): one of N/E/S/W per move, e.g. ``EESSSW``.
+- ``rle``: runs of equal moves as the letter and the run length, with
+  the length left out for single moves, e.g. ``E2S3W``. A plain letters
+  line is therefore also valid RLE.
+- ``packed``: 2 bits per move (N=0, E=1, S=2, W=3, the first move in the
+  lowest bits), written as ``=<moves>:<base64>``.
+
+Encoding and decoding run in C: ``bytes.translate`` maps letters to
+codes and back, the four moves of a packed byte are combined and split
+with strided slices and big-integer ORs, and RLE only touches Python
+code once per run. path_coords() turns a path into signed steps with
+``bytes.translate`` and sums them up with ``itertools.accumulate``.
+"""
+
+import base64
+import binascii
+import re
+from array import array
+from itertools import accumulate
+
+PATH_FORMATS = ("letters", "rle", "packed")
+PACKED_PREFIX = "="
+
+_LETTERS = b"NESW"
+_DIGITS = b"0123456789"
+_RLE_RUN = re.compile(r"([NESW])(\d+)")
+_RUN = re.compile(r"N+|E+|S+|W+")
+
+# Letter -> 2-bit code, shifted into move slot k of a packed byte.
+_PACK = [
+    bytes.maketrans(_LETTERS, bytes(code << 2 * k for code in range(4)))
+    for k in range(4)
+]
+# Packed byte -> letter of the move in slot k.
+_UNPACK = [
+    bytes(_LETTERS[byte >> 2 * k & 3] for byte in range(256))
+    for k in range(4)
+]
+# Letter -> step along x / y, as a signed byte (0xFF is -1).
+_DX = bytes.maketrans(_LETTERS, b"\x00\x01\x00\xff")
+_DY = bytes.maketrans(_LETTERS, b"\xff\x00\x01\x00")
+
+
+def encode_path(path: str, path_format: str = "letters") -> str:
+    """Encode a path of N/E/S/W letters for the output file.
+
+    Args:
+        path: The path, one letter per move.
+        path_format: One of PATH_FORMATS.
+
+    Returns:
+        The encoded path line, without line ending.
+
+    Raises:
+        ValueError: If the format is unknown.
+    """
+    if path_format == "letters":
+        return path
+    if path_format == "rle":
+        return "".join(
+            run[0] + str(len(run)) if len(run) > 1 else run
+            for run in _RUN.findall(path)
+        )
+    if path_format == "packed":
+        return PACKED_PREFIX + f"{len(path)}:" + base64.b64encode(
+            _pack(path.encode("ascii")),
+        ).decode("ascii")
+    raise ValueError(f"Unknown path format: '{path_format}'")
+
+
+def _pack(moves: bytes) -> bytes:
+    """Pack letters into 2-bit codes, four moves per byte."""
+    size = (len(moves) + 3) // 4
+    moves += b"N" * (size * 4 - len(moves))
+    packed = 0
+    for k in range(4):
+        packed |= int.from_bytes(moves[k::4].translate(_PACK[k]), "big")
+    return packed.to_bytes(size, "big")
+
+
+def decode_path(text: str) -> str:
+    """Decode a path line in any of the PATH_FORMATS to letters.
+
+    Args:
+        text: The path line, without line ending.
+
+    Returns:
+        The path, one N/E/S/W letter per move.
+
+    Raises:
+        ValueError: If the line is not a valid path in any format.
+    """
+    if text.startswith(PACKED_PREFIX):
+        head, _, data = text[1:].partition(":")
+        try:
+            moves = int(head)
+            packed = base64.b64decode(data, validate=True)
+        except (ValueError, binascii.Error):
+            raise ValueError("Invalid packed path") from None
+        if not 0 <= moves <= len(packed) * 4:
+            raise ValueError("Invalid packed path length")
+        letters = bytearray(len(packed) * 4)
+        for k in range(4):
+            letters[k::4] = packed.translate(_UNPACK[k])
+        return letters[:moves].decode("ascii")
+    raw = text.encode("ascii", "replace")
+    rest = raw.translate(None, _LETTERS)
+    if not rest:
+        return text
+    if rest.translate(None, _DIGITS) or raw[:1].isdigit():
+        raise ValueError("Invalid path: expected N/E/S/W moves")
+    return _RLE_RUN.sub(lambda m: m[1] * int(m[2]), text)
+
+
+def path_coords(
+    path: str, start: tuple[int, int],
+) -> tuple["array[int]", "array[int]"]:
+    """Return the cells along a path as coordinate arrays.
+
+    Args:
+        path: The path in any of the PATH_FORMATS.
+        start: The first cell (x, y).
+
+    Returns:
+        Arrays of the x and y coordinates of every cell on the path,
+        including start, i.e. one more than the number of moves.
+
+    Raises:
+        ValueError: If the path is not valid.
+    """
+    moves = decode_path(path).encode("ascii")
+    coords = []
+    for table, first in ((_DX, start[0]), (_DY, start[1])):
+        steps = array("b")
+        steps.frombytes(moves.translate(table))
+        coords.append(array("i", accumulate(steps, initial=first)))
+    return coords[0], coords[1]
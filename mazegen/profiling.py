@@ -0,0 +1,154 @@
+"""Per-phase timing and memory instrumentation.
+
+A PhaseProfiler records, for every named phase, the wall time, the CPU
+time and (optionally) the ``tracemalloc`` peak. Phases may be nested and
+are then reported with dotted names, e.g. ``generate.carve``; repeated
+phases are summed up. Selected phases can also be run under ``cProfile``
+and dumped as ``.prof`` files for ``pstats`` or snakeviz.
+
+MazeGenerator takes a profiler and reports its own phases, so services
+using the library get the same numbers as ``a_maze_ing.py --profile``.
+Note that tracing memory makes Python code noticeably slower; the wall
+and CPU times are only comparable between runs with the same setting.
+"""
+
+import cProfile
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager, Iterable, Iterator, Optional
+
+
+class PhaseProfiler:
+    """Collect wall time, CPU time and memory peak per phase."""
+
+    def __init__(
+        self,
+        memory: bool = True,
+        cprofile: Iterable[str] = (),
+        prof_prefix: str = "profile",
+    ) -> None:
+        """Start profiling.
+
+        Args:
+            memory: Trace allocations with tracemalloc (started here if
+                it is not running yet).
+            cprofile: Phase names (short or dotted) to run under
+                cProfile. Only one phase is profiled at a time, phases
+                nested in a profiled one are not profiled separately.
+            prof_prefix: The stats of phase NAME are written to
+                ``<prof_prefix>.<NAME>.prof``.
+        """
+        self.memory = memory
+        self.cprofile = set(cprofile)
+        self.prof_prefix = prof_prefix
+        self.phases: dict[str, dict[str, Any]] = {}
+        self.prof_files: list[str] = []
+        self._stack: list[str] = []
+        self._peaks: list[int] = []
+        self._profile: Optional[cProfile.Profile] = None
+        self._started_tracing = False
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measure the code run inside the with block as phase ``name``.
+
+        Args:
+            name: Phase name; prefixed with the enclosing phases.
+        """
+        full = ".".join(self._stack + [name])
+        self._stack.append(name)
+        start_mem = 0
+        if self.memory:
+            start_mem, peak = tracemalloc.get_traced_memory()
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            tracemalloc.reset_peak()
+            self._peaks.append(start_mem)
+
+        profile = None
+        if self._profile is None and (
+            name in self.cprofile or full in self.cprofile
+        ):
+            profile = self._profile = cProfile.Profile()
+            profile.enable()
+
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            if profile is not None:
+                profile.disable()
+                prof_file = f"{self.prof_prefix}.{full}.prof"
+                profile.dump_stats(prof_file)
+                self.prof_files.append(prof_file)
+                self._profile = None
+            self._stack.pop()
+            self._record(full, wall, cpu, start_mem)
+
+    def _record(
+        self, full: str, wall: float, cpu: float, start_mem: int,
+    ) -> None:
+        """Add one finished phase to the totals."""
+        stats = self.phases.setdefault(full, {
+            "phase": full, "calls": 0, "wall_s": 0.0, "cpu_s": 0.0,
+        })
+        stats["calls"] += 1
+        stats["wall_s"] += wall
+        stats["cpu_s"] += cpu
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self._peaks.pop())
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            stats["peak_bytes"] = max(
+                stats.get("peak_bytes", 0), peak - start_mem,
+            )
+            stats["delta_bytes"] = (
+                stats.get("delta_bytes", 0) + current - start_mem
+            )
+
+    def report(self) -> dict[str, Any]:
+        """Return the collected numbers as a JSON-serialisable dict.
+
+        ``peak_bytes`` is the highest traced memory above the level at
+        the start of the phase, ``delta_bytes`` what the phase left
+        allocated.
+        """
+        return {
+            "wall_s": time.perf_counter() - self._wall,
+            "cpu_s": time.process_time() - self._cpu,
+            "tracemalloc": self.memory,
+            "phases": list(self.phases.values()),
+            "prof_files": list(self.prof_files),
+        }
+
+    def write(self, file_path: str) -> None:
+        """Write report() as JSON to a file."""
+        with open(file_path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+            f.write("\n")
+
+    def close(self) -> None:
+        """Stop tracemalloc if this profiler started it."""
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+
+def phase(
+    profiler: Optional[PhaseProfiler], name: str,
+) -> ContextManager[None]:
+    """Return ``profiler.phase(name)``, or a no-op without a profiler."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.phase(name)
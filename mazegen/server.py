@@ -0,0 +1,543 @@
+"""Local maze service: an asyncio HTTP front end over a process pool.
+
+Run it with ``python3 -m mazegen.server [--port 8042 | --unix PATH]``.
+The event loop only parses requests and writes responses; generating,
+solving and validating run in a ``ProcessPoolExecutor`` whose workers
+are started (and have imported mazegen) before the first request.
+
+Endpoints (HTTP/1.1, keep-alive):
+
+    GET  /generate?width=W&height=H[&seed=S&perfect=true&entry=x,y
+                   &exit=x,y&algorithm=A&loop_density=D]
+         The output file (hex rows, entry, exit, solution), streamed
+         with chunked transfer encoding.
+    POST /solve?entry=x,y&exit=x,y[&method=bfs]
+         Body: hex rows (an output file works too). Returns the path.
+    POST /validate
+         Body: hex rows. Returns the ValidationResult as JSON.
+    GET  /stats
+         Counters of this server as JSON.
+
+Identical requests that arrive while the first one is still running are
+coalesced: they wait for the same job instead of starting another one.
+Seeded generate requests and all solve/validate requests qualify;
+generate requests without a seed never share a maze.
+
+Backpressure: at most ``max_pending`` distinct jobs run or wait at once,
+further requests get ``503`` with ``Retry-After``; mazes above
+``max_cells`` cells and bodies above ``max_body`` bytes get ``413``.
+Request lines and headers longer than the stream limit (64 KiB) and
+more than ``MAX_HEADERS`` headers get ``431``, so a connection never
+buffers an unbounded request head.
+Responses are written in chunks and every chunk waits for the socket to
+drain, so a slow client never makes the server buffer a whole maze.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .generator import LOOP_DENSITY, MazeGenerator
+
+DEFAULT_PORT = 8042
+MAX_PENDING = 64
+MAX_CELLS = 2000 * 2000
+MAX_BODY = 16 * 2**20
+CHUNK_BYTES = 64 * 1024
+MAX_HEADERS = 100
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large",
+    431: "Request Header Fields Too Large", 500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    """A request that is answered with an error status."""
+
+    def __init__(self, status: int, message: str) -> None:
+        """Store the status code and the message sent to the client."""
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _warm() -> int:
+    """Worker start-up job; importing this module loads mazegen."""
+    return os.getpid()
+
+
+def generate_job(
+    width: int,
+    height: int,
+    seed: Optional[int],
+    perfect: bool,
+    entry: tuple[int, int],
+    exit_: tuple[int, int],
+    algorithm: str,
+    loop_density: float,
+) -> tuple[list[str], str]:
+    """Generate and solve one maze (runs in a worker).
+
+    Returns:
+        The hex rows and the solution.
+    """
+    gen = MazeGenerator(
+        width, height, seed=seed, perfect=perfect, algorithm=algorithm,
+        loop_density=loop_density,
+    )
+    gen.generate(start_pos=entry)
+    return gen.get_hex_layout(), gen.solve(entry, exit_)
+
+
+def solve_job(
+    text: str, entry: tuple[int, int], exit_: tuple[int, int], method: str,
+) -> str:
+    """Solve a maze given as hex text (runs in a worker)."""
+    gen = MazeGenerator.from_hex(text.splitlines())
+    _check_cell(gen, entry, "entry")
+    _check_cell(gen, exit_, "exit")
+    return gen.solve(entry, exit_, method)
+
+
+def validate_job(text: str) -> dict[str, Any]:
+    """Validate a maze given as hex text (runs in a worker)."""
+    gen = MazeGenerator.from_hex(text.splitlines())
+    result = gen.validate()
+    return {
+        "valid": result.valid,
+        "errors": result.errors,
+        "no_3x3_area": result.no_3x3_area,
+        "walls_consistent": result.walls_consistent,
+        "connected": result.connected,
+        "perfect": result.perfect,
+        "openings": result.openings,
+        "open_cells": result.open_cells,
+    }
+
+
+def _check_cell(
+    gen: MazeGenerator, cell: tuple[int, int], name: str,
+) -> None:
+    """Raise ValueError if a cell lies outside the maze."""
+    if not (0 <= cell[0] < gen.width and 0 <= cell[1] < gen.height):
+        raise ValueError(f"{name} {cell} out of bounds")
+
+
+def _output_chunks(
+    rows: list[str], entry: tuple[int, int], exit_: tuple[int, int],
+    path: str,
+) -> Iterator[bytes]:
+    """Yield the output file (as write_output() writes it) in chunks."""
+    chunk: list[str] = []
+    size = 0
+    for row in rows:
+        chunk.append(row + "\n")
+        size += len(row) + 1
+        if size >= CHUNK_BYTES:
+            yield "".join(chunk).encode("ascii")
+            chunk, size = [], 0
+    chunk.append(
+        f"\n{entry[0]},{entry[1]}\n{exit_[0]},{exit_[1]}\n{path}\n"
+    )
+    yield "".join(chunk).encode("ascii")
+
+
+class MazeServer:
+    """HTTP maze service with a warm process pool and request coalescing."""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: int = MAX_PENDING,
+        max_cells: int = MAX_CELLS,
+        max_body: int = MAX_BODY,
+    ) -> None:
+        """Configure the server; start() opens the pool and the socket.
+
+        Args:
+            workers: Worker processes (default: CPU count).
+            max_pending: Distinct jobs allowed to run or wait at once.
+            max_cells: Largest maze (width * height) to generate.
+            max_body: Largest request body in bytes.
+
+        Raises:
+            ValueError: If a limit is below 1.
+        """
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be at least 1")
+        if min(max_pending, max_cells, max_body) < 1:
+            raise ValueError("limits must be at least 1")
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.max_cells = max_cells
+        self.max_body = max_body
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+        self.pending = 0
+        self.requests = 0
+        self.jobs = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.errors = 0
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        unix: Optional[str] = None,
+    ) -> None:
+        """Start and warm up the worker pool, then listen.
+
+        Args:
+            host: TCP host to bind.
+            port: TCP port to bind (0 picks a free one).
+            unix: Listen on this Unix socket path instead of TCP.
+        """
+        loop = asyncio.get_running_loop()
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        await asyncio.gather(*(
+            loop.run_in_executor(self.pool, _warm)
+            for _ in range(self.workers)
+        ))
+        if unix is not None:
+            self.server = await asyncio.start_unix_server(
+                self._handle, path=unix,
+            )
+        else:
+            self.server = await asyncio.start_server(
+                self._handle, host, port,
+            )
+
+    async def close(self) -> None:
+        """Stop listening and shut the pool down."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    def stats(self) -> dict[str, int]:
+        """Return the counters of this server."""
+        return {
+            "requests": self.requests,
+            "jobs": self.jobs,
+            "coalesced": self.coalesced,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "pending": self.pending,
+        }
+
+    async def _job(
+        self, key: Optional[str], fn: Callable[..., Any], *args: Any,
+    ) -> Any:
+        """Run fn in the pool, or join an identical job in flight.
+
+        Raises:
+            HTTPError: 503 if max_pending jobs are already queued.
+        """
+        if key is not None and key in self._inflight:
+            self.coalesced += 1
+            return await asyncio.shield(self._inflight[key])
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HTTPError(503, "Too many pending jobs, retry later")
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, fn, *args)
+        self.pending += 1
+        self.jobs += 1
+        if key is not None:
+            self._inflight[key] = future
+
+        def done(_: "asyncio.Future[Any]") -> None:
+            self.pending -= 1
+            if key is not None:
+                self._inflight.pop(key, None)
+
+        future.add_done_callback(done)
+        # A client that disconnects must not cancel a shared job.
+        return await asyncio.shield(future)
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+    ) -> None:
+        """Serve the requests of one connection."""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except HTTPError as e:
+                    await self._send(writer, e.status, e.message, close=True)
+                    return
+                if request is None:
+                    return
+                method, target, headers, body = request
+                close = headers.get("connection", "").lower() == "close"
+                self.requests += 1
+                try:
+                    await self._dispatch(writer, method, target, body, close)
+                except HTTPError as e:
+                    await self._send(writer, e.status, e.message, close)
+                except ValueError as e:
+                    await self._send(writer, 400, str(e), close)
+                except Exception as e:  # noqa: BLE001 - report, keep serving
+                    self.errors += 1
+                    await self._send(writer, 500, f"{type(e).__name__}: {e}",
+                                     close)
+                if close:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader,
+    ) -> Optional[tuple[str, str, dict[str, str], bytes]]:
+        """Read one request; None at the end of the connection.
+
+        Raises:
+            HTTPError: If the request is malformed or too large.
+        """
+        line = await _read_line(reader)
+        if not line.strip():
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise HTTPError(400, "Malformed request line")
+        headers: dict[str, str] = {}
+        for count in range(MAX_HEADERS + 1):
+            header = await _read_line(reader)
+            if header in (b"\r\n", b"\n", b""):
+                break
+            if count == MAX_HEADERS:
+                raise HTTPError(431, f"More than {MAX_HEADERS} headers")
+            name, _, value = header.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length") from None
+        if length > self.max_body:
+            raise HTTPError(413, f"Body larger than {self.max_body} bytes")
+        body = await reader.readexactly(length) if length > 0 else b""
+        return parts[0], parts[1], headers, body
+
+    async def _dispatch(
+        self,
+        writer: asyncio.StreamWriter,
+        method: str,
+        target: str,
+        body: bytes,
+        close: bool,
+    ) -> None:
+        """Route one request to its endpoint and send the response."""
+        url = urlsplit(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        routes = {
+            "/generate": "GET", "/solve": "POST", "/validate": "POST",
+            "/stats": "GET",
+        }
+        if url.path not in routes:
+            raise HTTPError(404, f"No endpoint {url.path}")
+        if method != routes[url.path]:
+            raise HTTPError(405, f"{url.path} expects {routes[url.path]}")
+
+        if url.path == "/stats":
+            await self._send(writer, 200, json.dumps(self.stats()), close,
+                             "application/json")
+        elif url.path == "/generate":
+            await self._generate(writer, query, close)
+        elif url.path == "/solve":
+            text = body.decode("ascii", "replace")
+            entry = _cell(query, "entry", (0, 0))
+            exit_ = _cell(query, "exit", None)
+            method_name = query.get("method", "bfs")
+            key = _key("solve", entry, exit_, method_name, text)
+            path = await self._job(
+                key, solve_job, text, entry, exit_, method_name,
+            )
+            await self._send(writer, 200, path + "\n", close)
+        else:
+            text = body.decode("ascii", "replace")
+            result = await self._job(
+                _key("validate", text), validate_job, text,
+            )
+            await self._send(writer, 200, json.dumps(result), close,
+                             "application/json")
+
+    async def _generate(
+        self, writer: asyncio.StreamWriter, query: dict[str, str],
+        close: bool,
+    ) -> None:
+        """Handle /generate: run (or join) the job, stream the file."""
+        width = _int(query, "width", None)
+        height = _int(query, "height", None)
+        if width < 1 or height < 1:
+            raise ValueError("width and height must be positive")
+        if width * height > self.max_cells:
+            raise HTTPError(413, f"Maze larger than {self.max_cells} cells")
+        seed = _int(query, "seed", -1) if "seed" in query else None
+        perfect = query.get("perfect", "true").lower() == "true"
+        entry = _cell(query, "entry", (0, 0))
+        exit_ = _cell(query, "exit", (width - 1, height - 1))
+        for name, (x, y) in (("entry", entry), ("exit", exit_)):
+            if not (0 <= x < width and 0 <= y < height):
+                raise ValueError(f"{name} {(x, y)} out of bounds")
+        algorithm = query.get("algorithm", "backtracker")
+        try:
+            loop_density = float(query.get("loop_density", LOOP_DENSITY))
+        except ValueError:
+            raise ValueError("loop_density must be a number") from None
+        # Fail in the event loop, before a worker is used.
+        MazeGenerator(width, height, algorithm=algorithm,
+                      loop_density=loop_density)
+
+        args = (width, height, seed, perfect, entry, exit_, algorithm,
+                loop_density)
+        key = None if seed is None else _key("generate", *args)
+        rows, path = await self._job(key, generate_job, *args)
+        await self._stream(writer, _output_chunks(rows, entry, exit_, path),
+                           close)
+
+    async def _send(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        text: str,
+        close: bool,
+        content_type: str = "text/plain",
+    ) -> None:
+        """Send a complete response."""
+        body = text.encode()
+        head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                f"Content-Type: {content_type}",
+                f"Content-Length: {len(body)}"]
+        if status == 503:
+            head.append("Retry-After: 1")
+        if close:
+            head.append("Connection: close")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+
+    async def _stream(
+        self, writer: asyncio.StreamWriter, chunks: Iterable[bytes],
+        close: bool,
+    ) -> None:
+        """Send a chunked response, draining the socket after each chunk."""
+        head = ["HTTP/1.1 200 OK", "Content-Type: text/plain",
+                "Transfer-Encoding: chunked"]
+        if close:
+            head.append("Connection: close")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode())
+        for chunk in chunks:
+            writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def _read_line(reader: asyncio.StreamReader) -> bytes:
+    """Read one line of the request head.
+
+    Raises:
+        HTTPError: 431 if the line exceeds the stream limit.
+    """
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        raise HTTPError(431, "Request line or header too long") from None
+
+
+def _int(query: dict[str, str], name: str, default: Optional[int]) -> int:
+    """Read an integer query parameter.
+
+    Raises:
+        ValueError: If it is missing (without default) or not a number.
+    """
+    if name not in query:
+        if default is None:
+            raise ValueError(f"Missing parameter '{name}'")
+        return default
+    try:
+        return int(query[name])
+    except ValueError:
+        raise ValueError(f"'{name}' must be an integer") from None
+
+
+def _cell(
+    query: dict[str, str], name: str, default: Optional[tuple[int, int]],
+) -> tuple[int, int]:
+    """Read an 'x,y' query parameter.
+
+    Raises:
+        ValueError: If it is missing (without default) or malformed.
+    """
+    if name not in query:
+        if default is None:
+            raise ValueError(f"Missing parameter '{name}'")
+        return default
+    try:
+        x, y = map(int, query[name].split(","))
+    except ValueError:
+        raise ValueError(f"'{name}' must be x,y") from None
+    return x, y
+
+
+def _key(*parts: object) -> str:
+    """Return the coalescing key of a job."""
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def main() -> None:
+    """Parse arguments and serve until interrupted."""
+    parser = argparse.ArgumentParser(
+        prog="python3 -m mazegen.server",
+        description="Serve maze generation, solving and validation.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH",
+                        help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING,
+                        help="distinct jobs queued before answering 503")
+    parser.add_argument("--max-cells", type=int, default=MAX_CELLS,
+                        help="largest maze (width * height) served")
+    args = parser.parse_args()
+
+    async def serve() -> None:
+        server = MazeServer(args.workers, args.max_pending, args.max_cells)
+        await server.start(args.host, args.port, args.unix)
+        where = args.unix or f"http://{args.host}:{args.port}"
+        print(f"Serving mazes on {where} with {server.workers} workers",
+              flush=True)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        # Shut the pool down on SIGTERM too, or its workers are orphaned.
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+        try:
+            await stop.wait()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except ValueError as e:
+        print(f"Error: {e}")
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
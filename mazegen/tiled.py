@@ -0,0 +1,361 @@
+"""Parallel tiled maze generation with seam stitching.
+
+``generate_tiled`` splits the grid into rectangular tiles of at most
+``tile_size`` x ``tile_size`` cells and generates every tile in a worker
+process as an independent maze, each with its own seed derived from the
+generator's random stream. The main process copies the tiles into one
+ordinary grid and stitches them together.
+
+Every tile is a spanning tree of its cells, unless the '42' pattern cuts
+through it: such a tile may fall apart into several trees (and cells the
+algorithm never reached stay fully walled, as single-cell trees). The
+stitcher treats each tree as one node and runs a randomized Kruskal over
+the candidate walls between different trees: all walls on the tile
+seams, plus the walls between different trees inside the cut tiles. It
+opens exactly one wall per merge, so with ``perfect=True`` the result is
+again one spanning tree. Trees that cannot be reached from the start
+(cells enclosed by the pattern) are reset to fully walled, as generate()
+leaves them.
+
+For ``perfect=False``, every tile adds its own loops and the same
+``loop_density`` of the still closed seam walls is opened as well, with
+the same 3x3 guard.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, count
+from operator import ne
+from typing import TYPE_CHECKING, Iterator, NamedTuple, Optional
+
+from .generator import E, OPPOSITE, S, MazeGenerator
+from .grid import CompactGrid
+from .profiling import phase
+
+if TYPE_CHECKING:
+    from .generator import Grid
+
+# Default edge length of a tile, in cells.
+TILE_SIZE = 512
+# Tree label of a cell build_tile() has not reached yet.
+_UNLABELLED = -2
+
+
+class TileTask(NamedTuple):
+    """Parameters of one tile, sent to a worker."""
+
+    width: int
+    height: int
+    seed: int
+    perfect: bool
+    algorithm: str
+    loop_density: float
+    reserved: list[tuple[int, int]]
+
+
+class _Tile(MazeGenerator):
+    """A generator for one tile; the '42' cells come from the task."""
+
+    def __init__(self, task: TileTask) -> None:
+        """Set up the tile generator.
+
+        Args:
+            task: The tile parameters; reserved cells in tile coordinates.
+        """
+        super().__init__(
+            task.width, task.height, seed=task.seed, perfect=task.perfect,
+            algorithm=task.algorithm, loop_density=task.loop_density,
+        )
+        self.reserved = task.reserved
+
+    def _pattern_cells(self, warn: bool = True) -> list[tuple[int, int]]:
+        """Return the reserved cells of this tile."""
+        return self.reserved
+
+
+def build_tile(task: TileTask) -> tuple[bytes, Optional[list[int]]]:
+    """Generate one tile.
+
+    Args:
+        task: The tile parameters.
+
+    Returns:
+        The wall bitmasks of the tile (row-major, one byte per cell) and,
+        if the tile has reserved cells, the tree label of every cell
+        (-1 for reserved cells). Without reserved cells the whole tile is
+        one tree and the labels are None.
+    """
+    tile = _Tile(task)
+    tile.generate()
+    cells = bytes(tile._flat_cells())
+    if not task.reserved:
+        return cells, None
+
+    # Index offsets of the open walls of each bitmask. The tile has a
+    # closed border, so a BFS can follow them without bounds checks.
+    steps = [
+        tuple(delta for direction, delta, _ in tile._neighbours()
+              if not cell & direction)
+        for cell in range(256)
+    ]
+    width = task.width
+    labels = [_UNLABELLED] * (width * task.height)
+    for x, y in task.reserved:
+        labels[y * width + x] = -1
+    label = 0
+    first = 0
+    while True:
+        try:
+            first = labels.index(_UNLABELLED, first)
+        except ValueError:
+            return cells, labels
+        labels[first] = label
+        queue = [first]
+        for i in queue:
+            for delta in steps[cells[i]]:
+                j = i + delta
+                if labels[j] == _UNLABELLED:
+                    labels[j] = label
+                    queue.append(j)
+        label += 1
+
+
+def _tile_results(
+    tasks: list[TileTask], workers: Optional[int],
+) -> Iterator[tuple[bytes, Optional[list[int]]]]:
+    """Build the tiles in order, in a process pool if it pays off."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        for task in tasks:
+            yield build_tile(task)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        yield from pool.map(build_tile, tasks)
+
+
+def generate_tiled(
+    gen: MazeGenerator,
+    start_pos: tuple[int, int] = (0, 0),
+    tile_size: int = TILE_SIZE,
+    workers: Optional[int] = None,
+) -> None:
+    """Generate ``gen.grid`` tile by tile across worker processes.
+
+    Use MazeGenerator.generate_tiled() rather than calling this directly.
+
+    Args:
+        gen: The generator; its size, seed, perfect flag, storage and
+            algorithm are used.
+        start_pos: Cells not connected to this one stay fully walled.
+        tile_size: Maximum width and height of a tile.
+        workers: Number of worker processes (default: CPU count).
+            With ``workers=1`` everything runs in the current process.
+
+    Raises:
+        ValueError: If tile_size or workers is below 1.
+    """
+    if tile_size < 1:
+        raise ValueError("tile_size must be at least 1")
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    width, height = gen.width, gen.height
+    if gen.seed is not None:
+        gen.rng.seed(gen.seed)
+
+    with phase(gen.profiler, "init_grid"):
+        gen.grid = gen._new_grid()
+        gen.mark_changed()
+        gen.visited = gen._new_visited()
+
+    with phase(gen.profiler, "reserve_42"):
+        gen._apply_42_pattern()
+        reserved = {y * width + x for x, y in gen._pattern_cells(warn=False)}
+
+    xs = range(0, width, tile_size)
+    ys = range(0, height, tile_size)
+    tasks = []
+    for y0 in ys:
+        for x0 in xs:
+            w = min(tile_size, width - x0)
+            h = min(tile_size, height - y0)
+            tasks.append(TileTask(
+                w, h, gen.rng.getrandbits(64), gen.perfect, gen.algorithm,
+                gen.loop_density, [
+                    (i % width - x0, i // width - y0) for i in reserved
+                    if x0 <= i % width < x0 + w and y0 <= i // width < y0 + h
+                ],
+            ))
+
+    # Node of a tree: base[t] + its label within tile t.
+    base: list[int] = []
+    labels: list[Optional[list[int]]] = []
+    nodes = 0
+    with phase(gen.profiler, "tiles"):
+        for t, (cells, tile_labels) in enumerate(
+            _tile_results(tasks, workers),
+        ):
+            x0, y0 = xs[t % len(xs)], ys[t // len(xs)]
+            _paste(gen.grid, cells, x0, y0, tasks[t].width)
+            base.append(nodes)
+            labels.append(tile_labels)
+            nodes += max(tile_labels, default=0) + 1 if tile_labels else 1
+
+    with phase(gen.profiler, "stitch"):
+        _stitch(gen, tile_size, base, labels, nodes, reserved, start_pos)
+
+
+def _paste(
+    grid: "Grid", cells: bytes, x0: int, y0: int, width: int,
+) -> None:
+    """Copy a tile's row-major cells into the grid at (x0, y0)."""
+    for r in range(len(cells) // width):
+        row = cells[r * width:(r + 1) * width]
+        if isinstance(grid, list):
+            grid[y0 + r][x0:x0 + width] = list(row)
+        elif isinstance(grid, CompactGrid):
+            grid[y0 + r][x0:x0 + width] = row
+
+
+def _stitch(
+    gen: MazeGenerator,
+    tile_size: int,
+    base: list[int],
+    labels: list[Optional[list[int]]],
+    nodes: int,
+    reserved: set[int],
+    start_pos: tuple[int, int],
+) -> None:
+    """Join the trees of all tiles into one maze; see the module doc."""
+    width, height = gen.width, gen.height
+    grid = gen.grid
+    tiles_x = (width + tile_size - 1) // tile_size
+
+    def node(i: int) -> int:
+        """Return the tree node of flat cell i (reserved: -1)."""
+        y, x = divmod(i, width)
+        t = (y // tile_size) * tiles_x + x // tile_size
+        tile_labels = labels[t]
+        if tile_labels is None:
+            return base[t]
+        tw = min(tile_size, width - x // tile_size * tile_size)
+        label = tile_labels[(y % tile_size) * tw + x % tile_size]
+        return base[t] + label if label >= 0 else -1
+
+    # Walls as in mazegen.algorithms.kruskal: i * 2 east, i * 2 + 1 south.
+    edges: list[int] = []
+    for x in range(tile_size - 1, width - 1, tile_size):
+        for y in range(height):
+            i = y * width + x
+            if i not in reserved and i + 1 not in reserved:
+                edges.append(i * 2)
+    for y in range(tile_size - 1, height - 1, tile_size):
+        for x in range(width):
+            i = y * width + x
+            if i not in reserved and i + width not in reserved:
+                edges.append(i * 2 + 1)
+    for t, tile_labels in enumerate(labels):
+        if tile_labels is None:
+            continue
+        x0, y0, tw, _ = _tile_box(t, tiles_x, tile_size, width, height)
+        # Neighbours with different labels are picked out in C; only
+        # the few tree borders are checked one by one, in the order of
+        # their walls (k * 2 east, k * 2 + 1 south).
+        walls = [k * 2 for k in compress(
+            count(), map(ne, tile_labels, tile_labels[1:]),
+        ) if k % tw < tw - 1]
+        walls += [k * 2 + 1 for k in compress(
+            count(), map(ne, tile_labels, tile_labels[tw:]),
+        )]
+        for wall in sorted(walls):
+            k = wall >> 1
+            if tile_labels[k] < 0 or tile_labels[
+                k + (tw if wall & 1 else 1)
+            ] < 0:
+                continue
+            ly, lx = divmod(k, tw)
+            edges.append(((y0 + ly) * width + x0 + lx) * 2 + (wall & 1))
+    gen.rng.shuffle(edges)
+
+    parent = list(range(nodes))
+
+    def find(a: int) -> int:
+        """Return the root of node a, halving the path on the way."""
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        return a
+
+    merges = 0
+    closed: list[int] = []
+    for edge in edges:
+        i = edge >> 1
+        direction, j = (S, i + width) if edge & 1 else (E, i + 1)
+        a, b = find(node(i)), find(node(j))
+        if a == b:
+            closed.append(edge)
+            continue
+        parent[a] = b
+        merges += 1
+        _open(grid, width, i, direction, j)
+
+    if merges < nodes - 1:
+        sx, sy = gen._find_valid_start(start_pos)
+        root = find(node(sy * width + sx))
+        for t, tile_labels in enumerate(labels):
+            x0, y0, tw, th = _tile_box(t, tiles_x, tile_size, width, height)
+            if tile_labels is None:
+                if find(base[t]) != root:
+                    _paste(grid, bytes([15]) * (tw * th), x0, y0, tw)
+                continue
+            lost = {
+                label for label in range(max(tile_labels) + 1)
+                if find(base[t] + label) != root
+            }
+            if lost:
+                for k, label in enumerate(tile_labels):
+                    if label in lost:
+                        grid[y0 + k // tw][x0 + k % tw] = 15
+
+    if not gen.perfect:
+        seam = [edge for edge in closed if not _inside_cut_tile(
+            edge >> 1, edge & 1, width, tile_size,
+        )]
+        to_remove = int(len(seam) * gen.loop_density)
+        for edge in seam:
+            if not to_remove:
+                break
+            i = edge >> 1
+            direction, j = (S, i + width) if edge & 1 else (E, i + 1)
+            y, x = divmod(i, width)
+            if (
+                grid[y][x] != 15
+                and grid[j // width][j % width] != 15
+                and not gen._opens_3x3_area(x, y, direction)
+            ):
+                _open(grid, width, i, direction, j)
+                to_remove -= 1
+    gen.mark_changed()
+
+
+def _tile_box(
+    t: int, tiles_x: int, tile_size: int, width: int, height: int,
+) -> tuple[int, int, int, int]:
+    """Return x0, y0, width and height of tile t."""
+    ty, tx = divmod(t, tiles_x)
+    x0, y0 = tx * tile_size, ty * tile_size
+    return x0, y0, min(tile_size, width - x0), min(tile_size, height - y0)
+
+
+def _inside_cut_tile(i: int, south: int, width: int, tile_size: int) -> bool:
+    """Return True if wall i * 2 + south lies inside one tile."""
+    y, x = divmod(i, width)
+    if south:
+        return y % tile_size != tile_size - 1
+    return x % tile_size != tile_size - 1
+
+
+def _open(grid: "Grid", width: int, i: int, direction: int, j: int) -> None:
+    """Open the wall between flat cells i and j."""
+    grid[i // width][i % width] &= ~direction
+    grid[j // width][j % width] &= ~OPPOSITE[direction]
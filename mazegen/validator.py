@@ -0,0 +1,230 @@
+"""Single-pass maze validation on whole rows of wall bits.
+
+Each row is turned into Python integers with one bit per cell (one
+integer per wall direction, via ``bytes.translate`` and ``int(..., 2)``),
+so the 3x3, wall-consistency and opening-count checks are a handful of
+big-integer operations per row instead of nested loops per cell.
+Connectivity is checked with a row-by-row union-find over horizontal
+runs of connected cells rather than single cells: the run starts come
+from the west-open mask, ``itertools.accumulate`` numbers the cells by
+run, and only the open north walls between two rows are visited one by
+one (picked out with ``itertools.compress``). The union-find keeps one
+``array`` of parents with room for the runs of two rows; the half of
+the row before the previous one is reset in place for the next row.
+
+Because only a window of three rows is kept, the validator also works on
+streamed rows (e.g. from ``generate_rows``) in O(width) memory.
+"""
+
+from array import array
+from itertools import accumulate, compress
+from operator import eq
+from typing import Iterable, Optional
+
+from .hexcodec import decode_row
+
+
+def _open_table(direction: int) -> bytes:
+    """Translate table: wall bitmask -> b'1' if the wall is open."""
+    return bytes(
+        ord("0") if cell & direction else ord("1") for cell in range(256)
+    )
+
+
+_OPEN_N = _open_table(1)
+_OPEN_E = _open_table(2)
+_OPEN_S = _open_table(4)
+_OPEN_W = _open_table(8)
+_FLAG = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _bits(row: bytes, table: bytes) -> int:
+    """Return an int whose bit x is set when cell x has the wall open."""
+    return int(row.translate(table)[::-1], 2)
+
+
+def _flags(mask: int, width: int) -> bytes:
+    """Return one byte per cell: 1 where bit x of mask is set, else 0."""
+    return format(mask, f"0{width}b")[::-1].encode().translate(_FLAG)
+
+
+class ValidationResult:
+    """Outcome of MazeValidator.validate()."""
+
+    def __init__(self) -> None:
+        """Start with every check passing."""
+        self.no_3x3_area = True
+        self.walls_consistent = True
+        self.connected = True
+        self.perfect: Optional[bool] = None
+        self.openings = 0
+        self.open_cells = 0
+        self.errors: list[str] = []
+
+    @property
+    def valid(self) -> bool:
+        """Return True if no check failed."""
+        return not self.errors
+
+    def fail(self, message: str) -> None:
+        """Record a failed check (only the first message per kind)."""
+        if message not in self.errors:
+            self.errors.append(message)
+
+
+class MazeValidator:
+    """Validate a maze given as rows of wall bitmasks."""
+
+    def __init__(
+        self,
+        width: int,
+        reserved: Iterable[tuple[int, int]] = (),
+    ) -> None:
+        """Prepare the validator.
+
+        Args:
+            width: Maze width in cells.
+            reserved: Cells of the '42' pattern, which must stay closed
+                and are excluded from the connectivity check.
+        """
+        self.width = width
+        self.reserved: dict[int, set[int]] = {}
+        for x, y in reserved:
+            self.reserved.setdefault(y, set()).add(x)
+        self.reserved_bits = {
+            y: sum(1 << x for x in xs) for y, xs in self.reserved.items()
+        }
+
+    def validate(
+        self, rows: Iterable[bytes | str], perfect: bool = False,
+    ) -> ValidationResult:
+        """Run every check in one pass over the rows.
+
+        Checks: no fully open 3x3 area, matching walls on both sides of
+        every shared edge and closed outer border, connectivity of all
+        non-reserved cells and, if ``perfect``, exactly (cells - 1)
+        openings.
+
+        Args:
+            rows: Rows as bytes (one bitmask per byte) or hex strings.
+            perfect: Also check that the maze is a spanning tree.
+
+        Returns:
+            The collected result.
+        """
+        result = ValidationResult()
+        width = self.width
+        interior = (1 << (width - 1)) - 1
+        last_col = 1 << (width - 1)
+        every_cell = (1 << width) - 1
+        prev_s = 0
+        h2: list[int] = []
+        v3: list[int] = []
+        # Union-find over the runs of two rows: row y uses the nodes
+        # from (y % 2) * offset on, run k is node base + k. A root of
+        # the previous row is always linked below a run of the current
+        # one, so the roots left there at the end of a row are the
+        # components that ended in it.
+        offset = width + 1
+        identity = array("i", range(2 * offset))
+        parent = array("i", identity)
+        prev_active = 0
+        prev_run: list[int] = []
+        prev_base = offset
+        runs = 0
+        components = 0
+        y = -1
+
+        for y, raw in enumerate(rows):
+            row = decode_row(raw) if isinstance(raw, str) else bytes(raw)
+            if len(row) != width:
+                result.fail(f"Row {y} has {len(row)} cells, expected {width}")
+                return result
+            open_n = _bits(row, _OPEN_N)
+            open_e = _bits(row, _OPEN_E)
+            open_s = _bits(row, _OPEN_S)
+            open_w = _bits(row, _OPEN_W)
+            reserved = self.reserved.get(y, ())
+
+            # Wall consistency, including the outer border.
+            if (open_e ^ (open_w >> 1)) & interior:
+                result.walls_consistent = False
+                result.fail(f"Inconsistent east/west walls in row {y}")
+            if open_w & 1 or open_e & last_col:
+                result.walls_consistent = False
+                result.fail(f"Open outer wall in row {y}")
+            if y == 0 and open_n:
+                result.walls_consistent = False
+                result.fail("Open outer wall in row 0")
+            if y > 0 and prev_s ^ open_n:
+                result.walls_consistent = False
+                result.fail(f"Inconsistent north/south walls at row {y}")
+            for x in reserved:
+                if row[x] != 15:
+                    result.fail(f"Reserved cell ({x}, {y}) is not closed")
+
+            # Openings, each edge counted once from its west/north cell.
+            result.openings += (open_e & interior).bit_count()
+            if y > 0:
+                result.openings += prev_s.bit_count()
+            result.open_cells += width - len(reserved)
+
+            # 3x3 check: E open at x, x+1 and S open at x, x+1, x+2.
+            h2.append(open_e & (open_e >> 1))
+            v3.append(open_s & (open_s >> 1) & (open_s >> 2))
+            if len(h2) == 3:
+                if h2[0] & h2[1] & h2[2] & v3[0] & v3[1]:
+                    result.no_3x3_area = False
+                    result.fail(f"Open 3x3 area starting in row {y - 2}")
+                del h2[0], v3[0]
+
+            # Row-by-row union-find over runs joined by open west walls.
+            active = every_cell & ~self.reserved_bits.get(y, 0)
+            link = (open_w >> 1) & interior & active & (active >> 1)
+            starts = active & ~(link << 1)
+            run = list(accumulate(_flags(starts, width)))
+            base = offset - prev_base
+            parent[base:base + offset] = identity[base:base + offset]
+            if y > 0:
+                up = _flags(open_n & active & prev_active, width)
+                for a, b in zip(compress(prev_run, up), compress(run, up)):
+                    a += prev_base
+                    b += base
+                    while parent[a] != a:
+                        parent[a] = parent[parent[a]]
+                        a = parent[a]
+                    while parent[b] != b:
+                        parent[b] = parent[parent[b]]
+                        b = parent[b]
+                    if not base <= a < base + offset:
+                        parent[a] = b  # a is a root of the previous row
+                    elif a != b:
+                        parent[b] = a
+                lo = prev_base + 1
+                components += sum(map(
+                    eq, parent[lo:lo + runs], identity[lo:lo + runs],
+                ))
+            prev_run, prev_base = run, base
+            runs = starts.bit_count()
+            prev_active = active
+            prev_s = open_s
+
+        if y >= 0 and prev_s:
+            result.walls_consistent = False
+            result.fail(f"Open outer wall in row {y}")
+        lo = prev_base + 1
+        components += sum(map(
+            eq, parent[lo:lo + runs], identity[lo:lo + runs],
+        ))
+        if components > 1:
+            result.connected = False
+            result.fail(f"Maze has {components} disconnected regions")
+
+        if perfect:
+            result.perfect = result.openings == result.open_cells - 1
+            if not result.perfect:
+                result.fail(
+                    f"Perfect maze needs {result.open_cells - 1} openings, "
+                    f"found {result.openings}"
+                )
+        return result
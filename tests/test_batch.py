@@ -0,0 +1,76 @@
+"""Tests for batch generation across a process pool."""
+
+from typing import Iterator
+
+import pytest
+
+from mazegen import MazeGenerator
+from mazegen.batch import MazeSpec, generate_many
+
+
+def _spec(size: int, seed: int) -> MazeSpec:
+    """Return a spec for a square maze with corner entry and exit."""
+    return MazeSpec(size, size, seed, True, (0, 0), (size - 1, size - 1))
+
+
+def test_results_match_single_mazes() -> None:
+    specs = [_spec(12, seed) for seed in range(6)]
+    specs.append(MazeSpec(15, 11, 3, False, (0, 0), (14, 10), "kruskal",
+                          0.3))
+    results = sorted(
+        generate_many(specs, workers=2, chunksize=2),
+        key=lambda result: result.spec_index,
+    )
+    assert [result.spec for result in results] == specs
+    for result in results:
+        spec = result.spec
+        gen = MazeGenerator(
+            spec.width, spec.height, seed=spec.seed, perfect=spec.perfect,
+            algorithm=spec.algorithm, loop_density=spec.loop_density,
+        )
+        gen.generate(start_pos=spec.entry)
+        assert result.hex_grid == gen.get_hex_layout()
+        assert result.path == gen.solve(spec.entry, spec.exit_)
+
+
+def test_completion_order() -> None:
+    # The large maze is submitted first but finishes last.
+    specs = [_spec(250, 1), _spec(5, 2), _spec(5, 3)]
+    order = [r.spec_index for r in generate_many(specs, workers=2)]
+    assert order[-1] == 0 and sorted(order) == [0, 1, 2]
+
+
+@pytest.mark.parametrize("chunksize", [1, 3])
+def test_bounded_in_flight(chunksize: int) -> None:
+    consumed = 0
+
+    def specs() -> Iterator[MazeSpec]:
+        """Yield specs without end, counting what was taken."""
+        nonlocal consumed
+        seed = 0
+        while True:
+            consumed += 1
+            seed += 1
+            yield _spec(6, seed)
+
+    results = generate_many(
+        specs(), workers=2, chunksize=chunksize, max_pending=2,
+    )
+    for done, _ in enumerate(results, start=1):
+        assert consumed - done <= 2 * chunksize
+        if done == 20:
+            break
+
+
+def test_single_worker_keeps_input_order() -> None:
+    specs = [_spec(8, seed) for seed in range(4)]
+    indexes = [r.spec_index for r in generate_many(specs, workers=1)]
+    assert indexes == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("arguments", [
+    {"workers": 0}, {"chunksize": 0}, {"max_pending": 0},
+])
+def test_bad_arguments(arguments: dict[str, int]) -> None:
+    with pytest.raises(ValueError, match="at least 1"):
+        list(generate_many([_spec(5, 1)], **arguments))
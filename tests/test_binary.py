@@ -0,0 +1,171 @@
+"""Round-trip tests for the binary and hex maze files."""
+
+from pathlib import Path
+
+import pytest
+
+from a_maze_ing import stream_output
+from core.output_writer import write_output
+from mazegen import MazeGenerator, binary
+from mazegen.binary import (
+    HEADER, SEED_MAX, SEED_MIN, MappedMaze, unpack_cells, write_binary,
+)
+from mazegen.pathcodec import PATH_FORMATS
+
+
+def _maze(width: int, height: int, seed: int = 1) -> MazeGenerator:
+    """Return a generated non-perfect maze."""
+    gen = MazeGenerator(width, height, seed=seed, perfect=False)
+    gen.generate()
+    return gen
+
+
+@pytest.mark.parametrize("width", [1, 7, 20])
+def test_binary_round_trip(tmp_path: Path, width: int) -> None:
+    gen = _maze(width, 9)
+    path = str(tmp_path / "maze.bin")
+    write_binary(
+        path, gen.get_hex_layout(), (0, 0), (width - 1, 8), width,
+        seed=gen.seed, perfect=False,
+    )
+    with MappedMaze(path) as maze:
+        assert (maze.width, maze.height) == (width, 9)
+        assert maze.entry == (0, 0) and maze.exit_ == (width - 1, 8)
+        assert maze.seed == 1 and not maze.perfect
+        assert list(maze.hex_rows()) == gen.get_hex_layout()
+        assert bytes(maze.unpack()) == bytes(gen._flat_cells())
+        assert maze.row(3, 1, width) == bytes(gen._flat_cells())[
+            3 * width + 1:4 * width
+        ]
+        assert maze[8][width - 1] == gen.grid[8][width - 1]
+
+
+def test_mapped_maze_solves_like_the_original(tmp_path: Path) -> None:
+    gen = _maze(31, 17)
+    path = str(tmp_path / "maze.bin")
+    write_binary(
+        path, gen.get_hex_layout(), (0, 0), (30, 16), 31, perfect=False,
+    )
+    loaded = MazeGenerator.from_binary(path)
+    assert loaded.solve((0, 0), (30, 16)) == gen.solve((0, 0), (30, 16))
+    assert loaded.validate().valid
+    assert isinstance(loaded.grid, MappedMaze)
+    loaded.grid.close()
+
+
+def test_writable_map_edits_the_file(tmp_path: Path) -> None:
+    gen = _maze(8, 6)
+    path = str(tmp_path / "maze.bin")
+    write_binary(path, gen.get_hex_layout(), (0, 0), (7, 5), 8)
+    with MappedMaze(path, writable=True) as maze:
+        maze[2][5] = 15
+        maze.set_cell(4, 2, 0)
+    with MappedMaze(path) as maze:
+        assert maze.cell(5, 2) == 15 and maze.cell(4, 2) == 0
+        assert maze.cell(3, 2) == gen.grid[2][3]
+
+
+def test_unpack_in_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    gen = _maze(13, 40)
+    packed = b"".join(
+        bytes.fromhex(row + "0" * (len(row) % 2))
+        for row in gen.get_hex_layout()
+    )
+    monkeypatch.setattr(binary, "UNPACK_CHUNK", 10)
+    assert bytes(unpack_cells(packed, 13, 40)) == bytes(gen._flat_cells())
+
+
+@pytest.mark.parametrize("seed", [SEED_MIN, -5, 0, SEED_MAX])
+def test_seed_range(tmp_path: Path, seed: int) -> None:
+    path = str(tmp_path / "maze.bin")
+    write_binary(path, ["F"], (0, 0), (0, 0), 1, seed=seed)
+    with MappedMaze(path) as maze:
+        assert maze.seed == seed
+
+
+@pytest.mark.parametrize("seed", [SEED_MIN - 1, SEED_MAX + 1, 1 << 64])
+def test_seed_out_of_range(tmp_path: Path, seed: int) -> None:
+    path = tmp_path / "maze.bin"
+    with pytest.raises(ValueError, match="64 bits"):
+        write_binary(str(path), ["F"], (0, 0), (0, 0), 1, seed=seed)
+    assert not path.exists()
+
+
+@pytest.mark.parametrize("size, message", [
+    (0, "is empty"),
+    (10, "not a binary maze file"),
+    (HEADER.size - 1, "not a binary maze file"),
+    (HEADER.size + 3, "is truncated"),
+])
+def test_short_file(tmp_path: Path, size: int, message: str) -> None:
+    gen = _maze(10, 10)
+    path = tmp_path / "maze.bin"
+    write_binary(str(path), gen.get_hex_layout(), (0, 0), (9, 9), 10)
+    path.write_bytes(path.read_bytes()[:size])
+    with pytest.raises(ValueError, match=message):
+        MappedMaze(str(path))
+
+
+def test_wrong_magic(tmp_path: Path) -> None:
+    path = tmp_path / "maze.bin"
+    path.write_bytes(b"JUNK" + bytes(100))
+    with pytest.raises(ValueError, match="not a binary maze file"):
+        MappedMaze(str(path))
+
+
+@pytest.mark.parametrize("path_format", PATH_FORMATS)
+@pytest.mark.parametrize("storage", ["list", "bytearray"])
+def test_hex_round_trip(
+    tmp_path: Path, path_format: str, storage: str,
+) -> None:
+    gen = _maze(23, 14)
+    solution = gen.solve((0, 0), (22, 13))
+    path = str(tmp_path / "maze.txt")
+    write_output(
+        path, gen.get_hex_layout(), (0, 0), (22, 13), solution, path_format,
+    )
+    loaded = MazeGenerator.from_hex(path, storage=storage)
+    assert loaded.get_hex_layout() == gen.get_hex_layout()
+    assert (loaded.entry, loaded.exit_) == ((0, 0), (22, 13))
+    assert loaded.solution == solution
+    assert not loaded.perfect
+
+
+def test_hex_round_trip_detects_perfect(tmp_path: Path) -> None:
+    gen = MazeGenerator(12, 12, seed=9)
+    gen.generate()
+    path = str(tmp_path / "maze.txt")
+    write_output(path, gen.get_hex_layout(), (0, 0), (11, 11), "")
+    assert MazeGenerator.from_hex(path).perfect
+
+
+def test_stream_output_writes_both_files(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    config = {
+        "WIDTH": 21, "HEIGHT": 15, "ENTRY": (0, 0), "EXIT": (20, 14),
+        "SEED": 4, "PERFECT": True, "OUTPUT_FILE": str(tmp_path / "m.txt"),
+    }
+    binary_file = str(tmp_path / "m.bin")
+    stream_output(MazeGenerator(21, 15, seed=4), config, binary_file)
+    rows = list(MazeGenerator(21, 15, seed=4).generate_rows())
+    assert (tmp_path / "m.txt").read_text().split("\n")[:15] == rows
+    with MappedMaze(binary_file) as maze:
+        assert list(maze.hex_rows()) == rows and maze.seed == 4
+
+    # A binary file that cannot be opened still leaves the text file.
+    (tmp_path / "m.txt").unlink()
+    stream_output(MazeGenerator(21, 15, seed=4), config,
+                  str(tmp_path / "missing" / "m.bin"))
+    assert "Error writing binary output file" in capsys.readouterr().out
+    assert (tmp_path / "m.txt").read_text().split("\n")[:15] == rows
+
+
+def test_hex_lines_with_crlf() -> None:
+    gen = _maze(9, 7)
+    lines = [row + "\r\n" for row in gen.get_hex_layout()]
+    lines += ["\r\n", "0,0\r\n", "8,6\r\n", "E2S\r\n"]
+    loaded = MazeGenerator.from_hex(lines)
+    assert loaded.get_hex_layout() == gen.get_hex_layout()
+    assert (loaded.entry, loaded.exit_) == ((0, 0), (8, 6))
+    assert loaded.solution == "EES"
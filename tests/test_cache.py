@@ -0,0 +1,71 @@
+"""Tests for the on-disk maze cache."""
+
+import glob
+import os
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from mazegen import MazeCache, MazeGenerator
+
+ENTRY, EXIT = (0, 0), (29, 19)
+
+
+def _fill(directory: Path) -> tuple[MazeCache, str, str]:
+    """Store one maze; return the cache, its solution and entry file."""
+    cache = MazeCache(str(directory))
+    solution = cache.generate(MazeGenerator(30, 20, seed=3), ENTRY, EXIT)
+    (entry,) = glob.glob(os.path.join(directory, "*.maze"))
+    return cache, solution, entry
+
+
+def test_hit_returns_same_maze(tmp_path: Path) -> None:
+    cache, solution, _ = _fill(tmp_path)
+    gen = MazeGenerator(30, 20, seed=3)
+    assert cache.load(gen, ENTRY, EXIT) == solution
+    fresh = MazeGenerator(30, 20, seed=3)
+    fresh.generate()
+    assert gen.get_hex_layout() == fresh.get_hex_layout()
+    assert cache.stats()["hits"] == 1
+
+
+def test_unseeded_maze_is_not_cached(tmp_path: Path) -> None:
+    cache = MazeCache(str(tmp_path))
+    cache.generate(MazeGenerator(10, 10), ENTRY, (9, 9))
+    assert not glob.glob(os.path.join(tmp_path, "*.maze"))
+
+
+@pytest.mark.parametrize("damage", [
+    lambda data: data[:10],                      # shorter than the header
+    lambda data: data[:60],                      # cells cut off
+    lambda data: data[:-3] + b"\xff\xfe\xfd",    # solution not ASCII
+    lambda data: b"XXXX" + data[4:],             # wrong magic
+])
+def test_corrupt_entry_is_a_miss(
+    tmp_path: Path, damage: Callable[[bytes], bytes],
+) -> None:
+    cache, solution, entry = _fill(tmp_path)
+    with open(entry, "rb") as f:
+        data = f.read()
+    with open(entry, "wb") as f:
+        f.write(damage(data))
+
+    assert cache.load(MazeGenerator(30, 20, seed=3), ENTRY, EXIT) is None
+    assert not os.path.exists(entry)
+    assert cache.stats()["errors"] == 1
+    # The next run regenerates and stores the entry again.
+    assert cache.generate(MazeGenerator(30, 20, seed=3), ENTRY, EXIT) == (
+        solution
+    )
+
+
+def test_eviction_keeps_directory_below_limit(tmp_path: Path) -> None:
+    cache = MazeCache(str(tmp_path), max_bytes=2000)
+    for seed in range(10):
+        cache.generate(MazeGenerator(30, 20, seed=seed), ENTRY, EXIT)
+    sizes = [
+        os.path.getsize(p) for p in glob.glob(os.path.join(tmp_path, "*.maze"))
+    ]
+    assert sum(sizes) <= 2000
+    assert cache.stats()["evictions"] > 0
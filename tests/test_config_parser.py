@@ -0,0 +1,86 @@
+"""Tests for the configuration file parser."""
+
+from pathlib import Path
+
+import pytest
+
+from core.config_parser import parse_config, parse_manifest
+
+BASE = (
+    "WIDTH=20\nHEIGHT=15\nENTRY=0,0\nEXIT=19,14\n"
+    "OUTPUT_FILE=maze.txt\nPERFECT=True\n"
+)
+
+
+def _write(tmp_path: Path, extra: str) -> str:
+    """Write a config file with extra lines and return its path."""
+    path = tmp_path / "config.txt"
+    path.write_text(BASE + extra)
+    return str(path)
+
+
+def test_animation_settings(tmp_path: Path) -> None:
+    config = parse_config(_write(
+        tmp_path, "ANIMATION_RATE=500\nANIMATION_DURATION=0\n",
+    ))
+    assert config is not None
+    assert config["ANIMATION_RATE"] == 500.0
+    assert config["ANIMATION_DURATION"] == 0.0
+
+
+@pytest.mark.parametrize("line, message", [
+    ("ANIMATION_RATE=0", "ANIMATION_RATE must be positive"),
+    ("ANIMATION_RATE=-3", "ANIMATION_RATE must be positive"),
+    ("ANIMATION_RATE=nan", "ANIMATION_RATE must be positive"),
+    ("ANIMATION_DURATION=-1", "ANIMATION_DURATION must not be negative"),
+    ("LOOP_DENSITY=1.5", "LOOP_DENSITY must be between 0 and 1"),
+])
+def test_invalid_values(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    line: str, message: str,
+) -> None:
+    assert parse_config(_write(tmp_path, line + "\n")) is None
+    assert f"Error: {message}" in capsys.readouterr().out
+
+
+def test_manifest(tmp_path: Path) -> None:
+    path = tmp_path / "batch.txt"
+    path.write_text(
+        "# two mazes\n\n"
+        "WIDTH=20 HEIGHT=15 ENTRY=0,0 EXIT=19,14 PERFECT=True "
+        "OUTPUT_FILE=a.txt\n"
+        "width=8 height=6 entry=0,0 exit=7,5 perfect=false "
+        "output_file=b.txt algorithm=Kruskal loop_density=0.5\n",
+    )
+    configs = parse_manifest(str(path))
+    assert configs is not None and len(configs) == 2
+    assert configs[0]["EXIT"] == (19, 14) and configs[0]["PERFECT"]
+    assert configs[1]["ALGORITHM"] == "kruskal"
+    assert configs[1]["LOOP_DENSITY"] == 0.5 and not configs[1]["PERFECT"]
+
+
+@pytest.mark.parametrize("line, message", [
+    ("WIDTH=8 HEIGHT=6 ENTRY=0,0 EXIT=9,5 PERFECT=True OUTPUT_FILE=b",
+     "Invalid maze on manifest line 3"),
+    ("WIDTH=8 HEIGHT", "Invalid value in manifest file"),
+    ("WIDTH=eight", "Invalid value in manifest file"),
+])
+def test_invalid_manifest(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str],
+    line: str, message: str,
+) -> None:
+    path = tmp_path / "batch.txt"
+    path.write_text(
+        "# header\n"
+        "WIDTH=5 HEIGHT=5 ENTRY=0,0 EXIT=4,4 PERFECT=True OUTPUT_FILE=a\n"
+        + line + "\n",
+    )
+    assert parse_manifest(str(path)) is None
+    assert f"Error: {message}" in capsys.readouterr().out
+
+
+def test_missing_manifest(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str],
+) -> None:
+    assert parse_manifest(str(tmp_path / "none.txt")) is None
+    assert "not found" in capsys.readouterr().out
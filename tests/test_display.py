@@ -0,0 +1,31 @@
+"""Tests for the set-up done by the curses display."""
+
+import curses
+from typing import Any, Callable
+
+import pytest
+
+from display import curses_display
+
+
+def test_run_builds_the_configured_maze(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    shown: list[Any] = []
+
+    def wrapper(main: Callable[[Any], None]) -> None:
+        """Record the generator instead of opening a terminal."""
+        monkeypatch.setattr(
+            curses_display, "_main", lambda _, gen, *args: shown.append(gen),
+        )
+        main(None)
+
+    monkeypatch.setattr(curses, "wrapper", wrapper)
+    curses_display.run(
+        12, 10, (0, 0), (11, 9), seed=3, algorithm="prim", perfect=False,
+        loop_density=0.4,
+    )
+    (gen,) = shown
+    assert (gen.width, gen.height, gen.seed) == (12, 10, 3)
+    assert gen.algorithm == "prim" and not gen.perfect
+    assert gen.loop_density == 0.4
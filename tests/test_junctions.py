@@ -0,0 +1,157 @@
+"""Tests for the junction graph solver."""
+
+import random
+
+import pytest
+
+from mazegen import JunctionGraph, MazeGenerator, generator
+from mazegen.generator import MOVE, OPPOSITE, E, N, S, W
+
+LETTERS = {"N": N, "E": E, "S": S, "W": W}
+
+Cell = tuple[int, int]
+
+
+def _follow(gen: MazeGenerator, a: Cell, path: str) -> Cell:
+    """Walk a path through open walls only and return the last cell."""
+    x, y = a
+    for letter in path:
+        direction = LETTERS[letter]
+        assert not gen.grid[y][x] & direction
+        dx, dy = MOVE[direction]
+        x, y = x + dx, y + dy
+    return x, y
+
+
+def _pairs(
+    gen: MazeGenerator, count: int, seed: int,
+) -> list[tuple[Cell, Cell]]:
+    """Return random pairs of cells, corners first."""
+    rng = random.Random(seed)
+    w, h = gen.width, gen.height
+    pairs = [((0, 0), (w - 1, h - 1)), ((w - 1, 0), (0, h - 1))]
+    for _ in range(count):
+        pairs.append((
+            (rng.randrange(w), rng.randrange(h)),
+            (rng.randrange(w), rng.randrange(h)),
+        ))
+    return pairs
+
+
+@pytest.mark.parametrize("perfect", [True, False])
+@pytest.mark.parametrize("method", ["astar", "dijkstra"])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_lengths_match_bfs(perfect: bool, method: str, seed: int) -> None:
+    gen = MazeGenerator(40, 30, seed=seed, perfect=perfect)
+    gen.generate()
+    graph = JunctionGraph(gen)
+    for a, b in _pairs(gen, 60, seed):
+        expected = gen.solve(a, b)
+        path = graph.path(a, b, method)
+        assert len(path) == len(expected), (a, b)
+        if path:
+            assert _follow(gen, a, path) == b
+        assert graph.distance(a, b, method) == (
+            len(expected) if expected or a == b else -1
+        )
+
+
+def test_solve_method_matches_bfs() -> None:
+    gen = MazeGenerator(60, 40, seed=7, perfect=False, loop_density=0.5)
+    gen.generate()
+    for a, b in _pairs(gen, 30, 7):
+        assert len(gen.solve(a, b, method="junction")) == len(gen.solve(a, b))
+        assert len(gen.solve(a, b, method="astar")) == len(gen.solve(a, b))
+
+
+def test_walled_cells_are_unreachable() -> None:
+    gen = MazeGenerator(20, 20, seed=4)
+    gen.generate()
+    graph = JunctionGraph(gen)
+    # The '42' pattern cells stay fully walled.
+    assert gen.grid[8][7] == 15
+    assert graph.distance((0, 0), (7, 8)) == -1
+    assert graph.path((0, 0), (7, 8)) == ""
+
+
+@pytest.mark.parametrize("perfect", [True, False])
+def test_wall_edits_update_incrementally(
+    perfect: bool, monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    gen = MazeGenerator(30, 20, seed=5, perfect=perfect)
+    gen.generate()
+    graph = JunctionGraph(gen)
+    graph.path((0, 0), (29, 19))
+    builds = []
+    monkeypatch.setattr(graph, "_build", lambda: builds.append(1))
+
+    rng = random.Random(5)
+    for step in range(60):
+        x, y = rng.randrange(gen.width - 1), rng.randrange(gen.height - 1)
+        direction = rng.choice([E, S])
+        dx, dy = MOVE[direction]
+        gen.grid[y][x] ^= direction
+        gen.grid[y + dy][x + dx] ^= OPPOSITE[direction]
+        gen.mark_changed([(x, y), (x + dx, y + dy)])
+        for a, b in _pairs(gen, 5, step):
+            expected = gen.solve(a, b)
+            path = graph.path(a, b)
+            assert len(path) == len(expected), (step, a, b)
+            if path:
+                assert _follow(gen, a, path) == b
+    assert not builds
+
+
+def test_edit_without_cells_rebuilds() -> None:
+    gen = MazeGenerator(20, 15, seed=6)
+    gen.generate()
+    graph = JunctionGraph(gen)
+    graph.path((0, 0), (19, 14))
+    gen.grid[0][0] |= E
+    gen.grid[0][1] |= W
+    gen.mark_changed([(0, 0), (1, 0)])
+    gen.grid[0][0] |= S
+    gen.grid[1][0] |= N
+    gen.mark_changed()
+    assert graph.distance((0, 0), (19, 14)) == -1
+    assert gen.changes == []
+
+
+def test_change_log_is_bounded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(generator, "MAX_CHANGES", 4)
+    gen = MazeGenerator(20, 15, seed=8, perfect=False)
+    gen.generate()
+    graph = JunctionGraph(gen)
+    graph.path((0, 0), (19, 14))
+    builds = []
+    build = graph._build
+
+    def counted_build() -> None:
+        """Count the rebuilds, then rebuild."""
+        builds.append(1)
+        build()
+
+    monkeypatch.setattr(graph, "_build", counted_build)
+
+    def toggle(step: int) -> None:
+        """Flip the east wall of a cell in the top row."""
+        x = step % 10
+        gen.grid[0][x] ^= E
+        gen.grid[0][x + 1] ^= W
+        gen.mark_changed([(x, 0), (x + 1, 0)])
+
+    for step in range(30):
+        toggle(step)
+        assert len(gen.changes) <= 8
+        assert len(graph.path((0, 0), (19, 14))) == len(
+            gen.solve((0, 0), (19, 14)),
+        )
+    assert not builds
+
+    # A graph that misses more edits than the log keeps rebuilds.
+    for step in range(9):
+        toggle(step)
+    assert graph.distance((0, 0), (19, 14)) == len(
+        gen.solve((0, 0), (19, 14)),
+    )
+    assert len(builds) == 1
@@ -0,0 +1,34 @@
+"""Tests for the bulk maze statistics."""
+
+from mazegen import MazeGenerator
+from mazegen.metrics import compute_metrics
+
+# A 4 x 3 snake: rows 0 and 2 run east, joined through (3, 0)-(3, 1)
+# and (0, 1)-(0, 2). Bits: N=1, E=2, S=4, W=8.
+SNAKE = bytes([
+    13, 5, 5, 3,
+    9, 5, 5, 6,
+    12, 5, 5, 7,
+])
+
+
+def test_snake_metrics() -> None:
+    result = compute_metrics(SNAKE, 4, "EEESWWWSEEE")
+    assert result.branching == {0: 0, 1: 2, 2: 10, 3: 0, 4: 0}
+    assert result.dead_ends == 2 and result.junctions == 0
+    # Three rows of 4 cells and two vertical joints of 2 cells, although
+    # the whole maze is a single corridor.
+    assert result.straight_runs == {2: 2, 4: 3}
+    assert result.mean_straight_run == 16 / 5
+    assert result.solution_length == 11
+    assert result.solution_turns == 4
+    assert result.solution_share == 1.0
+
+
+def test_straight_runs_cover_every_opening() -> None:
+    gen = MazeGenerator(30, 20, seed=3, perfect=False)
+    gen.generate()
+    result = gen.metrics()
+    openings = sum((k - 1) * n for k, n in result.straight_runs.items())
+    assert openings == gen.validate().openings
+    assert result.as_dict()["straight_runs"] == result.straight_runs
@@ -0,0 +1,67 @@
+"""Round-trip tests for the solution path encodings."""
+
+import random
+
+import pytest
+
+from mazegen import MazeGenerator
+from mazegen.pathcodec import (
+    PATH_FORMATS, decode_path, encode_path, path_coords,
+)
+
+
+def _random_path(length: int, seed: int) -> str:
+    """Return a random path with runs of varying length."""
+    rng = random.Random(seed)
+    path = ""
+    while len(path) < length:
+        path += rng.choice("NESW") * rng.choice([1, 1, 2, 3, 12])
+    return path[:length]
+
+
+@pytest.mark.parametrize("path_format", PATH_FORMATS)
+@pytest.mark.parametrize("length", [0, 1, 2, 3, 4, 5, 7, 8, 9, 100, 1001])
+def test_round_trip(path_format: str, length: int) -> None:
+    path = _random_path(length, length)
+    assert decode_path(encode_path(path, path_format)) == path
+
+
+@pytest.mark.parametrize("path_format", PATH_FORMATS)
+def test_solution_round_trip(path_format: str) -> None:
+    gen = MazeGenerator(40, 30, seed=3)
+    gen.generate()
+    path = gen.solve((0, 0), (39, 29))
+    assert decode_path(encode_path(path, path_format)) == path
+
+
+def test_known_encodings() -> None:
+    assert encode_path("EESSSW") == "EESSSW"
+    assert encode_path("EESSSW", "rle") == "E2S3W"
+    # E, E, S, S in the first byte (lowest bits first), then S, W.
+    assert encode_path("EESSSW", "packed") == "=6:pQ4="
+    assert encode_path("", "packed") == "=0:"
+    assert decode_path("E2S3W") == decode_path("EESSSW") == "EESSSW"
+    assert decode_path("N12") == "N" * 12
+
+
+@pytest.mark.parametrize("text", [
+    "EAST", "2E", "E-2", "E 2", "=x:AA==", "=1:!!", "=5:AA==", "=-1:",
+    "=4",
+])
+def test_invalid_paths(text: str) -> None:
+    with pytest.raises(ValueError):
+        decode_path(text)
+
+
+def test_unknown_format() -> None:
+    with pytest.raises(ValueError, match="Unknown path format"):
+        encode_path("NE", "zip")
+
+
+@pytest.mark.parametrize("path_format", PATH_FORMATS)
+def test_path_coords(path_format: str) -> None:
+    xs, ys = path_coords(encode_path("EESSSWN", path_format), (2, 1))
+    assert list(zip(xs, ys)) == [
+        (2, 1), (3, 1), (4, 1), (4, 2), (4, 3), (4, 4), (3, 4), (3, 3),
+    ]
+    assert list(map(list, path_coords("", (5, 6)))) == [[5], [6]]
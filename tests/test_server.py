@@ -0,0 +1,108 @@
+"""Tests for the asyncio maze service."""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable
+
+from mazegen.server import MAX_HEADERS, MazeServer
+
+Exchange = Callable[[bytes], Awaitable[tuple[int, dict[str, str], bytes]]]
+
+
+def _serve(test: Callable[[Exchange], Awaitable[Any]]) -> Any:
+    """Run test against a server on a free port with small limits."""
+
+    async def run() -> Any:
+        server = MazeServer(workers=1, max_cells=400, max_body=1000)
+        await server.start(port=0)
+        assert isinstance(server.server, asyncio.Server)
+        port = server.server.sockets[0].getsockname()[1]
+
+        async def exchange(
+            request: bytes,
+        ) -> tuple[int, dict[str, str], bytes]:
+            """Send one request on a new connection, read the response."""
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(request)
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.decode().split("\r\n")
+            headers = {}
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                if name:
+                    headers[name.lower()] = value.strip()
+            if headers.get("transfer-encoding") == "chunked":
+                body = b""
+                while size := int(await reader.readline(), 16):
+                    body += await reader.readexactly(size)
+                    await reader.readline()
+            else:
+                body = await reader.readexactly(
+                    int(headers["content-length"]),
+                )
+            writer.close()
+            return int(lines[0].split()[1]), headers, body
+
+        try:
+            return await test(exchange)
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+def test_requests_and_limits() -> None:
+    async def test(exchange: Exchange) -> None:
+        status, _, body = await exchange(
+            b"GET /generate?width=15&height=12&seed=3 HTTP/1.1\r\n"
+            b"Connection: close\r\n\r\n",
+        )
+        assert status == 200
+        lines = body.decode().split("\n")
+        assert len(lines[0]) == 15 and lines[12:15] == ["", "0,0", "14,11"]
+        assert set(lines[15]) <= set("NESW") and lines[15]
+
+        status, headers, body = await exchange(
+            b"GET /stats HTTP/1.1\r\nConnection: close\r\n\r\n",
+        )
+        assert status == 200
+        assert headers["content-type"] == "application/json"
+        assert json.loads(body)["jobs"] == 1
+
+        status, _, _ = await exchange(b"HELLO\r\n\r\n")
+        assert status == 400
+
+        status, _, body = await exchange(
+            b"GET /" + b"a" * 70000 + b" HTTP/1.1\r\n\r\n",
+        )
+        assert status == 431 and b"too long" in body
+
+        status, _, _ = await exchange(
+            b"GET /stats HTTP/1.1\r\nX-Big: " + b"b" * 70000 + b"\r\n\r\n",
+        )
+        assert status == 431
+
+        status, _, body = await exchange(
+            b"GET /stats HTTP/1.1\r\n"
+            + b"X-Same: 1\r\n" * (MAX_HEADERS + 1) + b"\r\n",
+        )
+        assert status == 431 and b"headers" in body
+
+        status, _, body = await exchange(
+            b"POST /validate HTTP/1.1\r\nContent-Length: 1001\r\n\r\n",
+        )
+        assert status == 413 and b"1000 bytes" in body
+
+        status, _, _ = await exchange(
+            b"GET /generate?width=30&height=30 HTTP/1.1\r\n\r\n",
+        )
+        assert status == 413
+
+        # The server keeps serving after the rejected requests.
+        status, _, body = await exchange(
+            b"GET /stats HTTP/1.1\r\nConnection: close\r\n\r\n",
+        )
+        assert status == 200 and json.loads(body)["errors"] == 0
+
+    _serve(test)
@@ -0,0 +1,107 @@
+"""Tests for Eller's algorithm and tiled generation around the '42' cells."""
+
+from typing import Optional
+
+import pytest
+
+from mazegen import MazeGenerator
+from mazegen.algorithms import ALGORITHMS
+from mazegen.validator import MazeValidator
+
+
+class _Ring(MazeGenerator):
+    """A generator whose reserved cells wall in a 3x3 block."""
+
+    def _pattern_cells(self, warn: bool = True) -> list[tuple[int, int]]:
+        """Return a closed ring of cells from (3, 3) to (7, 7)."""
+        return [
+            (x, y) for x in range(3, 8) for y in range(3, 8)
+            if x in (3, 7) or y in (3, 7)
+        ]
+
+
+def _assert_valid(gen: MazeGenerator, perfect: bool) -> None:
+    """Assert that the maze is connected around the '42' cells."""
+    assert gen._pattern_cells(warn=False)
+    result = gen.validate()
+    assert result.valid, result.errors
+    assert result.perfect is (True if perfect else None)
+
+
+@pytest.mark.parametrize("perfect", [True, False])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_eller_around_42(perfect: bool, seed: int) -> None:
+    gen = MazeGenerator(
+        21, 17, seed=seed, perfect=perfect, algorithm="eller",
+    )
+    gen.generate()
+    _assert_valid(gen, perfect)
+
+
+@pytest.mark.parametrize("perfect", [True, False])
+def test_streamed_eller_rows(perfect: bool) -> None:
+    gen = MazeGenerator(25, 40, seed=4, perfect=perfect)
+    validator = MazeValidator(25, gen._pattern_cells(warn=False))
+    result = validator.validate(gen.generate_rows(), perfect=perfect)
+    assert result.valid, result.errors
+
+
+def test_streamed_loop_density() -> None:
+    openings = []
+    for density in (0.0, 0.3, 1.0):
+        gen = MazeGenerator(30, 30, seed=6, perfect=False,
+                            loop_density=density)
+        validator = MazeValidator(30, gen._pattern_cells(warn=False))
+        result = validator.validate(gen.generate_rows())
+        assert result.valid, result.errors
+        openings.append(result.openings)
+    assert openings[0] == 30 * 30 - 20 - 1
+    assert openings[0] < openings[1] < openings[2]
+
+
+def test_streamed_rows_match_eller() -> None:
+    gen = MazeGenerator(19, 23, seed=5, algorithm="eller")
+    gen.generate()
+    streamed = MazeGenerator(19, 23, seed=5)
+    assert list(streamed.generate_rows()) == gen.get_hex_layout()
+
+
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+@pytest.mark.parametrize("perfect", [True, False])
+@pytest.mark.parametrize("tile_size", [3, 4, 7])
+def test_tiles_around_42(
+    algorithm: str, perfect: bool, tile_size: int,
+) -> None:
+    # Small tiles cut the pattern (at x 7..13, y 8..12) apart.
+    gen = MazeGenerator(
+        21, 21, seed=tile_size, perfect=perfect, algorithm=algorithm,
+    )
+    gen.generate_tiled(tile_size=tile_size, workers=1)
+    _assert_valid(gen, perfect)
+
+
+def test_tiles_do_not_depend_on_workers() -> None:
+    layouts = []
+    for workers in (1, 2):
+        gen = MazeGenerator(30, 24, seed=8, perfect=False)
+        gen.generate_tiled(tile_size=8, workers=workers)
+        layouts.append(gen.get_hex_layout())
+    assert layouts[0] == layouts[1]
+
+
+@pytest.mark.parametrize("algorithm", ["backtracker", "eller"])
+def test_enclosed_cells_stay_walled(algorithm: str) -> None:
+    gen = _Ring(12, 12, seed=3, algorithm=algorithm)
+    gen.generate_tiled(tile_size=4, workers=1)
+    inside = [(x, y) for x in range(4, 7) for y in range(4, 7)]
+    assert all(gen.grid[y][x] == 15 for x, y in inside)
+    validator = MazeValidator(12, gen._pattern_cells() + inside)
+    result = validator.validate(gen._rows(), perfect=True)
+    assert result.valid, result.errors
+
+
+@pytest.mark.parametrize("tile_size, workers", [(0, None), (4, 0)])
+def test_bad_arguments(tile_size: int, workers: Optional[int]) -> None:
+    gen = MazeGenerator(10, 10, seed=1)
+    with pytest.raises(ValueError, match="at least 1"):
+        gen.generate_tiled(tile_size=tile_size, workers=workers)
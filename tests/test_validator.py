@@ -0,0 +1,159 @@
+"""Tests for the single-pass maze validator."""
+
+import pytest
+
+from mazegen import MazeGenerator
+from mazegen.generator import OPPOSITE, E, N, S, W
+from mazegen.validator import MazeValidator, ValidationResult
+
+STEP = {N: (0, -1), E: (1, 0), S: (0, 1), W: (-1, 0)}
+
+
+def _open(grid: list[bytearray], x: int, y: int, direction: int) -> None:
+    """Open a wall on both sides."""
+    dx, dy = STEP[direction]
+    grid[y][x] &= ~direction
+    grid[y + dy][x + dx] &= ~OPPOSITE[direction]
+
+
+def _snake(width: int, height: int) -> list[bytearray]:
+    """Return a perfect maze: one path along every row in turn."""
+    grid = [bytearray([15]) * width for _ in range(height)]
+    for y in range(height):
+        for x in range(width - 1):
+            _open(grid, x, y, E)
+        if y < height - 1:
+            _open(grid, width - 1 if y % 2 == 0 else 0, y, S)
+    return grid
+
+
+def _check(grid: list[bytearray], perfect: bool = True) -> ValidationResult:
+    """Validate a grid without reserved cells."""
+    return MazeValidator(len(grid[0])).validate(
+        [bytes(row) for row in grid], perfect,
+    )
+
+
+def test_snake_is_valid() -> None:
+    result = _check(_snake(6, 5))
+    assert result.valid, result.errors
+    assert result.perfect
+    assert result.openings == 6 * 5 - 1
+
+
+@pytest.mark.parametrize("perfect", [True, False])
+def test_generated_mazes_are_valid(perfect: bool) -> None:
+    for seed in range(5):
+        gen = MazeGenerator(25, 18, seed=seed, perfect=perfect)
+        gen.generate()
+        result = gen.validate()
+        assert result.valid, result.errors
+        assert result.perfect is (True if perfect else None)
+        assert gen.validate_no_3x3_area()
+
+
+def test_hex_rows_are_accepted() -> None:
+    gen = MazeGenerator(12, 9, seed=2)
+    gen.generate()
+    validator = MazeValidator(12, gen._pattern_cells(warn=False))
+    assert validator.validate(gen.get_hex_layout(), perfect=True).valid
+
+
+def test_open_3x3_area() -> None:
+    grid = _snake(6, 5)
+    # Rows are open along their length; open rows 1 to 3 between them.
+    for x in range(1, 4):
+        _open(grid, x, 1, S)
+        _open(grid, x, 2, S)
+    result = _check(grid, perfect=False)
+    assert not result.no_3x3_area
+    assert "Open 3x3 area starting in row 1" in result.errors
+    assert result.connected and result.walls_consistent
+
+
+def test_open_3x2_area_is_allowed() -> None:
+    grid = _snake(6, 5)
+    for x in range(1, 4):
+        _open(grid, x, 1, S)
+    assert _check(grid, perfect=False).no_3x3_area
+
+
+def test_extra_opening_is_not_perfect() -> None:
+    grid = _snake(6, 5)
+    _open(grid, 2, 2, S)
+    result = _check(grid)
+    assert result.perfect is False
+    assert result.openings == 6 * 5
+    assert "Perfect maze needs 29 openings, found 30" in result.errors
+    assert result.connected and result.walls_consistent
+
+
+def test_missing_opening_disconnects() -> None:
+    grid = _snake(6, 5)
+    grid[2][2] |= E
+    grid[2][3] |= W
+    result = _check(grid)
+    assert not result.connected
+    assert "Maze has 2 disconnected regions" in result.errors
+    assert result.perfect is False
+
+
+def test_closed_cell_is_its_own_region() -> None:
+    grid = _snake(6, 5)
+    grid[4] = bytearray([15]) * 6
+    grid[3] = bytearray(row | S for row in grid[3])
+    result = _check(grid, perfect=False)
+    assert "Maze has 7 disconnected regions" in result.errors
+
+
+def test_reserved_cells_are_not_regions() -> None:
+    grid = _snake(5, 5)
+    grid[4] = bytearray([15]) * 5
+    grid[3] = bytearray(row | S for row in grid[3])
+    reserved = [(x, 4) for x in range(5)]
+    result = MazeValidator(5, reserved).validate(
+        [bytes(row) for row in grid], perfect=True,
+    )
+    assert result.valid, result.errors
+    assert result.open_cells == 20
+
+
+def test_reserved_cell_must_be_closed() -> None:
+    result = MazeValidator(6, [(2, 2)]).validate(
+        [bytes(row) for row in _snake(6, 5)],
+    )
+    assert "Reserved cell (2, 2) is not closed" in result.errors
+
+
+def test_mismatched_east_west_walls() -> None:
+    grid = _snake(6, 5)
+    grid[1][3] |= W
+    result = _check(grid, perfect=False)
+    assert not result.walls_consistent
+    assert "Inconsistent east/west walls in row 1" in result.errors
+
+
+def test_mismatched_north_south_walls() -> None:
+    grid = _snake(6, 5)
+    grid[2][3] &= ~N
+    result = _check(grid, perfect=False)
+    assert not result.walls_consistent
+    assert "Inconsistent north/south walls at row 2" in result.errors
+
+
+@pytest.mark.parametrize("x, y, direction", [
+    (0, 0, N), (5, 1, E), (0, 3, W), (2, 4, S),
+])
+def test_open_outer_wall(x: int, y: int, direction: int) -> None:
+    grid = _snake(6, 5)
+    grid[y][x] &= ~direction
+    result = _check(grid, perfect=False)
+    assert not result.walls_consistent
+    assert f"Open outer wall in row {y}" in result.errors
+
+
+def test_row_of_wrong_width() -> None:
+    rows = [bytes(row) for row in _snake(6, 5)]
+    rows[3] = rows[3][:4]
+    result = MazeValidator(6).validate(rows)
+    assert result.errors == ["Row 3 has 4 cells, expected 6"]